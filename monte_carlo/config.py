@@ -35,8 +35,16 @@ class VaRConfig:
     confidence_levels: List[float] = field(default_factory=lambda: [0.95, 0.99])
     holding_period_days: int = 10
     historical_returns: Optional[Union[str, List[float]]] = None
+    block_size: int = 1
+    bootstrap_method: str = "moving"
     expected_annual_return: float = 0.07
     annual_volatility: float = 0.15
+    positions: Optional[Union[str, List[float]]] = None
+    covariance_matrix: Optional[List[List[float]]] = None
+    expected_asset_returns: Optional[List[float]] = None
+    factor_returns: Optional[Union[str, List[List[float]]]] = None
+    importance_sampling: bool = False
+    importance_shift: Optional[float] = None
 
 
 @dataclass
@@ -48,6 +56,7 @@ class OptionsConfig:
     risk_free_rate: float = 0.05
     volatility: float = 0.20
     time_to_maturity_years: float = 1.0
+    pricing_mode: str = "auto"
 
 
 @dataclass
@@ -58,6 +67,16 @@ class SimulationConfig:
     time_horizon_years: int = 30
     random_seed: Optional[int] = None
     output_dir: str = "./output"
+    chunk_size: Optional[int] = None
+    workers: int = 1
+    path_storage: Optional[str] = None
+    variance_reduction: List[str] = field(default_factory=list)
+    sampler: str = "pseudo"
+    qmc_replications: int = 8
+    target_metric: Optional[str] = None
+    target_error: Optional[float] = None
+    error_type: str = "std_error"
+    batch_size: Optional[int] = None
 
     portfolio: Optional[PortfolioConfig] = None
     retirement: Optional[RetirementConfig] = None
@@ -87,7 +106,17 @@ class SimulationConfig:
             num_simulations=data.get('num_simulations', 10000),
             time_horizon_years=data.get('time_horizon_years', 30),
             random_seed=data.get('random_seed'),
-            output_dir=data.get('output_dir', './output')
+            output_dir=data.get('output_dir', './output'),
+            chunk_size=data.get('chunk_size'),
+            workers=data.get('workers', 1),
+            path_storage=data.get('path_storage'),
+            variance_reduction=data.get('variance_reduction', []),
+            sampler=data.get('sampler', 'pseudo'),
+            qmc_replications=data.get('qmc_replications', 8),
+            target_metric=data.get('target_metric'),
+            target_error=data.get('target_error'),
+            error_type=data.get('error_type', 'std_error'),
+            batch_size=data.get('batch_size')
         )
 
         if 'portfolio' in data:
@@ -111,7 +140,17 @@ class SimulationConfig:
             'num_simulations': self.num_simulations,
             'time_horizon_years': self.time_horizon_years,
             'random_seed': self.random_seed,
-            'output_dir': self.output_dir
+            'output_dir': self.output_dir,
+            'chunk_size': self.chunk_size,
+            'workers': self.workers,
+            'path_storage': self.path_storage,
+            'variance_reduction': self.variance_reduction,
+            'sampler': self.sampler,
+            'qmc_replications': self.qmc_replications,
+            'target_metric': self.target_metric,
+            'target_error': self.target_error,
+            'error_type': self.error_type,
+            'batch_size': self.batch_size
         }
 
         if self.portfolio:
@@ -140,8 +179,16 @@ class SimulationConfig:
                 'confidence_levels': self.var.confidence_levels,
                 'holding_period_days': self.var.holding_period_days,
                 'historical_returns': self.var.historical_returns,
+                'block_size': self.var.block_size,
+                'bootstrap_method': self.var.bootstrap_method,
                 'expected_annual_return': self.var.expected_annual_return,
-                'annual_volatility': self.var.annual_volatility
+                'annual_volatility': self.var.annual_volatility,
+                'positions': self.var.positions,
+                'covariance_matrix': self.var.covariance_matrix,
+                'expected_asset_returns': self.var.expected_asset_returns,
+                'factor_returns': self.var.factor_returns,
+                'importance_sampling': self.var.importance_sampling,
+                'importance_shift': self.var.importance_shift
             }
 
         if self.options:
@@ -151,7 +198,8 @@ class SimulationConfig:
                 'strike_price': self.options.strike_price,
                 'risk_free_rate': self.options.risk_free_rate,
                 'volatility': self.options.volatility,
-                'time_to_maturity_years': self.options.time_to_maturity_years
+                'time_to_maturity_years': self.options.time_to_maturity_years,
+                'pricing_mode': self.options.pricing_mode
             }
 
         return result
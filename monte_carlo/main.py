@@ -6,7 +6,7 @@ from pathlib import Path
 from .config import SimulationConfig
 from .simulators.portfolio import PortfolioSimulator
 from .simulators.retirement import RetirementSimulator
-from .simulators.var import VaRSimulator
+from .simulators.var import VaRSimulator, confidence_label
 from .simulators.options import OptionPricingSimulator
 from .visualization.charts import (
     plot_fan_chart,
@@ -72,6 +72,39 @@ Examples:
         help="Random seed (overrides config file)"
     )
 
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Simulate paths in chunks of this size to bound memory (overrides config file); "
+             "with the sobol sampler results depend on it, and it is rounded down to "
+             "qmc_replications times a power of two"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes to shard simulations across (overrides config file)"
+    )
+
+    parser.add_argument(
+        "--target-metric",
+        help="Stop once this metric (e.g. mc_price, probability_of_success, var_99, "
+             "safe_withdrawal_rate) reaches --target-error; num_simulations then "
+             "caps the path count"
+    )
+
+    parser.add_argument(
+        "--target-error",
+        type=float,
+        help="Target error for --target-metric (overrides config file)"
+    )
+
+    parser.add_argument(
+        "--error-type",
+        choices=["std_error", "ci_half_width", "relative_error"],
+        help="How --target-error is measured (overrides config file)"
+    )
+
     return parser.parse_args()
 
 
@@ -91,6 +124,12 @@ def run_simulation(config: SimulationConfig, quiet: bool = False):
         print(f"  Time horizon: {config.time_horizon_years} years")
         if config.random_seed:
             print(f"  Random seed: {config.random_seed}")
+        if config.chunk_size:
+            print(f"  Chunk size: {config.chunk_size:,}")
+        if config.workers > 1:
+            print(f"  Workers: {config.workers}")
+        if config.target_metric:
+            print(f"  Target: {config.target_metric} {config.error_type} <= {config.target_error}")
 
     results = simulator.run()
 
@@ -113,17 +152,19 @@ def generate_charts(
 
     sim_type = results.simulation_type
     paths = results.all_paths
+    if paths is None and results.path_store is not None:
+        paths = results.path_store.sample_paths
 
     if not quiet:
         print(f"\nGenerating charts...")
 
-    saved_files = save_all_charts(results, paths, output_dir, sim_type)
+    saved_files = save_all_charts(results, results.all_paths, output_dir, sim_type)
 
     if sim_type == "var" and paths is not None:
         var_config = simulator.var_config
         var_levels = {}
         for conf in var_config.confidence_levels:
-            key = f"var_{int(conf*100)}"
+            key = f"var_{confidence_label(conf)}"
             if key in results.custom_metrics:
                 var_levels[conf] = results.custom_metrics[key]
 
@@ -138,7 +179,10 @@ def generate_charts(
             saved_files.append(var_path)
             plt.close()
 
-    elif sim_type == "options" and paths is not None:
+    elif sim_type == "options":
+        if paths is None:
+            paths = simulator.get_price_paths(n_sims=min(results.num_simulations, 1000))
+
         opt_config = simulator.options_config
         opt_path = output_dir / f"{sim_type}_option_analysis.png"
         plot_option_analysis(
@@ -188,6 +232,21 @@ def main():
     if args.seed:
         config.random_seed = args.seed
 
+    if args.chunk_size:
+        config.chunk_size = args.chunk_size
+
+    if args.workers:
+        config.workers = args.workers
+
+    if args.target_metric:
+        config.target_metric = args.target_metric
+
+    if args.target_error:
+        config.target_error = args.target_error
+
+    if args.error_type:
+        config.error_type = args.error_type
+
     config.output_dir = args.output
 
     try:
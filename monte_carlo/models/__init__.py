@@ -6,7 +6,19 @@ from .returns import (
     NormalReturns,
     StudentTReturns,
     HistoricalBootstrap,
-    create_return_model
+    create_return_model,
+    VARIANCE_REDUCTION_TECHNIQUES,
+    BOOTSTRAP_METHODS
+)
+from .sampling import SAMPLERS, sobol_normals
+from .black_scholes import (
+    OPTION_TYPES,
+    IMPLIED_VOLATILITY_BOUNDS,
+    call_mask,
+    black_scholes_d1_d2,
+    black_scholes_price,
+    black_scholes_greeks,
+    implied_volatility
 )
 
 __all__ = [
@@ -15,5 +27,16 @@ __all__ = [
     "NormalReturns",
     "StudentTReturns",
     "HistoricalBootstrap",
-    "create_return_model"
+    "create_return_model",
+    "VARIANCE_REDUCTION_TECHNIQUES",
+    "BOOTSTRAP_METHODS",
+    "SAMPLERS",
+    "sobol_normals",
+    "OPTION_TYPES",
+    "IMPLIED_VOLATILITY_BOUNDS",
+    "call_mask",
+    "black_scholes_d1_d2",
+    "black_scholes_price",
+    "black_scholes_greeks",
+    "implied_volatility"
 ]
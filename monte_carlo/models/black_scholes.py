@@ -0,0 +1,232 @@
+"""Closed-form Black-Scholes pricing on arrays of options."""
+import numpy as np
+from typing import Dict, Tuple, Union
+from scipy.special import ndtr
+
+
+OPTION_TYPES = ["call", "put"]
+
+# Volatility bracket searched by the implied-volatility solver
+IMPLIED_VOLATILITY_BOUNDS = (1e-6, 10.0)
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def call_mask(option_type: Union[str, np.ndarray]) -> np.ndarray:
+    """Boolean mask of calls for one option type or an array of them."""
+    types = np.char.lower(np.asarray(option_type, dtype=str))
+    unknown = ~np.isin(types, OPTION_TYPES)
+    if np.any(unknown):
+        raise ValueError(f"Unknown option type(s): {np.unique(types[unknown]).tolist()}. Available: {OPTION_TYPES}")
+    return types == "call"
+
+
+def black_scholes_d1_d2(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    maturity: ArrayLike
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The d1 and d2 terms of the Black-Scholes formula, broadcast over all inputs.
+
+    d1 = (ln(S / K) + (r + sigma^2 / 2) T) / (sigma sqrt(T)),  d2 = d1 - sigma sqrt(T)
+    """
+    spot, strike, rate, volatility, maturity = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (spot, strike, rate, volatility, maturity))
+    )
+    total_vol = volatility * np.sqrt(maturity)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * volatility ** 2) * maturity) / total_vol
+    return d1, d1 - total_vol
+
+
+def black_scholes_price(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    maturity: ArrayLike,
+    option_type: Union[str, np.ndarray] = "call"
+) -> Union[float, np.ndarray]:
+    """
+    Black-Scholes price of European options.
+
+    Every argument broadcasts against the others, so one call prices a
+    whole strike/maturity grid or a list of quotes.
+
+    Args:
+        spot: Price of the underlying
+        strike: Strike price
+        rate: Continuously compounded risk-free rate
+        volatility: Annual volatility
+        maturity: Time to maturity in years
+        option_type: "call" or "put", or an array of them
+
+    Returns:
+        Option prices (a float if every input is scalar)
+    """
+    d1, d2 = black_scholes_d1_d2(spot, strike, rate, volatility, maturity)
+    spot = np.asarray(spot, dtype=float)
+    discounted_strike = np.asarray(strike, dtype=float) * np.exp(-np.asarray(rate) * np.asarray(maturity))
+
+    call = spot * ndtr(d1) - discounted_strike * ndtr(d2)
+    put = discounted_strike * ndtr(-d2) - spot * ndtr(-d1)
+    price = np.where(call_mask(option_type), call, put)
+
+    return float(price) if price.ndim == 0 else price
+
+
+def black_scholes_greeks(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    maturity: ArrayLike,
+    option_type: Union[str, np.ndarray] = "call"
+) -> Dict[str, np.ndarray]:
+    """
+    Black-Scholes price and Greeks of European options, broadcast over all inputs.
+
+    Greeks are per unit of the underlying input: vega per 1.00 of
+    volatility, theta per year and rho per 1.00 of rate.
+
+    Args:
+        spot: Price of the underlying
+        strike: Strike price
+        rate: Continuously compounded risk-free rate
+        volatility: Annual volatility
+        maturity: Time to maturity in years
+        option_type: "call" or "put", or an array of them
+
+    Returns:
+        Dictionary of price, delta, gamma, vega, theta, rho, d1 and d2 arrays
+    """
+    d1, d2 = black_scholes_d1_d2(spot, strike, rate, volatility, maturity)
+    spot, strike, rate, volatility, maturity = (
+        np.asarray(x, dtype=float) for x in (spot, strike, rate, volatility, maturity)
+    )
+    call = call_mask(option_type)
+    sign = np.where(call, 1.0, -1.0)
+
+    discounted_strike = strike * np.exp(-rate * maturity)
+    density = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+    sqrt_maturity = np.sqrt(maturity)
+    itm_d1 = ndtr(sign * d1)
+    itm_d2 = ndtr(sign * d2)
+
+    return {
+        "price": sign * (spot * itm_d1 - discounted_strike * itm_d2),
+        "delta": sign * itm_d1,
+        "gamma": density / (spot * volatility * sqrt_maturity),
+        "vega": spot * density * sqrt_maturity,
+        "theta": -spot * density * volatility / (2 * sqrt_maturity) - sign * rate * discounted_strike * itm_d2,
+        "rho": sign * maturity * discounted_strike * itm_d2,
+        "d1": d1,
+        "d2": d2
+    }
+
+
+def implied_volatility(
+    price: ArrayLike,
+    spot: ArrayLike,
+    strike: ArrayLike,
+    rate: ArrayLike,
+    maturity: ArrayLike,
+    option_type: Union[str, np.ndarray] = "call",
+    tolerance: float = 1e-8,
+    max_iterations: int = 100
+) -> Union[float, np.ndarray]:
+    """
+    Invert Black-Scholes prices to volatilities for a whole array of quotes.
+
+    Each quote keeps a bracket [low, high] on its volatility, tightened at
+    every iteration from the sign of its pricing error (prices increase
+    with volatility). The next guess is the Newton step when it lands
+    inside the bracket and a bisection of the bracket otherwise, so
+    convergence is quadratic near the root and guaranteed far from it.
+    Newton starts near the inflection point of the price in volatility,
+    sqrt(2 |ln(S / K) + r T| / T), kept within [0.1, high / 2].
+    All quotes iterate together and converged ones drop out.
+
+    Args:
+        price: Observed option prices
+        spot: Price of the underlying
+        strike: Strike price
+        rate: Continuously compounded risk-free rate
+        maturity: Time to maturity in years
+        option_type: "call" or "put", or an array of them
+        tolerance: Absolute price error at which a quote has converged
+        max_iterations: Maximum number of iterations
+
+    Returns:
+        Implied volatilities (a float if every input is scalar); NaN where
+        the price violates the no-arbitrage bounds, needs a volatility
+        outside IMPLIED_VOLATILITY_BOUNDS or has not converged within
+        max_iterations
+    """
+    price, spot, strike, rate, maturity = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (price, spot, strike, rate, maturity))
+    )
+    sign = np.broadcast_to(np.where(call_mask(option_type), 1.0, -1.0), price.shape)
+    shape = price.shape
+    price, spot, strike, rate, maturity, sign = (
+        x.ravel() for x in (price, spot, strike, rate, maturity, sign)
+    )
+
+    low_vol, high_vol = IMPLIED_VOLATILITY_BOUNDS
+    volatility = np.full(price.shape, np.nan)
+
+    # Quotes must lie strictly between the prices at the ends of the bracket
+    index = np.flatnonzero((maturity > 0) & np.isfinite(price))
+    bounds = [
+        _price_and_vega(spot[index], strike[index], rate[index], np.full(index.size, vol), maturity[index], sign[index])[0]
+        for vol in IMPLIED_VOLATILITY_BOUNDS
+    ]
+    solvable = (price[index] > bounds[0]) & (price[index] < bounds[1])
+    index = index[solvable]
+
+    low = np.full(index.size, low_vol)
+    high = np.full(index.size, high_vol)
+    forward_moneyness = np.abs(np.log(spot[index] / strike[index]) + rate[index] * maturity[index])
+    sigma = np.clip(np.sqrt(2 * forward_moneyness / maturity[index]), 0.1, high_vol / 2)
+
+    for _ in range(max_iterations):
+        if index.size == 0:
+            break
+        model_price, vega = _price_and_vega(spot[index], strike[index], rate[index], sigma, maturity[index], sign[index])
+        error = model_price - price[index]
+
+        converged = np.abs(error) < tolerance
+        volatility[index[converged]] = sigma[converged]
+
+        high = np.where(error > 0, sigma, high)
+        low = np.where(error < 0, sigma, low)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sigma - error / vega
+        inside = (newton > low) & (newton < high)
+        sigma = np.where(inside, newton, (low + high) / 2)
+
+        active = ~converged
+        index, sigma, low, high = index[active], sigma[active], low[active], high[active]
+
+    volatility = volatility.reshape(shape)
+    return float(volatility) if volatility.ndim == 0 else volatility
+
+
+def _price_and_vega(
+    spot: np.ndarray,
+    strike: np.ndarray,
+    rate: np.ndarray,
+    volatility: np.ndarray,
+    maturity: np.ndarray,
+    sign: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Price and vega of flat arrays of options; sign is +1 for calls and -1 for puts."""
+    sqrt_maturity = np.sqrt(maturity)
+    total_vol = volatility * sqrt_maturity
+    d1 = (np.log(spot / strike) + (rate + 0.5 * volatility ** 2) * maturity) / total_vol
+    d2 = d1 - total_vol
+    price = sign * (spot * ndtr(sign * d1) - strike * np.exp(-rate * maturity) * ndtr(sign * d2))
+    vega = spot * np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi) * sqrt_maturity
+    return price, vega
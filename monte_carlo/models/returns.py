@@ -1,12 +1,115 @@
 """Return distribution models for Monte Carlo simulations."""
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List, Tuple, Callable, Iterator
 from scipy import stats
 
+from .sampling import SAMPLERS, DEFAULT_QMC_REPLICATIONS, sobol_normals
+
+
+VARIANCE_REDUCTION_TECHNIQUES = ["antithetic", "moment_matching", "control_variate"]
+
+BOOTSTRAP_METHODS = ["moving", "circular", "stationary"]
+
 
 class ReturnModel(ABC):
-    """Abstract base class for return distribution models."""
+    """
+    Abstract base class for return distribution models.
+
+    Models built on symmetric shocks can apply variance reduction to their
+    draws: ``antithetic`` pairs every draw with its negation in adjacent
+    rows (simulations 2k and 2k+1), and ``moment_matching`` rescales each
+    period's draws to exactly zero mean and the target standard deviation.
+    ``control_variate`` is applied by the simulators to payoffs and has no
+    effect on the draws.
+
+    Models drawing Gaussian shocks can also use the ``sobol`` sampler:
+    randomized quasi-Monte Carlo with Brownian-bridge path construction,
+    where simulation i belongs to replication ``i % qmc_replications``.
+    """
+
+    variance_reduction: Tuple[str, ...] = ()
+    sampler: str = "pseudo"
+    qmc_replications: int = DEFAULT_QMC_REPLICATIONS
+
+    def _set_variance_reduction(self, techniques: Optional[List[str]]) -> None:
+        """Validate and store the variance reduction techniques."""
+        techniques = tuple(t.lower() for t in (techniques or []))
+        unknown = [t for t in techniques if t not in VARIANCE_REDUCTION_TECHNIQUES]
+        if unknown:
+            raise ValueError(
+                f"Unknown variance reduction technique(s): {unknown}. "
+                f"Available: {VARIANCE_REDUCTION_TECHNIQUES}"
+            )
+        self.variance_reduction = techniques
+
+    def _set_sampler(self, sampler: str, qmc_replications: int) -> None:
+        """Validate and store the sampler used for Gaussian shocks."""
+        sampler = sampler.lower()
+        if sampler not in SAMPLERS:
+            raise ValueError(f"Unknown sampler: {sampler}. Available: {SAMPLERS}")
+
+        if sampler == "sobol":
+            conflicting = [t for t in self.variance_reduction if t in ["antithetic", "moment_matching"]]
+            if conflicting:
+                raise ValueError(f"Sobol sampling cannot be combined with {conflicting}")
+            if qmc_replications < 2:
+                raise ValueError("Sobol sampling needs at least 2 replications for error estimates")
+
+        self.sampler = sampler
+        self.qmc_replications = qmc_replications
+
+    def _draw_normal_shocks(
+        self,
+        shape: tuple,
+        random_state: np.random.Generator
+    ) -> np.ndarray:
+        """Draw standard normal shocks with the configured sampler."""
+        return self._draw_shocks(random_state.standard_normal, shape, random_state=random_state)
+
+    def _draw_shocks(
+        self,
+        sampler: Callable[[tuple], np.ndarray],
+        shape: tuple,
+        target_std: Optional[float] = 1.0,
+        random_state: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """
+        Draw symmetric zero-mean shocks of ``shape`` with variance reduction.
+
+        Args:
+            sampler: Function returning i.i.d. draws for a given shape
+            shape: Output shape, simulations along the first axis
+            target_std: Standard deviation imposed by moment matching, or
+                None to match the mean only
+            random_state: Generator for the Sobol scrambles; required when
+                the sampler is ``sobol`` (which ignores ``sampler``)
+        """
+        n = shape[0]
+
+        if self.sampler == "sobol":
+            n_steps = int(np.prod(shape[1:])) if len(shape) > 1 else 1
+            shocks = sobol_normals(
+                n, n_steps, random_state=random_state, replications=self.qmc_replications
+            )
+            return shocks.reshape(shape)
+
+        if "antithetic" in self.variance_reduction:
+            half = sampler(((n + 1) // 2,) + tuple(shape[1:]))
+            shocks = np.empty((2 * len(half),) + tuple(shape[1:]))
+            shocks[0::2] = half
+            shocks[1::2] = -half
+            shocks = shocks[:n]
+        else:
+            shocks = sampler(shape)
+
+        if "moment_matching" in self.variance_reduction and n > 1:
+            shocks -= shocks.mean(axis=0)
+            if target_std is not None:
+                std = shocks.std(axis=0)
+                shocks *= target_std / np.where(std > 0, std, 1.0)
+
+        return shocks
 
     @abstractmethod
     def generate_returns(
@@ -41,11 +144,16 @@ class GeometricBrownianMotion(ReturnModel):
         self,
         annual_return: float = 0.07,
         annual_volatility: float = 0.15,
-        periods_per_year: int = 12
+        periods_per_year: int = 12,
+        variance_reduction: Optional[List[str]] = None,
+        sampler: str = "pseudo",
+        qmc_replications: int = DEFAULT_QMC_REPLICATIONS
     ):
         self.annual_return = annual_return
         self.annual_volatility = annual_volatility
         self.periods_per_year = periods_per_year
+        self._set_variance_reduction(variance_reduction)
+        self._set_sampler(sampler, qmc_replications)
 
         self.dt = 1.0 / periods_per_year
         self.mu = annual_return
@@ -64,7 +172,7 @@ class GeometricBrownianMotion(ReturnModel):
         drift = (self.mu - 0.5 * self.sigma ** 2) * self.dt
         diffusion = self.sigma * np.sqrt(self.dt)
 
-        Z = random_state.standard_normal((n_simulations, n_periods))
+        Z = self._draw_normal_shocks((n_simulations, n_periods), random_state)
         log_returns = drift + diffusion * Z
 
         return log_returns
@@ -85,6 +193,109 @@ class GeometricBrownianMotion(ReturnModel):
 
         return np.exp(log_prices)
 
+    def generate_terminal_prices(
+        self,
+        initial_price: float,
+        horizon_years: float,
+        n_simulations: int,
+        random_state: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """
+        Sample prices at the horizon directly, without intermediate steps.
+
+        Under GBM the terminal log price is exactly normal, so one draw per
+        simulation replaces a full path.
+        """
+        if random_state is None:
+            random_state = np.random.default_rng()
+
+        drift = (self.mu - 0.5 * self.sigma ** 2) * horizon_years
+        diffusion = self.sigma * np.sqrt(horizon_years)
+
+        Z = self._draw_normal_shocks((n_simulations,), random_state)
+
+        return initial_price * np.exp(drift + diffusion * Z)
+
+    def generate_prices_at(
+        self,
+        initial_price: float,
+        times: np.ndarray,
+        n_simulations: int,
+        random_state: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """
+        Sample prices at increasing horizons along the same paths.
+
+        Log-price increments between consecutive horizons are exactly
+        normal, so each path is drawn only at the dates that are needed,
+        however far apart they are.
+
+        Args:
+            initial_price: Starting price
+            times: Strictly increasing horizons in years
+            n_simulations: Number of paths
+            random_state: Random generator
+
+        Returns:
+            Array of shape (n_simulations, len(times))
+        """
+        if random_state is None:
+            random_state = np.random.default_rng()
+
+        times = np.asarray(times, dtype=float)
+        steps = np.diff(times, prepend=0.0)
+        if np.any(steps <= 0):
+            raise ValueError("times must be positive and strictly increasing")
+
+        Z = self._draw_normal_shocks((n_simulations, len(times)), random_state)
+        log_returns = (self.mu - 0.5 * self.sigma ** 2) * steps + self.sigma * np.sqrt(steps) * Z
+
+        return initial_price * np.exp(np.cumsum(log_returns, axis=1))
+
+    def iterate_prices_backward(
+        self,
+        initial_price: float,
+        times: np.ndarray,
+        n_simulations: int,
+        random_state: Optional[np.random.Generator] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield the prices at each horizon from the last to the first.
+
+        The Brownian motion is drawn at the last horizon and filled in
+        backwards with Brownian-bridge steps, so only one date of every
+        path is held in memory at a time. Backward algorithms such as
+        least-squares exercise pricing can then run without the full path
+        matrix.
+
+        Args:
+            initial_price: Starting price
+            times: Strictly increasing horizons in years
+            n_simulations: Number of paths
+            random_state: Random generator
+
+        Yields:
+            Prices at times[-1], times[-2], ..., times[0]
+        """
+        if self.sampler == "sobol":
+            raise ValueError("Backward path generation draws one date at a time and cannot use Sobol sampling")
+        if random_state is None:
+            random_state = np.random.default_rng()
+
+        times = np.asarray(times, dtype=float)
+        if np.any(np.diff(times, prepend=0.0) <= 0):
+            raise ValueError("times must be positive and strictly increasing")
+
+        drift = self.mu - 0.5 * self.sigma ** 2
+        brownian = np.sqrt(times[-1]) * self._draw_normal_shocks((n_simulations,), random_state)
+        yield initial_price * np.exp(drift * times[-1] + self.sigma * brownian)
+
+        for later, earlier in zip(times[:0:-1], times[-2::-1]):
+            # W(earlier) given W(later) and W(0) = 0
+            bridge_std = np.sqrt(earlier * (later - earlier) / later)
+            brownian = brownian * (earlier / later) + bridge_std * self._draw_normal_shocks((n_simulations,), random_state)
+            yield initial_price * np.exp(drift * earlier + self.sigma * brownian)
+
 
 class NormalReturns(ReturnModel):
     """Simple normal distribution model for returns."""
@@ -93,11 +304,16 @@ class NormalReturns(ReturnModel):
         self,
         annual_return: float = 0.07,
         annual_volatility: float = 0.15,
-        periods_per_year: int = 12
+        periods_per_year: int = 12,
+        variance_reduction: Optional[List[str]] = None,
+        sampler: str = "pseudo",
+        qmc_replications: int = DEFAULT_QMC_REPLICATIONS
     ):
         self.annual_return = annual_return
         self.annual_volatility = annual_volatility
         self.periods_per_year = periods_per_year
+        self._set_variance_reduction(variance_reduction)
+        self._set_sampler(sampler, qmc_replications)
 
         self.periodic_return = annual_return / periods_per_year
         self.periodic_volatility = annual_volatility / np.sqrt(periods_per_year)
@@ -112,11 +328,8 @@ class NormalReturns(ReturnModel):
         if random_state is None:
             random_state = np.random.default_rng()
 
-        returns = random_state.normal(
-            self.periodic_return,
-            self.periodic_volatility,
-            (n_simulations, n_periods)
-        )
+        Z = self._draw_normal_shocks((n_simulations, n_periods), random_state)
+        returns = self.periodic_return + self.periodic_volatility * Z
         return returns
 
     def generate_price_paths(
@@ -149,12 +362,14 @@ class StudentTReturns(ReturnModel):
         annual_return: float = 0.07,
         annual_volatility: float = 0.15,
         degrees_of_freedom: float = 5.0,
-        periods_per_year: int = 12
+        periods_per_year: int = 12,
+        variance_reduction: Optional[List[str]] = None
     ):
         self.annual_return = annual_return
         self.annual_volatility = annual_volatility
         self.df = degrees_of_freedom
         self.periods_per_year = periods_per_year
+        self._set_variance_reduction(variance_reduction)
 
         self.periodic_return = annual_return / periods_per_year
         self.periodic_volatility = annual_volatility / np.sqrt(periods_per_year)
@@ -174,7 +389,11 @@ class StudentTReturns(ReturnModel):
         if random_state is None:
             random_state = np.random.default_rng()
 
-        t_samples = random_state.standard_t(self.df, (n_simulations, n_periods))
+        t_samples = self._draw_shocks(
+            lambda shape: random_state.standard_t(self.df, shape),
+            (n_simulations, n_periods),
+            target_std=np.sqrt(self.df / (self.df - 2)) if self.df > 2 else None
+        )
         returns = self.periodic_return + self.scale * t_samples
 
         return returns
@@ -201,15 +420,39 @@ class StudentTReturns(ReturnModel):
 
 
 class HistoricalBootstrap(ReturnModel):
-    """Bootstrap returns from historical data."""
+    """
+    Bootstrap returns from historical data.
+
+    With ``block_size > 1`` consecutive runs of history are resampled to
+    keep short-range dependence:
+
+    - ``moving``: blocks of fixed length starting anywhere they fit
+    - ``circular``: blocks of fixed length that wrap around the end of the
+      history, so every observation is equally likely to be drawn
+    - ``stationary``: blocks of geometric length with mean ``block_size``,
+      also wrapping (Politis-Romano), giving a stationary resampled series
+
+    All block starts are drawn in one call and gathered by fancy indexing.
+    """
 
     def __init__(
         self,
         historical_returns: np.ndarray,
-        block_size: int = 1
+        block_size: int = 1,
+        method: str = "moving"
     ):
         self.historical_returns = np.asarray(historical_returns).flatten()
+        if len(self.historical_returns) == 0:
+            raise ValueError("historical_returns must not be empty")
+        if block_size < 1:
+            raise ValueError(f"block_size must be at least 1, got {block_size}")
+
+        method = method.lower()
+        if method not in BOOTSTRAP_METHODS:
+            raise ValueError(f"Unknown bootstrap method: {method}. Available: {BOOTSTRAP_METHODS}")
+
         self.block_size = block_size
+        self.method = method
 
     def generate_returns(
         self,
@@ -221,30 +464,55 @@ class HistoricalBootstrap(ReturnModel):
         if random_state is None:
             random_state = np.random.default_rng()
 
+        n_history = len(self.historical_returns)
+
         if self.block_size == 1:
-            indices = random_state.integers(
-                0, len(self.historical_returns),
-                (n_simulations, n_periods)
-            )
-            returns = self.historical_returns[indices]
+            indices = random_state.integers(0, n_history, (n_simulations, n_periods))
+        elif self.method == "stationary":
+            indices = self._stationary_indices(n_periods, n_simulations, random_state)
         else:
-            n_blocks = (n_periods + self.block_size - 1) // self.block_size
-            returns = np.zeros((n_simulations, n_periods))
-
-            max_start = len(self.historical_returns) - self.block_size
-            if max_start < 0:
-                max_start = 0
-
-            for sim in range(n_simulations):
-                idx = 0
-                for _ in range(n_blocks):
-                    start = random_state.integers(0, max_start + 1)
-                    block = self.historical_returns[start:start + self.block_size]
-                    end_idx = min(idx + len(block), n_periods)
-                    returns[sim, idx:end_idx] = block[:end_idx - idx]
-                    idx = end_idx
+            if self.method == "circular":
+                block_size = self.block_size
+                starts = random_state.integers(0, n_history, (n_simulations, -(-n_periods // block_size)))
+            else:
+                # Blocks never run past the end of the history
+                block_size = min(self.block_size, n_history)
+                starts = random_state.integers(
+                    0, n_history - block_size + 1,
+                    (n_simulations, -(-n_periods // block_size))
+                )
+
+            offsets = np.arange(block_size)
+            indices = (starts[:, :, None] + offsets).reshape(n_simulations, -1)[:, :n_periods]
+            if self.method == "circular":
+                indices %= n_history
+
+        return self.historical_returns[indices]
+
+    def _stationary_indices(
+        self,
+        n_periods: int,
+        n_simulations: int,
+        random_state: np.random.Generator
+    ) -> np.ndarray:
+        """History indices for the stationary bootstrap."""
+        n_history = len(self.historical_returns)
 
-        return returns
+        # A new block starts with probability 1 / block_size each period;
+        # otherwise the previous index advances by one (wrapping around)
+        new_block = random_state.random((n_simulations, n_periods)) < 1 / self.block_size
+        new_block[:, 0] = True
+
+        # Number every block across all paths and draw one start per block
+        block_id = np.cumsum(new_block, axis=None).reshape(n_simulations, n_periods) - 1
+        starts = random_state.integers(0, n_history, block_id[-1, -1] + 1)
+
+        periods = np.arange(n_periods)
+        block_start = np.maximum.accumulate(np.where(new_block, periods, 0), axis=1)
+        indices = starts[block_id]
+        indices += periods - block_start
+        indices %= n_history
+        return indices
 
     def generate_price_paths(
         self,
@@ -289,12 +557,18 @@ def create_return_model(
             raise ValueError("HistoricalBootstrap requires 'historical_returns' parameter")
         return HistoricalBootstrap(
             historical_returns=kwargs["historical_returns"],
-            block_size=kwargs.get("block_size", 1)
+            block_size=kwargs.get("block_size", 1),
+            method=kwargs.get("bootstrap_method", "moving")
         )
 
+    if model_type == "student_t":
+        allowed = ["degrees_of_freedom", "variance_reduction"]
+    else:
+        allowed = ["variance_reduction", "sampler", "qmc_replications"]
+
     return models[model_type](
         annual_return=annual_return,
         annual_volatility=annual_volatility,
         periods_per_year=periods_per_year,
-        **{k: v for k, v in kwargs.items() if k in ["degrees_of_freedom"]}
+        **{k: v for k, v in kwargs.items() if k in allowed}
     )
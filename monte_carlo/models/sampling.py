@@ -0,0 +1,136 @@
+"""Quasi-Monte Carlo sampling of Gaussian shocks."""
+import warnings
+import numpy as np
+from typing import Optional, Tuple
+from scipy import stats
+from scipy.stats import qmc
+
+
+SAMPLERS = ["pseudo", "sobol"]
+
+DEFAULT_QMC_REPLICATIONS = 8
+
+
+def brownian_bridge_order(n_steps: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Construction schedule for a Brownian bridge on times 1..n_steps.
+
+    The first point built is the terminal value, followed by successive
+    midpoints, so the leading (best-distributed) Sobol coordinates drive
+    the large-scale shape of the path.
+
+    Returns:
+        Tuple of (points, lefts, rights, left_weights, stds). Step k builds
+        point ``points[k]`` from its neighbours ``lefts[k]`` and
+        ``rights[k]`` (index -1 means time zero, where W = 0).
+    """
+    points = [n_steps - 1]
+    lefts = [-1]
+    rights = [-1]
+    left_weights = [0.0]
+    stds = [np.sqrt(n_steps)]
+
+    intervals = [(-1, n_steps - 1)]
+    while intervals:
+        next_intervals = []
+        for left, right in intervals:
+            if right - left < 2:
+                continue
+            mid = (left + right + 1) // 2
+            t_left, t_mid, t_right = left + 1, mid + 1, right + 1
+            points.append(mid)
+            lefts.append(left)
+            rights.append(right)
+            left_weights.append((t_right - t_mid) / (t_right - t_left))
+            stds.append(np.sqrt((t_mid - t_left) * (t_right - t_mid) / (t_right - t_left)))
+            next_intervals.extend([(left, mid), (mid, right)])
+        intervals = next_intervals
+
+    return (
+        np.array(points),
+        np.array(lefts),
+        np.array(rights),
+        np.array(left_weights),
+        np.array(stds)
+    )
+
+
+def brownian_bridge_increments(normals: np.ndarray) -> np.ndarray:
+    """
+    Turn i.i.d. normals into unit-variance Brownian increments via a bridge.
+
+    Args:
+        normals: Array of shape (n_samples, n_steps, n_factors), consumed
+            along the step axis in bridge order
+
+    Returns:
+        Array of the same shape whose entries along the step axis are
+        independent N(0, 1) increments of a Brownian path
+    """
+    n_samples, n_steps, n_factors = normals.shape
+    points, lefts, rights, left_weights, stds = brownian_bridge_order(n_steps)
+
+    W = np.zeros((n_samples, n_steps + 1, n_factors))
+    # Shift indices by one so that index 0 holds W(0) = 0
+    for k in range(n_steps):
+        left_value = W[:, lefts[k] + 1]
+        right_value = W[:, rights[k] + 1] if k > 0 else 0.0
+        W[:, points[k] + 1] = (
+            left_weights[k] * left_value
+            + (1 - left_weights[k]) * right_value
+            + stds[k] * normals[:, k]
+        )
+
+    return np.diff(W, axis=1)
+
+
+def sobol_normals(
+    n_samples: int,
+    n_steps: int,
+    n_factors: int = 1,
+    random_state: Optional[np.random.Generator] = None,
+    replications: int = DEFAULT_QMC_REPLICATIONS,
+    brownian_bridge: bool = True
+) -> np.ndarray:
+    """
+    Standard normal shocks from randomized (scrambled) Sobol sequences.
+
+    Sample i belongs to replication ``i % replications``; every replication
+    is an independently scrambled Sobol point set, so the spread of
+    per-replication estimates gives an honest error estimate.
+
+    Args:
+        n_samples: Number of samples (simulations)
+        n_steps: Number of time steps per sample
+        n_factors: Number of shocks per time step (e.g. assets)
+        random_state: Generator used to draw the scrambles
+        replications: Number of independent randomizations
+        brownian_bridge: Build the time dimension with a Brownian bridge
+
+    Returns:
+        Array of shape (n_samples, n_steps, n_factors) of N(0, 1) shocks
+    """
+    if random_state is None:
+        random_state = np.random.default_rng()
+
+    dim = n_steps * n_factors
+    replications = max(1, min(replications, n_samples))
+    normals = np.empty((n_samples, dim))
+
+    with warnings.catch_warnings():
+        # Replication sizes are rarely powers of two; scrambling keeps the
+        # points unbiased regardless of the balance warning
+        warnings.simplefilter("ignore", UserWarning)
+        for r in range(replications):
+            n_rep = len(range(r, n_samples, replications))
+            engine = qmc.Sobol(dim, scramble=True, seed=random_state)
+            uniforms = engine.random(n_rep)
+            normals[r::replications] = stats.norm.ppf(uniforms)
+
+    # Coordinate k drives step k // n_factors of factor k % n_factors
+    normals = normals.reshape(n_samples, n_steps, n_factors)
+
+    if brownian_bridge and n_steps > 1:
+        return brownian_bridge_increments(normals)
+    return normals
+
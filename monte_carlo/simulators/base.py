@@ -1,13 +1,30 @@
 """Abstract base class for Monte Carlo simulators."""
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import json
 from pathlib import Path
 
 from ..config import SimulationConfig
-from ..utils.stats import calculate_statistics, calculate_percentiles
+from ..utils.stats import (
+    calculate_statistics,
+    calculate_percentiles,
+    calculate_mc_estimate,
+    calculate_quantile_std_error
+)
+from ..utils.summary import SampleSummary
+from .storage import PathStore, parse_path_storage
+
+
+ERROR_TYPES = ["std_error", "ci_half_width", "relative_error"]
+
+# z-score of the two-sided 95% confidence interval
+CI_Z_SCORE = 1.96
+
+# Path feature holding per-path sample weights (e.g. likelihood ratios)
+SAMPLE_WEIGHT_FEATURE = "sample_weight"
 
 
 @dataclass
@@ -19,6 +36,9 @@ class SimulationResults:
 
     final_values: np.ndarray = field(repr=False)
     all_paths: Optional[np.ndarray] = field(default=None, repr=False)
+    path_store: Optional[PathStore] = field(default=None, repr=False)
+    path_features: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+    final_summary: Optional[SampleSummary] = field(default=None, repr=False)
 
     statistics: Dict[str, float] = field(default_factory=dict)
     percentiles: Dict[str, float] = field(default_factory=dict)
@@ -35,6 +55,15 @@ class SimulationResults:
             "custom_metrics": self.custom_metrics
         }
 
+    def get_percentile_paths(self, percentiles: List[float] = [5, 25, 50, 75, 95]) -> Dict[float, np.ndarray]:
+        """Get per-period percentile series from the retained paths."""
+        if self.path_store is None:
+            if self.all_paths is None:
+                raise ValueError("Paths were not saved for this simulation")
+            return {p: np.percentile(self.all_paths, p, axis=0) for p in percentiles}
+
+        return self.path_store.percentile_paths(percentiles)
+
     def save_json(self, filepath: Path) -> None:
         """Save results to JSON file."""
         with open(filepath, 'w') as f:
@@ -92,6 +121,23 @@ class BaseSimulator(ABC):
         self.config = config
         self.random_state = np.random.default_rng(config.random_seed)
         self.results: Optional[SimulationResults] = None
+        self.path_features: Dict[str, np.ndarray] = {}
+        self.final_summary: Optional[SampleSummary] = None
+
+        parse_path_storage(self.path_storage)
+
+        if config.target_metric is not None:
+            if config.error_type not in ERROR_TYPES:
+                raise ValueError(f"Unknown error type: {config.error_type}. Available: {ERROR_TYPES}")
+            if config.target_error is None or config.target_error <= 0:
+                raise ValueError(f"target_error must be positive, got {config.target_error}")
+            if config.batch_size is not None and config.batch_size <= 0:
+                raise ValueError(f"batch_size must be positive, got {config.batch_size}")
+            if not self._is_convergence_metric(config.target_metric):
+                raise ValueError(
+                    f"Adaptive stopping is not supported for metric: {config.target_metric}. "
+                    f"Available: {self._convergence_metrics()} or pXX percentiles"
+                )
 
     @property
     @abstractmethod
@@ -100,12 +146,23 @@ class BaseSimulator(ABC):
         pass
 
     @abstractmethod
-    def _run_simulation(self) -> tuple:
+    def _run_simulation(self, n_sims: Optional[int] = None) -> tuple:
         """
-        Run the core simulation logic.
+        Run the core simulation logic for ``n_sims`` paths.
+
+        Args:
+            n_sims: Number of paths to simulate (defaults to config.num_simulations)
 
         Returns:
-            Tuple of (final_values, all_paths) where all_paths can be None
+            Tuple of (final_values, all_paths) where all_paths can be None,
+            optionally followed by a dict of per-path features that custom
+            metrics rely on. Features are indexed by path along their first
+            axis: usually 1-D (such as the value at retirement), but 2-D
+            features with one row per path are concatenated across chunks,
+            shards and batches too. Features are kept whole whatever the
+            path storage policy, so large ones should honour it themselves.
+            A ``sample_weight`` feature weights every path in the statistics,
+            percentiles and summaries of the run.
         """
         pass
 
@@ -116,18 +173,37 @@ class BaseSimulator(ABC):
 
     def run(self) -> SimulationResults:
         """Run the full simulation and return results."""
-        final_values, all_paths = self._run_simulation()
-
-        statistics = calculate_statistics(final_values)
-        percentiles = calculate_percentiles(final_values)
-        custom_metrics = self._calculate_custom_metrics(final_values, all_paths)
+        # Drop the previous run's summary so a re-run never reuses it
+        self.final_summary = None
+        convergence = {}
+        if self.config.target_metric is not None:
+            final_values, path_store, path_features, convergence = self._simulate_adaptive(
+                self.config.num_simulations
+            )
+        elif self.config.workers > 1:
+            final_values, path_store, path_features = self._simulate_sharded(
+                self.config.num_simulations
+            )
+        else:
+            final_values, path_store, path_features = self._simulate(self.config.num_simulations)
+        self.path_features = path_features
+
+        # Sorted once here and reused by every quantile query on the final values
+        self.final_summary = self._summarize(final_values)
+        statistics = calculate_statistics(self.final_summary)
+        percentiles = calculate_percentiles(self.final_summary)
+        custom_metrics = self._calculate_custom_metrics(final_values, path_store.all_paths)
+        custom_metrics.update(convergence)
 
         self.results = SimulationResults(
             simulation_type=self.simulation_type,
-            num_simulations=self.config.num_simulations,
+            num_simulations=len(final_values),
             time_horizon_years=self.config.time_horizon_years,
             final_values=final_values,
-            all_paths=all_paths,
+            all_paths=path_store.all_paths,
+            path_store=path_store,
+            path_features=path_features,
+            final_summary=self.final_summary,
             statistics=statistics,
             percentiles=percentiles,
             custom_metrics=custom_metrics
@@ -135,19 +211,365 @@ class BaseSimulator(ABC):
 
         return self.results
 
-    def get_percentile_paths(self, percentiles: List[float] = [5, 25, 50, 75, 95]) -> Dict[int, np.ndarray]:
-        """Get paths at specified percentiles for visualization."""
-        if self.results is None or self.results.all_paths is None:
-            raise ValueError("Run simulation first and ensure paths are saved")
+    @property
+    def path_storage(self) -> str:
+        """
+        Effective path storage policy.
+
+        Defaults to ``full`` for in-memory runs and ``none`` for chunked runs.
+        """
+        if self.config.path_storage is not None:
+            return self.config.path_storage
+        return "full" if self.config.chunk_size is None else "none"
+
+    def _path_periods(self) -> Optional[int]:
+        """Number of periods in each simulated path (None if not known up front)."""
+        return None
+
+    def _simulate(
+        self,
+        n_sims: int
+    ) -> Tuple[np.ndarray, PathStore, Dict[str, np.ndarray]]:
+        """
+        Simulate ``n_sims`` paths, streaming them in chunks if configured.
+
+        With ``chunk_size`` set, paths are generated ``chunk_size`` at a time
+        and only the final values, per-path features and whatever the path
+        storage policy retains are kept from each chunk, so peak memory is
+        bounded by the chunk rather than by ``n_sims``. Chunks draw from the
+        same generator in sequence, and ``chunk_size`` is rounded up to whole
+        antithetic pairs, so pseudo-random results do not depend on it.
+
+        Under the ``sobol`` sampler every chunk draws its own scrambles, so
+        results depend on ``chunk_size`` (each chunk is still an unbiased
+        randomized QMC sample). ``chunk_size`` is rounded down to
+        ``qmc_replications`` times a power of two, keeping each replication
+        of a chunk a balanced Sobol point set.
+        """
+        chunk_size = self.config.chunk_size
+        path_store = PathStore(self.path_storage, self._path_periods())
+
+        if chunk_size is not None and chunk_size > 0:
+            chunk_size = self._chunk_length(chunk_size)
+
+        if chunk_size is None or chunk_size >= n_sims:
+            final_values, all_paths, path_features = self._unpack(self._run_simulation(n_sims))
+            if all_paths is not None:
+                path_store.add(all_paths)
+                if path_store.all_paths is None:
+                    # Copy so that column views do not keep the dropped paths alive
+                    final_values = final_values.copy()
+                    path_features = {key: values.copy() for key, values in path_features.items()}
+            return final_values, path_store, path_features
+
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        final_chunks = []
+        feature_chunks: Dict[str, List[np.ndarray]] = {}
+
+        for start in range(0, n_sims, chunk_size):
+            size = min(chunk_size, n_sims - start)
+            final_values, all_paths, features = self._unpack(self._run_simulation(size))
+
+            # Copy so that column views do not keep the chunk's paths alive
+            final_chunks.append(final_values.copy())
+            for key, values in features.items():
+                feature_chunks.setdefault(key, []).append(values.copy())
+            if all_paths is not None:
+                path_store.add(all_paths)
+
+        final_values = np.concatenate(final_chunks)
+        path_features = {
+            key: np.concatenate(chunks) for key, chunks in feature_chunks.items()
+        }
 
-        paths = self.results.all_paths
-        result = {}
+        return final_values, path_store, path_features
 
-        for p in percentiles:
-            percentile_values = np.percentile(paths, p, axis=0)
-            result[p] = percentile_values
+    def _simulate_sharded(
+        self,
+        n_sims: int,
+        seed_sequence: Optional[np.random.SeedSequence] = None
+    ) -> Tuple[np.ndarray, PathStore, Dict[str, np.ndarray]]:
+        """
+        Simulate ``n_sims`` paths split across ``config.workers`` processes.
+
+        Each shard gets an independent stream spawned from ``seed_sequence``
+        (by default ``np.random.SeedSequence(config.random_seed)``), and shard
+        outputs are concatenated in shard order, so results are reproducible
+        for a given seed and worker count.
+        """
+        workers = self.config.workers
+        if seed_sequence is None:
+            seed_sequence = np.random.SeedSequence(self.config.random_seed)
+        # Shards hold whole sampling units; the remainder goes to the last one
+        unit = self._sampling_unit()
+        n_units = n_sims // unit
+        sizes = [(n_units // workers + (1 if i < n_units % workers else 0)) * unit for i in range(workers)]
+        sizes[-1] += n_sims % unit
+        seeds = seed_sequence.spawn(workers)
+        shards = [(size, seed) for size, seed in zip(sizes, seeds) if size > 0]
+
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            outcomes = list(executor.map(
+                _run_shard,
+                [type(self)] * len(shards),
+                [self.config] * len(shards),
+                [size for size, _ in shards],
+                [seed for _, seed in shards]
+            ))
+
+        final_values = np.concatenate([outcome[0] for outcome in outcomes])
+
+        path_store = PathStore(self.path_storage, self._path_periods())
+        for outcome in outcomes:
+            path_store.extend(outcome[1])
+
+        path_features = {
+            key: np.concatenate([outcome[2][key] for outcome in outcomes])
+            for key in outcomes[0][2]
+        }
+
+        return final_values, path_store, path_features
+
+    def _simulate_adaptive(
+        self,
+        max_sims: int
+    ) -> Tuple[np.ndarray, PathStore, Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Simulate batches until ``config.target_metric`` reaches the target error.
+
+        After every batch the target metric and its standard error are
+        re-estimated from all paths so far. The run stops once the error,
+        measured as ``config.error_type``, is at most ``config.target_error``,
+        or when ``max_sims`` paths have been used.
+
+        Returns:
+            Tuple of (final_values, path_store, path_features, convergence)
+            where convergence summarizes the stopping decision
+        """
+        config = self.config
+        batch_size = self._adaptive_batch_size(max_sims)
+        seed_sequence = np.random.SeedSequence(config.random_seed)
+
+        path_store = PathStore(self.path_storage, self._path_periods())
+        # Batches are appended to buffers that grow by doubling, so each
+        # path is copied a bounded number of times however many batches run
+        final_buffer: Optional[np.ndarray] = None
+        feature_buffers: Dict[str, np.ndarray] = {}
+        n_done = 0
+        n_batches = 0
+
+        while True:
+            size = min(batch_size, max_sims - n_done)
+            if config.workers > 1:
+                # A fresh child sequence per batch keeps batches independent
+                batch = self._simulate_sharded(size, seed_sequence.spawn(1)[0])
+            else:
+                batch = self._simulate(size)
+            n_batches += 1
+
+            path_store.extend(batch[1])
+            final_buffer = _append_to_buffer(final_buffer, batch[0], n_done, max_sims)
+            for key, values in batch[2].items():
+                feature_buffers[key] = _append_to_buffer(feature_buffers.get(key), values, n_done, max_sims)
+            n_done += len(batch[0])
+
+            final_values = final_buffer[:n_done]
+            self.path_features = {key: buffer[:n_done] for key, buffer in feature_buffers.items()}
+
+            estimate, std_error = self._convergence_estimate(config.target_metric, final_values)
+            error = self._measure_error(estimate, std_error)
+            target_met = bool(error <= config.target_error)
+
+            if target_met or n_done >= max_sims:
+                break
+
+        if len(final_buffer) > n_done:
+            # Copy so that the spare capacity is released
+            final_values = final_values.copy()
+            self.path_features = {key: values.copy() for key, values in self.path_features.items()}
+
+        convergence = {
+            "target_metric": config.target_metric,
+            "target_estimate": estimate,
+            f"target_{config.error_type}": error,
+            "target_met": target_met,
+            "simulations_used": len(final_values),
+            "batches_used": n_batches,
+        }
+
+        return final_values, path_store, self.path_features, convergence
+
+    def _adaptive_batch_size(self, max_sims: int) -> int:
+        """
+        Batch size for adaptive runs.
+
+        Defaults to 1% of the simulation budget (at least 1,000 paths) and is
+        rounded up so that every batch holds whole antithetic pairs and an
+        equal share of each randomized QMC replication.
+        """
+        batch_size = self.config.batch_size or max(1000, max_sims // 100)
+        return min(self._whole_units(batch_size), max_sims)
+
+    def _sampling_unit(self) -> int:
+        """
+        Smallest block of paths that keeps the sampling scheme intact.
+
+        Antithetic pairs are rows 2k and 2k+1 and QMC replications cycle
+        every ``qmc_replications`` rows across the whole run, so every chunk,
+        shard and batch except the last must hold a multiple of this many
+        paths.
+        """
+        if self.config.sampler == "sobol":
+            return 2 * self.config.qmc_replications
+        return 2
 
-        return result
+    def _whole_units(self, size: int) -> int:
+        """Round a chunk, shard or batch size up to whole sampling units."""
+        unit = self._sampling_unit()
+        return -(-size // unit) * unit
+
+    def _chunk_length(self, chunk_size: int) -> int:
+        """
+        Round ``chunk_size`` to whole sampling units.
+
+        Sobol chunks are rounded down to ``qmc_replications * 2**m`` paths
+        (at least one sampling unit) so each replication gets a power of two
+        of points; other samplers round up to whole antithetic pairs.
+        """
+        if self.config.sampler != "sobol":
+            return self._whole_units(chunk_size)
+        replications = self.config.qmc_replications
+        points = 1 << max(1, (chunk_size // replications).bit_length() - 1)
+        return replications * points
+
+    def _convergence_metrics(self) -> List[str]:
+        """
+        Metrics accepted as ``target_metric``, besides ``pXX`` percentiles.
+
+        Simulators extend this list along with ``_convergence_estimate``. It
+        is checked in ``__init__``, so it may only depend on the config.
+        """
+        return ["mean", "median"]
+
+    def _is_convergence_metric(self, metric: str) -> bool:
+        """Whether adaptive stopping can target ``metric``."""
+        return metric in self._convergence_metrics() or _is_percentile_metric(metric)
+
+    def _measure_error(self, estimate: float, std_error: float) -> float:
+        """Express a standard error in the configured ``error_type`` units."""
+        if self.config.error_type == "ci_half_width":
+            return CI_Z_SCORE * std_error
+        if self.config.error_type == "relative_error":
+            return std_error / abs(estimate) if estimate != 0 else float("inf")
+        return std_error
+
+    def _convergence_estimate(
+        self,
+        metric: str,
+        final_values: np.ndarray
+    ) -> Tuple[float, float]:
+        """
+        Estimate a metric and its standard error for adaptive stopping.
+
+        The base class supports the ``mean``, ``median`` and ``pXX``
+        percentiles of the final values; simulators extend this with their
+        own metrics.
+
+        Returns:
+            Tuple of (estimate, std_error)
+        """
+        if metric == "mean":
+            estimate = self._mc_estimate(final_values)
+            return estimate["estimate"], estimate["std_error"]
+
+        if metric == "median" or _is_percentile_metric(metric):
+            q = 0.5 if metric == "median" else float(metric[1:]) / 100
+            summary = self._summarize(final_values)
+            return summary.percentile(q * 100), calculate_quantile_std_error(summary, q)
+
+        raise ValueError(f"Adaptive stopping is not supported for metric: {metric}")
+
+    def _summarize(self, values: np.ndarray) -> SampleSummary:
+        """
+        Summary of per-path ``values``, reusing the cached summary of the final values.
+
+        The summary is weighted by the ``sample_weight`` feature when the run
+        produced one.
+        """
+        if self.final_summary is not None and self.final_summary.data is values:
+            return self.final_summary
+
+        weights = self._sample_weights()
+        if weights is None:
+            return SampleSummary(values)
+        return SampleSummary(values, weights, self._weight_total(weights))
+
+    def _sample_weights(self) -> Optional[np.ndarray]:
+        """Per-path sample weights of the current run, or None if unweighted."""
+        return self.path_features.get(SAMPLE_WEIGHT_FEATURE)
+
+    def _weight_total(self, weights: np.ndarray) -> Optional[float]:
+        """
+        Normalizer of weighted estimates.
+
+        None divides by the sum of the weights, which suits relative weights
+        such as stratum or scenario probabilities. Simulators whose weights
+        are likelihood ratios return the number of paths instead.
+        """
+        return None
+
+    def _mc_estimate(
+        self,
+        samples: np.ndarray,
+        controls: Optional[np.ndarray] = None,
+        control_mean: Optional[float] = None
+    ) -> Dict[str, float]:
+        """
+        Mean estimate of per-path samples, honouring the return model's sampling scheme.
+
+        With sample weights, samples and controls are multiplied by their
+        weight (scaled to mean one), which keeps both estimators unbiased
+        for likelihood ratios.
+        """
+        weights = self._sample_weights()
+        if weights is not None:
+            total = self._weight_total(weights)
+            scale = len(weights) / (weights.sum() if total is None else total)
+            samples = np.asarray(samples, dtype=float) * weights * scale
+            if controls is not None:
+                controls = np.asarray(controls, dtype=float) * weights * scale
+
+        return_model = getattr(self, "return_model", None)
+        antithetic = return_model is not None and "antithetic" in return_model.variance_reduction
+        replications = None
+        if return_model is not None and return_model.sampler == "sobol":
+            replications = return_model.qmc_replications
+
+        return calculate_mc_estimate(
+            samples,
+            controls=controls,
+            control_mean=control_mean,
+            antithetic=antithetic,
+            replications=replications
+        )
+
+    @staticmethod
+    def _unpack(
+        outcome: tuple
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, np.ndarray]]:
+        """Normalize a ``_run_simulation`` return value to a 3-tuple."""
+        final_values, all_paths = outcome[0], outcome[1]
+        path_features = outcome[2] if len(outcome) > 2 else {}
+        return final_values, all_paths, path_features
+
+    def get_percentile_paths(self, percentiles: List[float] = [5, 25, 50, 75, 95]) -> Dict[int, np.ndarray]:
+        """Get paths at specified percentiles for visualization."""
+        if self.results is None:
+            raise ValueError("Run simulation first")
+
+        return self.results.get_percentile_paths(percentiles)
 
     def print_summary(self) -> None:
         """Print summary of results to console."""
@@ -167,3 +589,44 @@ class BaseSimulator(ABC):
         self.results.save_json(filepath)
 
         return filepath
+
+
+def _is_percentile_metric(metric: str) -> bool:
+    """Whether ``metric`` names a percentile of the final values, e.g. ``p5`` or ``p99.5``."""
+    return metric.startswith("p") and metric[1:].replace(".", "", 1).isdigit()
+
+
+def _append_to_buffer(
+    buffer: Optional[np.ndarray],
+    values: np.ndarray,
+    n_filled: int,
+    capacity: int
+) -> np.ndarray:
+    """
+    Write ``values`` after the first ``n_filled`` rows of ``buffer``.
+
+    Rows are paths, so 2-D values (one row of columns per path) grow along
+    the first axis only. The buffer doubles when full (up to ``capacity``), so appending n values
+    in batches costs O(n) copies in total.
+    """
+    needed = n_filled + len(values)
+    if buffer is None or needed > len(buffer):
+        size = needed if buffer is None else max(needed, min(2 * len(buffer), capacity))
+        grown = np.empty((size,) + values.shape[1:], dtype=values.dtype)
+        if buffer is not None:
+            grown[:n_filled] = buffer[:n_filled]
+        buffer = grown
+    buffer[n_filled:needed] = values
+    return buffer
+
+
+def _run_shard(
+    simulator_class: type,
+    config: SimulationConfig,
+    n_sims: int,
+    seed: np.random.SeedSequence
+) -> Tuple[np.ndarray, PathStore, Dict[str, np.ndarray]]:
+    """Simulate one shard in a worker process with its own random stream."""
+    simulator = simulator_class(config)
+    simulator.random_state = np.random.default_rng(seed)
+    return simulator._simulate(n_sims)
@@ -1,11 +1,13 @@
 """Option pricing Monte Carlo simulator."""
 import numpy as np
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from scipy import stats
 
 from .base import BaseSimulator, SimulationResults
 from ..config import SimulationConfig, OptionsConfig
 from ..models.returns import GeometricBrownianMotion
+from ..models.black_scholes import black_scholes_greeks, black_scholes_price, call_mask, implied_volatility
+from ..utils.stats import calculate_mc_estimate
 
 
 class OptionPricingSimulator(BaseSimulator):
@@ -14,8 +16,29 @@ class OptionPricingSimulator(BaseSimulator):
 
     Supports European call and put options, with comparison to
     Black-Scholes analytical solution.
+
+    The European payoff only needs the terminal price, which GBM samples
+    exactly in one step. In ``auto`` pricing mode the run therefore draws
+    terminal prices only, and full daily paths are simulated on demand the
+    first time a path-dependent product (Asian, barrier) is priced.
+    ``paths`` mode simulates full paths during the run, ``terminal`` never
+    stores them.
     """
 
+    PRICING_MODES = ["auto", "terminal", "paths"]
+    STEPS_PER_YEAR = 252
+
+    BARRIER_MONITORING = ["discrete", "continuous"]
+
+    # Exercise dates per year of American options priced as Bermudans
+    EXERCISE_DATES_PER_YEAR = 52
+
+    GREEK_METHODS = ["pathwise", "likelihood_ratio", "bump"]
+    GREEK_PRODUCTS = ["european", "asian", "barrier"]
+    # Central-difference bumps: relative for the spot, absolute for
+    # volatility, rate and maturity (years)
+    GREEK_BUMPS = {"spot": 0.01, "volatility": 0.001, "rate": 0.0001, "maturity": 1 / 365}
+
     def __init__(self, config: SimulationConfig):
         super().__init__(config)
 
@@ -23,30 +46,48 @@ class OptionPricingSimulator(BaseSimulator):
             config.options = OptionsConfig()
         self.options_config = config.options
 
+        if self.options_config.pricing_mode not in self.PRICING_MODES:
+            raise ValueError(
+                f"Unknown pricing mode: {self.options_config.pricing_mode}. "
+                f"Available: {self.PRICING_MODES}"
+            )
+
         self.return_model = GeometricBrownianMotion(
             annual_return=self.options_config.risk_free_rate,
             annual_volatility=self.options_config.volatility,
-            periods_per_year=252
+            periods_per_year=self.STEPS_PER_YEAR,
+            variance_reduction=config.variance_reduction,
+            sampler=config.sampler,
+            qmc_replications=config.qmc_replications
         )
+        self._price_paths: Optional[np.ndarray] = None
 
     @property
     def simulation_type(self) -> str:
         return "options"
 
-    def _run_simulation(self) -> Tuple[np.ndarray, np.ndarray]:
+    def _path_periods(self) -> Optional[int]:
+        return int(self.options_config.time_to_maturity_years * self.STEPS_PER_YEAR)
+
+    def _run_simulation(
+        self,
+        n_sims: Optional[int] = None
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, np.ndarray]]:
         """Run option pricing simulation."""
         oc = self.options_config
-        n_sims = self.config.num_simulations
-        n_steps = int(oc.time_to_maturity_years * 252)
+        n_sims = n_sims or self.config.num_simulations
 
-        paths = self.return_model.generate_price_paths(
-            initial_price=oc.spot_price,
-            n_periods=n_steps,
-            n_simulations=n_sims,
-            random_state=self.random_state
-        )
-
-        final_prices = paths[:, -1]
+        if oc.pricing_mode == "paths":
+            paths = self._simulate_price_paths(n_sims, self.random_state)
+            final_prices = paths[:, -1]
+        else:
+            paths = None
+            final_prices = self.return_model.generate_terminal_prices(
+                initial_price=oc.spot_price,
+                horizon_years=oc.time_to_maturity_years,
+                n_simulations=n_sims,
+                random_state=self.random_state
+            )
 
         if oc.option_type.lower() == "call":
             payoffs = np.maximum(final_prices - oc.strike_price, 0)
@@ -56,41 +97,118 @@ class OptionPricingSimulator(BaseSimulator):
         discount_factor = np.exp(-oc.risk_free_rate * oc.time_to_maturity_years)
         discounted_payoffs = payoffs * discount_factor
 
-        return discounted_payoffs, paths
+        return discounted_payoffs, paths, {"final_price": final_prices}
+
+    def _simulate_price_paths(
+        self,
+        n_sims: int,
+        random_state: np.random.Generator
+    ) -> np.ndarray:
+        """Simulate daily price paths of the underlying up to maturity."""
+        return self.return_model.generate_price_paths(
+            initial_price=self.options_config.spot_price,
+            n_periods=self._path_periods(),
+            n_simulations=n_sims,
+            random_state=random_state
+        )
+
+    @property
+    def _qmc_replications(self) -> Optional[int]:
+        """Number of randomized QMC replications, if QMC sampling is used."""
+        if self.return_model.sampler == "sobol":
+            return self.return_model.qmc_replications
+        return None
+
+    def get_price_paths(self, n_sims: Optional[int] = None) -> np.ndarray:
+        """
+        Get full price paths of the underlying for path-dependent products.
+
+        Returns the paths stored by the run if there are any, otherwise
+        simulates them once from the configured seed and caches them.
+        Passing ``n_sims`` simulates a fresh, uncached set of that size.
+        """
+        if self.results is None:
+            raise ValueError("Run simulation first")
+
+        if n_sims is not None:
+            return self._simulate_price_paths(
+                n_sims, np.random.default_rng(self.config.random_seed)
+            )
+
+        if self.results.all_paths is not None:
+            return self.results.all_paths
+
+        if self.options_config.pricing_mode == "terminal":
+            raise ValueError("Price paths are not available in terminal pricing mode")
+
+        if self._price_paths is None:
+            self._price_paths = self._simulate_price_paths(
+                self.config.num_simulations,
+                np.random.default_rng(self.config.random_seed)
+            )
+
+        return self._price_paths
 
     def _black_scholes(self) -> Dict[str, float]:
-        """Calculate Black-Scholes analytical price."""
+        """Calculate Black-Scholes analytical price (vega per vol point, theta per day)."""
         oc = self.options_config
-        S = oc.spot_price
-        K = oc.strike_price
-        r = oc.risk_free_rate
-        sigma = oc.volatility
-        T = oc.time_to_maturity_years
+        greeks = black_scholes_greeks(
+            oc.spot_price,
+            oc.strike_price,
+            oc.risk_free_rate,
+            oc.volatility,
+            oc.time_to_maturity_years,
+            oc.option_type
+        )
 
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
+        return {
+            "price": float(greeks["price"]),
+            "delta": float(greeks["delta"]),
+            "gamma": float(greeks["gamma"]),
+            "vega": float(greeks["vega"]) / 100,
+            "theta": float(greeks["theta"]) / 365,
+            "d1": float(greeks["d1"]),
+            "d2": float(greeks["d2"])
+        }
 
+    def _intrinsic_values(self, prices: np.ndarray) -> np.ndarray:
+        """Payoff of the configured strike and option type at the given underlying prices."""
+        oc = self.options_config
         if oc.option_type.lower() == "call":
-            price = S * stats.norm.cdf(d1) - K * np.exp(-r * T) * stats.norm.cdf(d2)
-            delta = stats.norm.cdf(d1)
-        else:
-            price = K * np.exp(-r * T) * stats.norm.cdf(-d2) - S * stats.norm.cdf(-d1)
-            delta = stats.norm.cdf(d1) - 1
+            return np.maximum(prices - oc.strike_price, 0)
+        return np.maximum(oc.strike_price - prices, 0)
 
-        gamma = stats.norm.pdf(d1) / (S * sigma * np.sqrt(T))
-        vega = S * stats.norm.pdf(d1) * np.sqrt(T) / 100
-        theta = (-(S * stats.norm.pdf(d1) * sigma) / (2 * np.sqrt(T)) -
-                 r * K * np.exp(-r * T) * stats.norm.cdf(d2 if oc.option_type.lower() == "call" else -d2)) / 365
+    def _price_estimate(self, discounted_payoffs: np.ndarray) -> Dict[str, float]:
+        """Monte Carlo price of the European option with its standard error."""
+        oc = self.options_config
 
-        return {
-            "price": float(price),
-            "delta": float(delta),
-            "gamma": float(gamma),
-            "vega": float(vega),
-            "theta": float(theta),
-            "d1": float(d1),
-            "d2": float(d2)
-        }
+        controls = None
+        if "control_variate" in self.return_model.variance_reduction and "final_price" in self.path_features:
+            # The discounted terminal price is a martingale with known mean S0
+            discount_factor = np.exp(-oc.risk_free_rate * oc.time_to_maturity_years)
+            controls = self.path_features["final_price"] * discount_factor
+
+        return self._mc_estimate(discounted_payoffs, controls=controls, control_mean=oc.spot_price)
+
+    def _convergence_metrics(self) -> List[str]:
+        """Metrics accepted as ``target_metric``."""
+        return super()._convergence_metrics() + ["mc_price", "probability_itm"]
+
+    def _convergence_estimate(
+        self,
+        metric: str,
+        final_values: np.ndarray
+    ) -> Tuple[float, float]:
+        """Estimate a metric and its standard error for adaptive stopping."""
+        if metric == "mc_price":
+            estimate = self._price_estimate(final_values)
+            return estimate["estimate"], estimate["std_error"]
+
+        if metric == "probability_itm":
+            estimate = self._mc_estimate((final_values > 0).astype(float))
+            return estimate["estimate"], estimate["std_error"]
+
+        return super()._convergence_estimate(metric, final_values)
 
     def _calculate_custom_metrics(
         self,
@@ -99,12 +217,17 @@ class OptionPricingSimulator(BaseSimulator):
     ) -> Dict[str, Any]:
         """Calculate option-specific metrics."""
         oc = self.options_config
+        variance_reduction = self.return_model.variance_reduction
 
-        mc_price = float(np.mean(final_values))
-        mc_std_error = float(np.std(final_values) / np.sqrt(len(final_values)))
+        estimate = self._price_estimate(final_values)
+        mc_price = estimate["estimate"]
+        mc_std_error = estimate["std_error"]
 
         bs_results = self._black_scholes()
 
+        payoffs = self._summarize(final_values)
+        in_the_money = payoffs.n - np.searchsorted(payoffs.sorted, 0, side="right")
+
         metrics = {
             "option_type": oc.option_type,
             "spot_price": oc.spot_price,
@@ -123,141 +246,857 @@ class OptionPricingSimulator(BaseSimulator):
             "bs_gamma": bs_results["gamma"],
             "bs_vega": bs_results["vega"],
             "bs_theta": bs_results["theta"],
-            "probability_itm": float(np.mean(final_values > 0)),
-            "expected_payoff_if_itm": float(np.mean(final_values[final_values > 0])) if np.any(final_values > 0) else 0,
+            "probability_itm": payoffs.fraction_above(0),
+            "expected_payoff_if_itm": payoffs.range_mean(payoffs.n - in_the_money, payoffs.n) if in_the_money else 0,
         }
 
-        if all_paths is not None:
-            final_prices = all_paths[:, -1]
-            metrics["expected_final_price"] = float(np.mean(final_prices))
-            metrics["final_price_std"] = float(np.std(final_prices))
+        if self.return_model.sampler != "pseudo":
+            metrics["sampler"] = self.return_model.sampler
+            metrics["qmc_replications"] = self.return_model.qmc_replications
+
+        if variance_reduction:
+            metrics["variance_reduction"] = ", ".join(variance_reduction)
+        if variance_reduction or self._qmc_replications:
+            metrics["variance_reduction_factor"] = estimate["variance_reduction_factor"]
+
+        if "final_price" in self.path_features:
+            final_prices = self._summarize(self.path_features["final_price"])
+            metrics["expected_final_price"] = final_prices.mean
+            metrics["final_price_std"] = final_prices.std
             if oc.option_type.lower() == "call":
-                metrics["prob_above_strike"] = float(np.mean(final_prices > oc.strike_price))
+                metrics["prob_above_strike"] = final_prices.fraction_above(oc.strike_price)
             else:
-                metrics["prob_below_strike"] = float(np.mean(final_prices < oc.strike_price))
+                metrics["prob_below_strike"] = final_prices.fraction_below(oc.strike_price)
 
         return metrics
 
-    def price_asian_option(
+    def price_chain(
         self,
-        averaging_type: str = "arithmetic"
-    ) -> Dict[str, float]:
-        """Price an Asian option using Monte Carlo."""
-        if self.results is None or self.results.all_paths is None:
-            raise ValueError("Run simulation first")
+        strikes: Union[List[float], np.ndarray],
+        maturities: Union[List[float], np.ndarray],
+        option_types: Union[str, List[str]] = ("call", "put"),
+        n_sims: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Price a grid of European options from one simulation of the underlying.
+
+        The underlying is sampled once, exactly at each distinct maturity
+        (up to the longest), from the configured seed. A vanilla payoff is
+        piecewise linear in the strike, so the path sums behind each price
+        and standard error (of the payoff, its square, its product with the
+        control and, for antithetic pairs, the product of paired payoffs)
+        are read for every strike at once from prefix sums over the sorted
+        terminal prices. A maturity costs one sort plus a binary search per
+        strike instead of a pass over all paths per strike. Estimates match
+        ``calculate_mc_estimate`` on the payoff of each option, with the
+        run's variance reduction and sampler. All options share the same
+        paths, so spreads and calendar differences carry little noise.
+
+        Args:
+            strikes: Strike prices, shape (n_strikes,)
+            maturities: Times to maturity in years, shape (n_maturities,)
+            option_types: "call", "put" or a list of them
+            n_sims: Number of paths (defaults to config.num_simulations)
+
+        Returns:
+            Dict with the ``option_types``, ``maturities`` and ``strikes``
+            axes and arrays of shape (n_types, n_maturities, n_strikes):
+            ``mc_price``, ``std_error``, ``95_ci_lower``, ``95_ci_upper``,
+            ``bs_price`` and ``price_difference``
+        """
+        oc = self.options_config
+        n_sims = n_sims or self.config.num_simulations
+
+        strikes = np.atleast_1d(np.asarray(strikes, dtype=float))
+        maturities = np.atleast_1d(np.asarray(maturities, dtype=float))
+        option_types = [option_types] if isinstance(option_types, str) else list(option_types)
+        is_call = call_mask(option_types)
+        if strikes.ndim != 1 or maturities.ndim != 1:
+            raise ValueError("strikes and maturities must be 1-D")
+        if np.any(strikes <= 0) or np.any(maturities <= 0):
+            raise ValueError("strikes and maturities must be positive")
+
+        times, maturity_index = np.unique(maturities, return_inverse=True)
+        prices = self.return_model.generate_prices_at(
+            initial_price=oc.spot_price,
+            times=times,
+            n_simulations=n_sims,
+            random_state=np.random.default_rng(self.config.random_seed)
+        )
+
+        shape = (len(option_types), len(maturities), len(strikes))
+        mc_price = np.empty(shape)
+        std_error = np.empty(shape)
+        reduction = np.empty(shape)
+
+        for t, terminal in enumerate(prices.T):
+            for i, call in enumerate(is_call):
+                estimate = self._strike_estimates(terminal, strikes, bool(call), times[t])
+                columns = maturity_index == t
+                mc_price[i, columns] = estimate["estimate"]
+                std_error[i, columns] = estimate["std_error"]
+                reduction[i, columns] = estimate["variance_reduction_factor"]
+
+        bs_price = black_scholes_price(
+            oc.spot_price,
+            strikes[None, None, :],
+            oc.risk_free_rate,
+            oc.volatility,
+            maturities[None, :, None],
+            np.asarray(option_types)[:, None, None]
+        )
+
+        result = {
+            "option_types": option_types,
+            "maturities": maturities,
+            "strikes": strikes,
+            "n_simulations": n_sims,
+            "mc_price": mc_price,
+            "std_error": std_error,
+            "95_ci_lower": mc_price - 1.96 * std_error,
+            "95_ci_upper": mc_price + 1.96 * std_error,
+            "bs_price": bs_price,
+            "price_difference": mc_price - bs_price,
+        }
+        if self.return_model.variance_reduction or self._qmc_replications:
+            result["variance_reduction_factor"] = reduction
+
+        return result
 
+    def _strike_estimates(
+        self,
+        terminal: np.ndarray,
+        strikes: np.ndarray,
+        call: bool,
+        maturity: float
+    ) -> Dict[str, np.ndarray]:
+        """
+        Price estimates of one maturity's calls or puts for every strike.
+
+        Reproduces ``calculate_mc_estimate`` (antithetic units, control
+        variate on the discounted terminal price, QMC replications) from
+        per-strike path sums instead of a payoff vector per strike.
+        """
         oc = self.options_config
-        paths = self.results.all_paths
+        discount_factor = np.exp(-oc.risk_free_rate * maturity)
+        antithetic = "antithetic" in self.return_model.variance_reduction and len(terminal) >= 2
+        use_control = "control_variate" in self.return_model.variance_reduction
+        replications = self._qmc_replications
+        group = 2 if antithetic else 1
 
-        if averaging_type == "arithmetic":
-            average_prices = np.mean(paths, axis=1)
+        # Units are antithetic pair averages (or single paths); the unit
+        # control is the discounted terminal price averaged the same way
+        n_units = len(terminal) // group
+        unit_terminal = terminal[:n_units * group]
+        unit_controls = unit_terminal.reshape(n_units, group).mean(axis=1) * discount_factor
+
+        if replications is not None and min(replications, n_units) >= 2:
+            groups = [slice(r, None, min(replications, n_units)) for r in range(min(replications, n_units))]
         else:
-            average_prices = np.exp(np.mean(np.log(paths), axis=1))
+            groups = [slice(None)]
 
-        if oc.option_type.lower() == "call":
-            payoffs = np.maximum(average_prices - oc.strike_price, 0)
+        # Per group of units: sums of u, u^2, u*x and of the controls x
+        sums = []
+        for units in groups:
+            elements = unit_terminal.reshape(n_units, group)[units]
+            controls = unit_controls[units]
+            payoff = _payoff_sums(
+                elements.ravel(), strikes, call,
+                controls=np.repeat(controls, group) if use_control else None,
+                paired=antithetic
+            )
+            sums.append({
+                "n": len(controls),
+                "u": discount_factor * payoff["f"] / group,
+                "uu": discount_factor ** 2 * (payoff["ff"] + 2 * payoff.get("pair", 0.0)) / group ** 2,
+                "ux": discount_factor * payoff["fc"] / group if use_control else 0.0,
+                "x": controls.sum(),
+                "xx": controls @ controls,
+            })
+
+        n = sum(g["n"] for g in sums)
+        mean_u = sum(g["u"] for g in sums) / n
+        var_u = sum(g["uu"] for g in sums) / n - mean_u ** 2
+        mean_x = sum(g["x"] for g in sums) / n
+        var_x = sum(g["xx"] for g in sums) / n - mean_x ** 2
+
+        beta = np.zeros(len(strikes))
+        covariance = np.zeros(len(strikes))
+        if use_control and var_x > 0:
+            covariance = sum(g["ux"] for g in sums) / n - mean_u * mean_x
+            beta = covariance / var_x
+
+        estimate = mean_u - beta * (mean_x - oc.spot_price)
+        if len(groups) > 1:
+            means = np.array([
+                (g["u"] - beta * (g["x"] - g["n"] * oc.spot_price)) / g["n"] for g in sums
+            ])
+            std_error = np.std(means, axis=0, ddof=1) / np.sqrt(len(groups))
         else:
-            payoffs = np.maximum(oc.strike_price - average_prices, 0)
+            variance = var_u - 2 * beta * covariance + beta ** 2 * var_x
+            std_error = np.sqrt(np.maximum(variance, 0) / n)
+
+        # Plain i.i.d. standard error over every path, for the reduction factor
+        plain = _payoff_sums(terminal, strikes, call)
+        plain_mean = discount_factor * plain["f"] / len(terminal)
+        plain_variance = np.maximum(discount_factor ** 2 * plain["ff"] / len(terminal) - plain_mean ** 2, 0)
+        reduction = np.divide(
+            plain_variance / len(terminal), std_error ** 2,
+            out=np.ones(len(strikes)), where=std_error > 0
+        )
+
+        return {
+            "estimate": estimate,
+            "std_error": std_error,
+            "variance_reduction_factor": reduction,
+        }
+
+    def price_asian_option(
+        self,
+        averaging_type: str = "arithmetic"
+    ) -> Dict[str, float]:
+        """Price an Asian option using Monte Carlo."""
+        oc = self.options_config
+        paths = self.get_price_paths()
+
+        payoffs = self._intrinsic_values(_average_prices(paths, averaging_type))
 
         discount_factor = np.exp(-oc.risk_free_rate * oc.time_to_maturity_years)
         discounted_payoffs = payoffs * discount_factor
 
-        price = float(np.mean(discounted_payoffs))
-        std_error = float(np.std(discounted_payoffs) / np.sqrt(len(discounted_payoffs)))
+        variance_reduction = self.return_model.variance_reduction
+        controls = None
+        control_mean = None
+        if averaging_type == "arithmetic" and "control_variate" in variance_reduction:
+            # The geometric-average Asian has a closed form and is highly
+            # correlated with the arithmetic one
+            controls = self._intrinsic_values(_average_prices(paths, "geometric")) * discount_factor
+            control_mean = self._geometric_asian_price(paths.shape[1] - 1)
 
-        return {
+        estimate = calculate_mc_estimate(
+            discounted_payoffs,
+            controls=controls,
+            control_mean=control_mean,
+            antithetic="antithetic" in variance_reduction,
+            replications=self._qmc_replications
+        )
+        price = estimate["estimate"]
+        std_error = estimate["std_error"]
+
+        result = {
             "asian_price": price,
             "std_error": std_error,
             "averaging_type": averaging_type,
             "95_ci_lower": price - 1.96 * std_error,
             "95_ci_upper": price + 1.96 * std_error
         }
+        if variance_reduction or self._qmc_replications:
+            result["variance_reduction_factor"] = estimate["variance_reduction_factor"]
+
+        return result
+
+    def _geometric_asian_price(self, n_steps: int) -> float:
+        """
+        Closed-form price of a discretely monitored geometric Asian option.
+
+        The average runs over the spot and the ``n_steps`` grid prices, as in
+        ``price_asian_option``; its logarithm is normal under GBM.
+        """
+        oc = self.options_config
+        S = oc.spot_price
+        K = oc.strike_price
+        r = oc.risk_free_rate
+        sigma = oc.volatility
+        dt = self.return_model.dt
+        T = oc.time_to_maturity_years
+
+        mean_log = np.log(S) + (r - 0.5 * sigma ** 2) * dt * n_steps / 2
+        var_log = sigma ** 2 * dt * n_steps * (2 * n_steps + 1) / (6 * (n_steps + 1))
+        forward = np.exp(mean_log + 0.5 * var_log)
+
+        d2 = (mean_log - np.log(K)) / np.sqrt(var_log)
+        d1 = d2 + np.sqrt(var_log)
+
+        if oc.option_type.lower() == "call":
+            price = forward * stats.norm.cdf(d1) - K * stats.norm.cdf(d2)
+        else:
+            price = K * stats.norm.cdf(-d2) - forward * stats.norm.cdf(-d1)
+
+        return float(np.exp(-r * T) * price)
 
     def price_barrier_option(
         self,
         barrier: float,
-        barrier_type: str = "down-and-out"
+        barrier_type: str = "down-and-out",
+        monitoring: str = "discrete",
+        n_steps: Optional[int] = None
     ) -> Dict[str, float]:
-        """Price a barrier option using Monte Carlo."""
-        if self.results is None or self.results.all_paths is None:
-            raise ValueError("Run simulation first")
+        """
+        Price a barrier option using Monte Carlo.
+
+        ``discrete`` monitoring checks the barrier at the grid points only.
+        ``continuous`` monitoring also counts crossings between them: given
+        its end points, each GBM step crosses the barrier B with the
+        Brownian-bridge probability exp(-2 ln(S_j / B) ln(S_j+1 / B) / (sigma^2 dt)),
+        and each payoff is weighted by its path's probability of not being
+        knocked out. This removes the bias of the grid, so a coarse grid of
+        12 or 52 steps a year prices a continuously monitored barrier.
+
+        Args:
+            barrier: Barrier level
+            barrier_type: "down-and-out", "down-and-in", "up-and-out" or "up-and-in"
+            monitoring: "discrete" or "continuous"
+            n_steps: Number of equally spaced grid steps to maturity, simulated
+                afresh from the configured seed (defaults to the daily price paths)
+
+        Returns:
+            Dictionary with the price, its standard error and the knockout probability
+        """
+        if monitoring not in self.BARRIER_MONITORING:
+            raise ValueError(f"Unknown barrier monitoring: {monitoring}. Available: {self.BARRIER_MONITORING}")
 
         oc = self.options_config
-        paths = self.results.all_paths
-        final_prices = paths[:, -1]
-
-        if barrier_type == "down-and-out":
-            knocked_out = np.any(paths <= barrier, axis=1)
-        elif barrier_type == "down-and-in":
-            knocked_in = np.any(paths <= barrier, axis=1)
-            knocked_out = ~knocked_in
-        elif barrier_type == "up-and-out":
-            knocked_out = np.any(paths >= barrier, axis=1)
-        elif barrier_type == "up-and-in":
-            knocked_in = np.any(paths >= barrier, axis=1)
-            knocked_out = ~knocked_in
+        if n_steps is None:
+            paths = self.get_price_paths()
+            dt = self.return_model.dt
         else:
-            raise ValueError(f"Unknown barrier type: {barrier_type}")
+            if n_steps < 1:
+                raise ValueError("n_steps must be at least 1")
+            dt = oc.time_to_maturity_years / n_steps
+            grid_prices = self.return_model.generate_prices_at(
+                oc.spot_price,
+                dt * np.arange(1, n_steps + 1),
+                self.config.num_simulations,
+                np.random.default_rng(self.config.random_seed)
+            )
+            paths = np.column_stack([np.full(len(grid_prices), float(oc.spot_price)), grid_prices])
 
-        if oc.option_type.lower() == "call":
-            payoffs = np.maximum(final_prices - oc.strike_price, 0)
+        if monitoring == "discrete":
+            knocked_out = _knocked_out(paths, barrier, barrier_type).astype(float)
         else:
-            payoffs = np.maximum(oc.strike_price - final_prices, 0)
-
-        payoffs[knocked_out] = 0
+            knocked_out = _bridge_knock_out_probabilities(paths, barrier, barrier_type, oc.volatility ** 2 * dt)
+        payoffs = self._intrinsic_values(paths[:, -1]) * (1 - knocked_out)
 
         discount_factor = np.exp(-oc.risk_free_rate * oc.time_to_maturity_years)
         discounted_payoffs = payoffs * discount_factor
 
-        price = float(np.mean(discounted_payoffs))
-        std_error = float(np.std(discounted_payoffs) / np.sqrt(len(discounted_payoffs)))
+        estimate = calculate_mc_estimate(
+            discounted_payoffs,
+            antithetic="antithetic" in self.return_model.variance_reduction,
+            replications=self._qmc_replications
+        )
+        price = estimate["estimate"]
+        std_error = estimate["std_error"]
 
         return {
             "barrier_price": price,
             "std_error": std_error,
             "barrier": barrier,
             "barrier_type": barrier_type,
+            "monitoring": monitoring,
+            "n_steps": paths.shape[1] - 1,
             "knockout_probability": float(np.mean(knocked_out)),
             "95_ci_lower": price - 1.96 * std_error,
             "95_ci_upper": price + 1.96 * std_error
         }
 
-    def calculate_implied_volatility(
+    def price_american_option(
         self,
-        market_price: float,
-        tolerance: float = 0.0001,
-        max_iterations: int = 100
-    ) -> float:
-        """Calculate implied volatility using Newton-Raphson method."""
+        n_exercise_dates: Optional[int] = None,
+        basis_degree: int = 3,
+        memory_lean: bool = False,
+        n_sims: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Price an American (Bermudan) option by least-squares Monte Carlo.
+
+        The configured option can be exercised on ``n_exercise_dates``
+        equally spaced dates up to maturity; more dates approach the
+        American price. Stepping back from maturity (Longstaff-Schwartz),
+        the discounted value of each in-the-money path is regressed on a
+        polynomial in the moneyness S/K, and the path exercises where its
+        intrinsic value beats the fitted continuation value.
+
+        The normal equations of a date depend only on the prices at that
+        date, so they are built for all dates at once from power sums of
+        the moneyness and inverted in one batched pseudo-inverse; the
+        backward pass only forms each date's right-hand side. With
+        ``memory_lean`` the prices are generated backwards with a
+        Brownian bridge, once for the power sums and once (same seed) for
+        the exercise decisions, so no (n_sims x n_exercise_dates) matrix
+        is held.
+
+        Args:
+            n_exercise_dates: Number of exercise dates (defaults to
+                EXERCISE_DATES_PER_YEAR per year to maturity)
+            basis_degree: Degree of the regression polynomial
+            memory_lean: Generate prices backwards one date at a time
+            n_sims: Number of paths (defaults to the configured number)
+
+        Returns:
+            Dictionary with the price, its standard error, the early
+            exercise premium over the European price and exercise statistics
+        """
+        oc = self.options_config
+        n_sims = n_sims or self.config.num_simulations
+        T = oc.time_to_maturity_years
+        K = oc.strike_price
+
+        if n_exercise_dates is None:
+            n_exercise_dates = max(1, int(round(T * self.EXERCISE_DATES_PER_YEAR)))
+        if n_exercise_dates < 1:
+            raise ValueError("n_exercise_dates must be at least 1")
+        if basis_degree < 1:
+            raise ValueError("basis_degree must be at least 1")
+
+        times = T * np.arange(1, n_exercise_dates + 1) / n_exercise_dates
+        discount_factors = np.exp(-oc.risk_free_rate * times)
+        seed = np.random.SeedSequence(self.config.random_seed)
+        n_basis = basis_degree + 1
+
+        def backward_prices():
+            return self.return_model.iterate_prices_backward(
+                oc.spot_price, times, n_sims, np.random.default_rng(seed)
+            )
+
+        if memory_lean:
+            power_sums = np.stack([
+                _itm_power_sums(prices / K, self._intrinsic_values(prices) > 0, 2 * basis_degree)
+                for prices in backward_prices()
+            ][::-1])
+            columns = backward_prices()
+        else:
+            exercise_prices = self.return_model.generate_prices_at(
+                oc.spot_price, times, n_sims, np.random.default_rng(seed)
+            )
+            power_sums = _itm_power_sums(
+                exercise_prices / K, self._intrinsic_values(exercise_prices) > 0, 2 * basis_degree
+            )
+            columns = iter(exercise_prices.T[::-1])
+
+        # Gram matrices of the monomial basis are Hankel in the power sums
+        gram = power_sums[:, np.add.outer(np.arange(n_basis), np.arange(n_basis))]
+        gram_inverses = np.linalg.pinv(gram)
+
+        # Values are discounted to today along the backward pass
+        values = discount_factors[-1] * self._intrinsic_values(next(columns))
+        european_values = values.copy()
+        exercise_dates = np.where(values > 0, n_exercise_dates - 1, -1)
+
+        for k in range(n_exercise_dates - 2, -1, -1):
+            prices = next(columns)
+            exercise_values = discount_factors[k] * self._intrinsic_values(prices)
+            itm = np.flatnonzero(exercise_values > 0)
+            if len(itm) == 0:
+                continue
+
+            basis = np.vander(prices[itm] / K, n_basis, increasing=True)
+            continuation = basis @ (gram_inverses[k] @ (basis.T @ values[itm]))
+
+            exercise = itm[exercise_values[itm] > continuation]
+            values[exercise] = exercise_values[exercise]
+            exercise_dates[exercise] = k
+
+        european_price = black_scholes_price(
+            oc.spot_price, K, oc.risk_free_rate, oc.volatility, T, oc.option_type
+        )
+        variance_reduction = self.return_model.variance_reduction
+        use_control = "control_variate" in variance_reduction
+
+        estimate = calculate_mc_estimate(
+            values,
+            controls=european_values if use_control else None,
+            control_mean=european_price if use_control else None,
+            antithetic="antithetic" in variance_reduction,
+            replications=self._qmc_replications
+        )
+        price = estimate["estimate"]
+        std_error = estimate["std_error"]
+
+        exercised = exercise_dates >= 0
+        result = {
+            "american_price": price,
+            "std_error": std_error,
+            "95_ci_lower": price - 1.96 * std_error,
+            "95_ci_upper": price + 1.96 * std_error,
+            "european_price": european_price,
+            "early_exercise_premium": price - european_price,
+            "exercise_probability": float(np.mean(exercised)),
+            "early_exercise_probability": float(np.mean(exercised & (exercise_dates < n_exercise_dates - 1))),
+            "expected_exercise_time": float(np.mean(times[exercise_dates[exercised]])) if exercised.any() else float("nan"),
+            "n_exercise_dates": n_exercise_dates,
+            "basis_degree": basis_degree,
+        }
+        if variance_reduction or self._qmc_replications:
+            result["variance_reduction_factor"] = estimate["variance_reduction_factor"]
+
+        return result
+
+    def calculate_greeks(
+        self,
+        product: str = "european",
+        method: str = "pathwise",
+        averaging_type: str = "arithmetic",
+        barrier: Optional[float] = None,
+        barrier_type: str = "down-and-out"
+    ) -> Dict[str, Any]:
+        """
+        Monte Carlo delta, gamma, vega, theta and rho from the simulated paths.
+
+        The Greeks come from the same paths that price the product: the
+        run's terminal prices for European options and the full price paths
+        for Asian and barrier options. The Brownian motion behind each path
+        is recovered from its prices, so no Greek needs a new simulation.
+
+        ``pathwise`` differentiates each discounted payoff along its path,
+        with gamma from the mixed pathwise/likelihood-ratio estimator; it
+        needs payoffs continuous in the path and so excludes barriers.
+        ``likelihood_ratio`` weights each payoff by the derivative of the
+        log density of its path and works for any payoff, though its delta
+        and gamma of path-dependent products are noisy as only the first
+        monitoring step carries the spot. ``bump`` reprices
+        on the same Brownian paths with each input moved up and down by
+        GREEK_BUMPS (central differences with common random numbers).
+
+        A change of maturity stretches the monitoring grid with it. Units
+        follow the Black-Scholes metrics: vega and rho per point, theta per day.
+
+        Args:
+            product: "european", "asian" or "barrier"
+            method: "pathwise", "likelihood_ratio" or "bump"
+            averaging_type: Averaging of Asian options ("arithmetic" or "geometric")
+            barrier: Barrier level of barrier options
+            barrier_type: Barrier type, as in price_barrier_option
+
+        Returns:
+            Dictionary with each Greek and its standard error
+        """
+        if product not in self.GREEK_PRODUCTS:
+            raise ValueError(f"Unknown product: {product}. Available: {self.GREEK_PRODUCTS}")
+        if method not in self.GREEK_METHODS:
+            raise ValueError(f"Unknown Greek method: {method}. Available: {self.GREEK_METHODS}")
+        if product == "barrier":
+            if barrier is None:
+                raise ValueError("Barrier options need a barrier level")
+            if method == "pathwise":
+                raise ValueError("Pathwise Greeks need a continuous payoff; use likelihood_ratio or bump for barriers")
+        if self.results is None:
+            raise ValueError("Run simulation first")
+
+        oc = self.options_config
+        S = oc.spot_price
+        r = oc.risk_free_rate
+        sigma = oc.volatility
+
+        if product == "european":
+            terminal = self.path_features["final_price"]
+            paths = np.column_stack([np.full(len(terminal), float(S)), terminal])
+            times = np.array([0.0, oc.time_to_maturity_years])
+        else:
+            paths = self.get_price_paths()
+            times = np.arange(paths.shape[1]) * self.return_model.dt
+        brownian = (np.log(paths / S) - (r - 0.5 * sigma ** 2) * times) / sigma
+
+        def payoff(prices: np.ndarray) -> np.ndarray:
+            if product == "asian":
+                return self._intrinsic_values(_average_prices(prices, averaging_type))
+            payoffs = self._intrinsic_values(prices[:, -1])
+            if product == "barrier":
+                payoffs[_knocked_out(prices, barrier, barrier_type)] = 0
+            return payoffs
+
+        if method == "pathwise":
+            samples = self._pathwise_greeks(paths, brownian, times, product, averaging_type)
+        elif method == "likelihood_ratio":
+            samples = self._likelihood_ratio_greeks(payoff(paths), brownian, times)
+        else:
+            samples = self._bump_greeks(brownian, times, payoff)
+
+        # Vega and rho per point, theta per day of passing time
+        units = {"delta": 1, "gamma": 1, "vega": 0.01, "theta": -1 / 365, "rho": 0.01}
+
+        result = {"product": product, "method": method}
+        for greek, unit in units.items():
+            estimate = self._mc_estimate(samples[greek] * unit)
+            result[greek] = estimate["estimate"]
+            result[f"{greek}_std_error"] = estimate["std_error"]
+
+        return result
+
+    def _pathwise_greeks(
+        self,
+        paths: np.ndarray,
+        brownian: np.ndarray,
+        times: np.ndarray,
+        product: str,
+        averaging_type: str
+    ) -> Dict[str, np.ndarray]:
+        """Per-path pathwise samples of the price derivatives ("theta" is d/dT)."""
         oc = self.options_config
         S = oc.spot_price
         K = oc.strike_price
         r = oc.risk_free_rate
+        sigma = oc.volatility
         T = oc.time_to_maturity_years
+        discount_factor = np.exp(-r * T)
 
-        sigma = 0.2
+        underlying = _average_prices(paths, averaging_type) if product == "asian" else paths[:, -1]
 
-        for _ in range(max_iterations):
-            d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-            d2 = d1 - sigma * np.sqrt(T)
+        def underlying_derivative(path_derivative: np.ndarray) -> np.ndarray:
+            if product != "asian":
+                return path_derivative[:, -1]
+            if averaging_type == "arithmetic":
+                return np.mean(path_derivative, axis=1)
+            return underlying * np.mean(path_derivative / paths, axis=1)
 
-            if oc.option_type.lower() == "call":
-                price = S * stats.norm.cdf(d1) - K * np.exp(-r * T) * stats.norm.cdf(d2)
-            else:
-                price = K * np.exp(-r * T) * stats.norm.cdf(-d2) - S * stats.norm.cdf(-d1)
+        if oc.option_type.lower() == "call":
+            payoffs = np.maximum(underlying - K, 0)
+            slope = discount_factor * (underlying > K)
+        else:
+            payoffs = np.maximum(K - underlying, 0)
+            slope = -discount_factor * (underlying < K)
+        discounted_payoffs = discount_factor * payoffs
+
+        delta = slope * underlying_derivative(paths / S)
+        # Likelihood-ratio weight of the first step turns delta into gamma
+        first_step_score = brownian[:, 1] / (sigma * times[1])
+
+        return {
+            "delta": delta,
+            "gamma": delta * (first_step_score - 1) / S,
+            "vega": slope * underlying_derivative(paths * (brownian - sigma * times)),
+            "rho": slope * underlying_derivative(paths * times) - T * discounted_payoffs,
+            "theta": (
+                slope * underlying_derivative(paths * ((r - 0.5 * sigma ** 2) * times + 0.5 * sigma * brownian) / T)
+                - r * discounted_payoffs
+            ),
+        }
+
+    def _likelihood_ratio_greeks(
+        self,
+        payoffs: np.ndarray,
+        brownian: np.ndarray,
+        times: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Per-path likelihood-ratio samples of the price derivatives ("theta" is d/dT)."""
+        oc = self.options_config
+        S = oc.spot_price
+        r = oc.risk_free_rate
+        sigma = oc.volatility
+        T = oc.time_to_maturity_years
+        discounted_payoffs = np.exp(-r * T) * payoffs
+
+        increments = np.diff(brownian, axis=1)
+        dt = np.diff(times)
+        squared_steps = np.sum(increments ** 2 / dt, axis=1)
+        n_steps = len(dt)
+        terminal = brownian[:, -1]
+        first_step_score = increments[:, 0] / (sigma * dt[0])
+
+        return {
+            "delta": discounted_payoffs * first_step_score / S,
+            "gamma": discounted_payoffs * (first_step_score ** 2 - first_step_score - 1 / (sigma ** 2 * dt[0])) / S ** 2,
+            "vega": discounted_payoffs * ((squared_steps - n_steps) / sigma - terminal),
+            "rho": discounted_payoffs * (terminal / sigma - T),
+            "theta": discounted_payoffs * (
+                (squared_steps - n_steps) / (2 * T) + (r - 0.5 * sigma ** 2) * terminal / (sigma * T) - r
+            ),
+        }
+
+    def _bump_greeks(
+        self,
+        brownian: np.ndarray,
+        times: np.ndarray,
+        payoff: Callable[[np.ndarray], np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """Per-path central differences with common random numbers ("theta" is d/dT)."""
+        oc = self.options_config
+        base = {
+            "spot": oc.spot_price,
+            "volatility": oc.volatility,
+            "rate": oc.risk_free_rate,
+            "maturity": oc.time_to_maturity_years,
+        }
+
+        def reprice(**bumped: float) -> np.ndarray:
+            p = {**base, **bumped}
+            # Brownian scaling stretches the same paths over a new maturity
+            stretch = p["maturity"] / base["maturity"]
+            log_paths = (
+                (p["rate"] - 0.5 * p["volatility"] ** 2) * times * stretch
+                + p["volatility"] * np.sqrt(stretch) * brownian
+            )
+            return np.exp(-p["rate"] * p["maturity"]) * payoff(p["spot"] * np.exp(log_paths))
+
+        bumps = dict(self.GREEK_BUMPS)
+        bumps["spot"] *= base["spot"]
+        bumps["maturity"] = min(bumps["maturity"], base["maturity"] / 2)
 
-            vega = S * stats.norm.pdf(d1) * np.sqrt(T)
+        central = reprice()
+        samples = {}
+        for name, greek in [("spot", "delta"), ("volatility", "vega"), ("rate", "rho"), ("maturity", "theta")]:
+            h = bumps[name]
+            up = reprice(**{name: base[name] + h})
+            down = reprice(**{name: base[name] - h})
+            samples[greek] = (up - down) / (2 * h)
+            if name == "spot":
+                samples["gamma"] = (up - 2 * central + down) / h ** 2
 
-            diff = price - market_price
+        return samples
 
-            if abs(diff) < tolerance:
-                return float(sigma)
+    def calculate_implied_volatility(
+        self,
+        market_price: Union[float, np.ndarray],
+        tolerance: float = 0.0001,
+        max_iterations: int = 100,
+        strikes: Optional[Union[float, np.ndarray]] = None,
+        maturities: Optional[Union[float, np.ndarray]] = None,
+        option_types: Optional[Union[str, np.ndarray]] = None
+    ) -> Union[float, np.ndarray]:
+        """
+        Calculate implied volatility of one quote or a whole quote surface.
+
+        Strikes, maturities and option types default to the configured
+        option and broadcast against the market prices, so a surface of
+        quotes is inverted in one vectorized call.
+
+        Args:
+            market_price: Observed option price(s)
+            tolerance: Absolute price error at which a quote has converged
+            max_iterations: Maximum solver iterations
+            strikes: Strike price(s) (defaults to the configured strike)
+            maturities: Time(s) to maturity in years (defaults to the configured maturity)
+            option_types: "call"/"put" or an array of them (defaults to the configured type)
+
+        Returns:
+            Implied volatility (array for array inputs); NaN where no volatility reproduces the price or the solver does not converge
+        """
+        oc = self.options_config
+        return implied_volatility(
+            market_price,
+            oc.spot_price,
+            oc.strike_price if strikes is None else strikes,
+            oc.risk_free_rate,
+            oc.time_to_maturity_years if maturities is None else maturities,
+            oc.option_type if option_types is None else option_types,
+            tolerance=tolerance,
+            max_iterations=max_iterations
+        )
+
+
+def _average_prices(paths: np.ndarray, averaging_type: str) -> np.ndarray:
+    """Arithmetic or geometric average of each path, spot included."""
+    if averaging_type == "arithmetic":
+        return np.mean(paths, axis=1)
+    return np.exp(np.mean(np.log(paths), axis=1))
+
+
+def _knocked_out(paths: np.ndarray, barrier: float, barrier_type: str) -> np.ndarray:
+    """Whether each path is knocked out (or never knocked in) on the grid."""
+    if barrier_type == "down-and-out":
+        return np.any(paths <= barrier, axis=1)
+    if barrier_type == "down-and-in":
+        return ~np.any(paths <= barrier, axis=1)
+    if barrier_type == "up-and-out":
+        return np.any(paths >= barrier, axis=1)
+    if barrier_type == "up-and-in":
+        return ~np.any(paths >= barrier, axis=1)
+    raise ValueError(f"Unknown barrier type: {barrier_type}")
+
+
+def _bridge_knock_out_probabilities(
+    paths: np.ndarray,
+    barrier: float,
+    barrier_type: str,
+    step_variance: float
+) -> np.ndarray:
+    """
+    Probability that each path is knocked out (or never knocked in) under continuous monitoring.
+
+    Between grid points the log price is a Brownian bridge, which crosses a
+    barrier its ends stay clear of with probability exp(-2 d_j d_j+1 / step_variance),
+    d = |ln(S / B)|; a grid point at or past the barrier is a certain crossing.
+    """
+    if barrier_type not in ["down-and-out", "down-and-in", "up-and-out", "up-and-in"]:
+        raise ValueError(f"Unknown barrier type: {barrier_type}")
+
+    distance = np.log(paths / barrier)
+    if barrier_type.startswith("up"):
+        distance = -distance
+    distance = np.maximum(distance, 0)
+
+    crossing = np.exp(-2 * distance[:, :-1] * distance[:, 1:] / step_variance)
+    survival = np.prod(1 - crossing, axis=1)
+
+    return 1 - survival if barrier_type.endswith("out") else survival
+
+
+def _itm_power_sums(moneyness: np.ndarray, in_the_money: np.ndarray, max_power: int) -> np.ndarray:
+    """Sums of moneyness ** j, j = 0..max_power, over the in-the-money paths of each date."""
+    sums = []
+    power = in_the_money.astype(float)
+    for _ in range(max_power + 1):
+        sums.append(power.sum(axis=0))
+        power = power * moneyness
+    return np.stack(sums, axis=-1)
+
+
+def _payoff_sums(
+    prices: np.ndarray,
+    strikes: np.ndarray,
+    call: bool,
+    controls: Optional[np.ndarray] = None,
+    paired: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Path sums of undiscounted vanilla payoffs f for every strike, from one sort.
+
+    With f = max(S - K, 0) (calls) or max(K - S, 0) (puts), the sums of f,
+    f^2 and f * c run over the paths on one side of K, where they are
+    polynomials in K with coefficients from prefix sums of S, S^2, c and
+    S * c over the sorted prices. For antithetic pairs (a, b), f(a) f(b)
+    = (a - K)(b - K) is non-zero only when both are on the payoff side,
+    i.e. min(a, b) > K for calls and max(a, b) < K for puts.
+
+    Args:
+        prices: Terminal prices, shape (n,)
+        strikes: Strike prices, shape (k,)
+        call: Calls if True, puts otherwise
+        controls: Optional per-path control values c, shape (n,)
+        paired: Also sum f(a) f(b) over adjacent pairs (2j, 2j + 1)
+
+    Returns:
+        Dict of arrays of shape (k,): ``f``, ``ff`` and, if requested,
+        ``fc`` and ``pair``
+    """
+    def region_sums(keys: np.ndarray, *values: np.ndarray) -> List[np.ndarray]:
+        """Sums of each value over keys above (calls) or below (puts) every strike."""
+        order = np.argsort(keys)
+        index = np.searchsorted(keys[order], strikes)
+        totals = []
+        for value in values:
+            prefix = np.concatenate([[0.0], np.cumsum(value[order])])
+            totals.append(prefix[-1] - prefix[index] if call else prefix[index])
+        return totals
 
-            if vega < 1e-10:
-                break
+    sign = 1.0 if call else -1.0
+    columns = [np.ones_like(prices), prices, prices * prices]
+    if controls is not None:
+        columns += [controls, prices * controls]
+    count, s1, s2, *control_sums = region_sums(prices, *columns)
 
-            sigma = sigma - diff / vega
+    sums = {
+        "f": sign * (s1 - strikes * count),
+        "ff": s2 - 2 * strikes * s1 + strikes ** 2 * count,
+    }
+    if controls is not None:
+        c1, sc = control_sums
+        sums["fc"] = sign * (sc - strikes * c1)
 
-            sigma = max(0.001, min(sigma, 5.0))
+    if paired:
+        a, b = prices[0::2], prices[1::2]
+        keys = np.minimum(a, b) if call else np.maximum(a, b)
+        count, total, product = region_sums(keys, np.ones_like(a), a + b, a * b)
+        sums["pair"] = product - strikes * total + strikes ** 2 * count
 
-        return float(sigma)
+    return sums
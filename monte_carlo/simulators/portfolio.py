@@ -1,11 +1,21 @@
 """Portfolio projection Monte Carlo simulator."""
 import numpy as np
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from .base import BaseSimulator, SimulationResults
 from ..config import SimulationConfig, PortfolioConfig
 from ..models.returns import GeometricBrownianMotion
-from ..utils.stats import calculate_probability_of_success, calculate_max_drawdown
+from ..utils.stats import (
+    calculate_probability_of_success,
+    calculate_max_drawdown,
+    calculate_drawdowns,
+    calculate_drawdown_metrics
+)
+from ..utils.paths import compound_paths
+
+
+# Per-path drawdown statistics kept from every simulated chunk
+DRAWDOWN_FEATURES = ["max_drawdown", "longest_underwater", "recovery_periods"]
 
 
 class PortfolioSimulator(BaseSimulator):
@@ -26,17 +36,26 @@ class PortfolioSimulator(BaseSimulator):
         self.return_model = GeometricBrownianMotion(
             annual_return=self.portfolio_config.expected_annual_return,
             annual_volatility=self.portfolio_config.annual_volatility,
-            periods_per_year=12
+            periods_per_year=12,
+            variance_reduction=config.variance_reduction,
+            sampler=config.sampler,
+            qmc_replications=config.qmc_replications
         )
 
     @property
     def simulation_type(self) -> str:
         return "portfolio"
 
-    def _run_simulation(self) -> Tuple[np.ndarray, np.ndarray]:
+    def _path_periods(self) -> Optional[int]:
+        return self.config.time_horizon_years * 12
+
+    def _run_simulation(
+        self,
+        n_sims: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
         """Run portfolio simulation with monthly contributions."""
         n_months = self.config.time_horizon_years * 12
-        n_sims = self.config.num_simulations
+        n_sims = n_sims or self.config.num_simulations
 
         initial_value = self.portfolio_config.initial_value
         monthly_contribution = self.portfolio_config.monthly_contribution
@@ -47,17 +66,44 @@ class PortfolioSimulator(BaseSimulator):
             random_state=self.random_state
         )
 
-        returns = np.exp(log_returns)
+        returns = np.exp(log_returns, out=log_returns)
 
-        paths = np.zeros((n_sims, n_months + 1))
-        paths[:, 0] = initial_value
-
-        for t in range(n_months):
-            paths[:, t + 1] = (paths[:, t] + monthly_contribution) * returns[:, t]
+        paths = compound_paths(initial_value, returns, contributions=monthly_contribution)
 
         final_values = paths[:, -1]
 
-        return final_values, paths
+        drawdowns = calculate_drawdowns(paths)
+        path_features = {key: drawdowns[key] for key in DRAWDOWN_FEATURES}
+
+        return final_values, paths, path_features
+
+    def _convergence_metrics(self) -> List[str]:
+        """Metrics accepted as ``target_metric``."""
+        return super()._convergence_metrics() + [
+            "expected_final_value", "median_final_value", "probability_of_profit"
+        ]
+
+    def _convergence_estimate(
+        self,
+        metric: str,
+        final_values: np.ndarray
+    ) -> Tuple[float, float]:
+        """Estimate a metric and its standard error for adaptive stopping."""
+        if metric == "expected_final_value":
+            return super()._convergence_estimate("mean", final_values)
+
+        if metric == "median_final_value":
+            return super()._convergence_estimate("median", final_values)
+
+        if metric == "probability_of_profit":
+            total_contributions = (
+                self.portfolio_config.initial_value +
+                self.portfolio_config.monthly_contribution * self.config.time_horizon_years * 12
+            )
+            estimate = self._mc_estimate(final_values >= total_contributions)
+            return estimate["estimate"], estimate["std_error"]
+
+        return super()._convergence_estimate(metric, final_values)
 
     def _calculate_custom_metrics(
         self,
@@ -70,14 +116,16 @@ class PortfolioSimulator(BaseSimulator):
             self.portfolio_config.monthly_contribution * self.config.time_horizon_years * 12
         )
 
+        summary = self._summarize(final_values)
+
         metrics = {
             "initial_investment": self.portfolio_config.initial_value,
             "total_contributions": total_contributions,
-            "median_final_value": float(np.median(final_values)),
-            "expected_final_value": float(np.mean(final_values)),
-            "median_gain": float(np.median(final_values) - total_contributions),
+            "median_final_value": summary.median,
+            "expected_final_value": summary.mean,
+            "median_gain": summary.median - total_contributions,
             "probability_of_profit": calculate_probability_of_success(
-                final_values, total_contributions
+                summary, total_contributions
             ),
         }
 
@@ -87,7 +135,7 @@ class PortfolioSimulator(BaseSimulator):
         for target in common_targets:
             if target > total_contributions * 0.5:
                 metrics[f"prob_reaching_{target:,}"] = calculate_probability_of_success(
-                    final_values, target
+                    summary, target
                 )
 
         if all_paths is not None:
@@ -95,35 +143,38 @@ class PortfolioSimulator(BaseSimulator):
             max_dd, peak_idx, trough_idx = calculate_max_drawdown(median_path)
             metrics["median_path_max_drawdown"] = max_dd
 
+        if "max_drawdown" in self.path_features:
             worst_path_idx = np.argmin(final_values)
-            worst_dd, _, _ = calculate_max_drawdown(all_paths[worst_path_idx])
-            metrics["worst_case_max_drawdown"] = worst_dd
+            metrics["worst_case_max_drawdown"] = float(self.path_features["max_drawdown"][worst_path_idx])
+            metrics.update(calculate_drawdown_metrics(self.path_features, weights=self._sample_weights()))
 
-        growth_multiple = final_values / total_contributions
-        metrics["median_growth_multiple"] = float(np.median(growth_multiple))
-        metrics["p10_growth_multiple"] = float(np.percentile(growth_multiple, 10))
-        metrics["p90_growth_multiple"] = float(np.percentile(growth_multiple, 90))
+        # Growth multiples are a positive rescaling of the final values
+        median, p10, p90 = summary.percentile([50, 10, 90]) / total_contributions
+        metrics["median_growth_multiple"] = float(median)
+        metrics["p10_growth_multiple"] = float(p10)
+        metrics["p90_growth_multiple"] = float(p90)
 
         return metrics
 
     def get_annual_snapshots(self) -> Dict[int, Dict[str, float]]:
-        """Get statistics at each year end."""
-        if self.results is None or self.results.all_paths is None:
+        """
+        Get statistics at each year end.
+
+        Years whose month-end values the path storage policy did not retain
+        (e.g. years between ``checkpoints``) are left out.
+        """
+        if self.results is None or self.results.path_store is None:
             raise ValueError("Run simulation first")
 
-        paths = self.results.all_paths
+        path_store = self.results.path_store
         snapshots = {}
 
         for year in range(1, self.config.time_horizon_years + 1):
             month_idx = year * 12
-            values = paths[:, month_idx]
-
-            snapshots[year] = {
-                "mean": float(np.mean(values)),
-                "median": float(np.median(values)),
-                "p5": float(np.percentile(values, 5)),
-                "p95": float(np.percentile(values, 95)),
-                "std": float(np.std(values))
-            }
+            if path_store.has_period(month_idx):
+                snapshots[year] = path_store.summarize_period(month_idx, [5, 95])
+
+        if not snapshots:
+            raise ValueError(f"No year-end values are available with '{path_store.policy}' path storage")
 
         return snapshots
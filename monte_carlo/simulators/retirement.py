@@ -1,11 +1,25 @@
 """Retirement planning Monte Carlo simulator."""
 import numpy as np
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from .base import BaseSimulator, SimulationResults
+from .portfolio import DRAWDOWN_FEATURES
 from ..config import SimulationConfig, RetirementConfig
 from ..models.returns import GeometricBrownianMotion
-from ..utils.stats import calculate_safe_withdrawal_rate
+from ..utils.stats import (
+    calculate_quantile_std_error,
+    calculate_quantile_interval,
+    calculate_drawdowns,
+    calculate_drawdown_metrics
+)
+from ..utils.paths import compound_paths, withdrawal_capacity
+from ..utils.summary import summarize
+
+
+DEFAULT_WITHDRAWAL_RATES = [0.03, 0.035, 0.04, 0.045, 0.05, 0.055, 0.06]
+
+# Success probability targeted by the reported safe withdrawal rate
+SAFE_WITHDRAWAL_SUCCESS_RATE = 0.95
 
 
 class RetirementSimulator(BaseSimulator):
@@ -27,17 +41,26 @@ class RetirementSimulator(BaseSimulator):
         self.return_model = GeometricBrownianMotion(
             annual_return=self.retirement_config.expected_annual_return,
             annual_volatility=self.retirement_config.annual_volatility,
-            periods_per_year=12
+            periods_per_year=12,
+            variance_reduction=config.variance_reduction,
+            sampler=config.sampler,
+            qmc_replications=config.qmc_replications
         )
 
     @property
     def simulation_type(self) -> str:
         return "retirement"
 
-    def _run_simulation(self) -> Tuple[np.ndarray, np.ndarray]:
+    def _path_periods(self) -> Optional[int]:
+        return self.config.time_horizon_years * 12
+
+    def _run_simulation(
+        self,
+        n_sims: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
         """Run retirement simulation with accumulation and distribution phases."""
         rc = self.retirement_config
-        n_sims = self.config.num_simulations
+        n_sims = n_sims or self.config.num_simulations
 
         years_to_retirement = rc.retirement_age - rc.current_age
         years_in_retirement = self.config.time_horizon_years - years_to_retirement
@@ -56,35 +79,90 @@ class RetirementSimulator(BaseSimulator):
             n_simulations=n_sims,
             random_state=self.random_state
         )
-        returns = np.exp(log_returns)
-
-        paths = np.zeros((n_sims, total_months + 1))
-        paths[:, 0] = rc.current_savings
+        returns = np.exp(log_returns, out=log_returns)
 
-        for t in range(accumulation_months):
-            paths[:, t + 1] = (paths[:, t] + rc.monthly_contribution) * returns[:, t]
+        paths = np.empty((n_sims, total_months + 1))
 
-        if accumulation_months > 0:
-            retirement_value = paths[:, accumulation_months]
-        else:
-            retirement_value = paths[:, 0]
+        compound_paths(
+            rc.current_savings,
+            returns[:, :accumulation_months],
+            contributions=rc.monthly_contribution,
+            out=paths[:, :accumulation_months + 1]
+        )
 
+        retirement_value = paths[:, accumulation_months].copy()
         initial_annual_withdrawal = retirement_value * rc.withdrawal_rate
         monthly_withdrawal = initial_annual_withdrawal / 12
 
-        for t in range(accumulation_months, total_months):
-            months_into_retirement = t - accumulation_months
-            years_into_retirement = months_into_retirement / 12
-            inflation_factor = (1 + rc.inflation_rate) ** years_into_retirement
+        months_into_retirement = np.arange(total_months - accumulation_months)
+        inflation_factors = (1 + rc.inflation_rate) ** (months_into_retirement / 12)
+
+        ruin_month = np.empty(n_sims, dtype=np.int32)
+        compound_paths(
+            retirement_value,
+            returns[:, accumulation_months:],
+            withdrawals=inflation_factors,
+            withdrawal_scale=monthly_withdrawal,
+            floor_at_zero=True,
+            out=paths[:, accumulation_months:],
+            ruin_index=ruin_month
+        )
+        ruin_month[ruin_month >= 0] += accumulation_months
 
-            current_withdrawal = monthly_withdrawal * inflation_factor
+        final_values = paths[:, -1]
 
-            pre_withdrawal = paths[:, t] * returns[:, t]
-            paths[:, t + 1] = np.maximum(pre_withdrawal - current_withdrawal, 0)
+        # A path survives a withdrawal rate r exactly when r < 12 / D, where D
+        # is its inflation-adjusted withdrawal schedule discounted by its own
+        # returns. Keeping this threshold lets any other rate be evaluated on
+        # the same scenarios without re-running the distribution phase.
+        capacity = withdrawal_capacity(returns[:, accumulation_months:], inflation_factors)
+        critical_rate = np.divide(
+            12.0, capacity,
+            out=np.full(n_sims, np.inf), where=capacity > 0
+        )
+        critical_rate[retirement_value <= 0] = 0.0
 
-        final_values = paths[:, -1]
+        path_features = {
+            "retirement_value": retirement_value,
+            "ruin_month": ruin_month,
+            "critical_withdrawal_rate": critical_rate,
+        }
+        drawdowns = calculate_drawdowns(paths)
+        path_features.update({key: drawdowns[key] for key in DRAWDOWN_FEATURES})
+
+        return final_values, paths, path_features
+
+    def _convergence_metrics(self) -> List[str]:
+        """Metrics accepted as ``target_metric``."""
+        return super()._convergence_metrics() + [
+            "probability_of_success", "probability_of_ruin", "median_final_value",
+            "median_retirement_value", "safe_withdrawal_rate"
+        ]
+
+    def _convergence_estimate(
+        self,
+        metric: str,
+        final_values: np.ndarray
+    ) -> Tuple[float, float]:
+        """Estimate a metric and its standard error for adaptive stopping."""
+        if metric in ("probability_of_success", "probability_of_ruin"):
+            success = final_values > 0
+            estimate = self._mc_estimate(success if metric == "probability_of_success" else ~success)
+            return estimate["estimate"], estimate["std_error"]
+
+        if metric == "median_final_value":
+            return super()._convergence_estimate("median", final_values)
+
+        if metric == "median_retirement_value" and "retirement_value" in self.path_features:
+            retirement_values = self._summarize(self.path_features["retirement_value"])
+            return retirement_values.median, calculate_quantile_std_error(retirement_values, 0.5)
+
+        if metric == "safe_withdrawal_rate" and "critical_withdrawal_rate" in self.path_features:
+            q = 1 - SAFE_WITHDRAWAL_SUCCESS_RATE
+            critical_rates = self._summarize(self.path_features["critical_withdrawal_rate"])
+            return critical_rates.quantile(q), calculate_quantile_std_error(critical_rates, q)
 
-        return final_values, paths
+        return super()._convergence_estimate(metric, final_values)
 
     def _calculate_custom_metrics(
         self,
@@ -96,12 +174,13 @@ class RetirementSimulator(BaseSimulator):
         years_to_retirement = rc.retirement_age - rc.current_age
         accumulation_months = max(0, years_to_retirement * 12)
 
-        success_rate = float(np.mean(final_values > 0))
+        summary = self._summarize(final_values)
+        success_rate = summary.fraction_above(0)
 
-        if all_paths is not None and accumulation_months > 0:
-            retirement_values = all_paths[:, accumulation_months]
-        else:
-            retirement_values = all_paths[:, 0] if all_paths is not None else final_values
+        retirement_values = self.path_features.get("retirement_value", final_values)
+        retirement_summary = self._summarize(retirement_values)
+        retirement_median, retirement_p10, retirement_p90 = retirement_summary.percentile([50, 10, 90])
+        final_median, final_p10, final_p90 = summary.percentile([50, 10, 90])
 
         metrics = {
             "years_to_retirement": years_to_retirement,
@@ -111,114 +190,181 @@ class RetirementSimulator(BaseSimulator):
             "inflation_rate": rc.inflation_rate,
             "probability_of_success": success_rate,
             "probability_of_ruin": 1 - success_rate,
-            "median_retirement_value": float(np.median(retirement_values)),
-            "p10_retirement_value": float(np.percentile(retirement_values, 10)),
-            "p90_retirement_value": float(np.percentile(retirement_values, 90)),
-            "median_final_value": float(np.median(final_values)),
-            "p10_final_value": float(np.percentile(final_values, 10)),
-            "p90_final_value": float(np.percentile(final_values, 90)),
+            "median_retirement_value": float(retirement_median),
+            "p10_retirement_value": float(retirement_p10),
+            "p90_retirement_value": float(retirement_p90),
+            "median_final_value": float(final_median),
+            "p10_final_value": float(final_p10),
+            "p90_final_value": float(final_p90),
         }
 
-        if all_paths is not None:
-            ruin_mask = final_values <= 0
-            if np.any(ruin_mask):
-                ruin_paths = all_paths[ruin_mask]
-                ruin_months = []
-                for path in ruin_paths:
-                    ruin_idx = np.where(path <= 0)[0]
-                    if len(ruin_idx) > 0:
-                        ruin_months.append(ruin_idx[0])
-                if ruin_months:
-                    metrics["median_ruin_month"] = float(np.median(ruin_months))
-                    metrics["median_ruin_year"] = float(np.median(ruin_months) / 12)
-
-        safe_wr = calculate_safe_withdrawal_rate(
-            retirement_values,
-            rc.current_savings,
-            target_success_rate=0.95
-        )
-        metrics["estimated_safe_withdrawal_rate_95"] = safe_wr
+        if "ruin_month" in self.path_features:
+            ruin_months = self.path_features["ruin_month"]
+            ruined = ruin_months >= 0
+            if np.any(ruined):
+                weights = self._sample_weights()
+                p10, median, p90 = summarize(
+                    ruin_months[ruined],
+                    None if weights is None else weights[ruined]
+                ).percentile([10, 50, 90])
+                metrics["median_ruin_month"] = float(median)
+                metrics["median_ruin_year"] = float(median / 12)
+                metrics["p10_ruin_year"] = float(p10 / 12)
+                metrics["p90_ruin_year"] = float(p90 / 12)
+
+        if "max_drawdown" in self.path_features:
+            metrics.update(calculate_drawdown_metrics(self.path_features, weights=self._sample_weights()))
+
+        has_withdrawals = accumulation_months < self.config.time_horizon_years * 12
+        if has_withdrawals and "critical_withdrawal_rate" in self.path_features:
+            safe_wr = self._safe_withdrawal_rate(
+                self.path_features["critical_withdrawal_rate"],
+                SAFE_WITHDRAWAL_SUCCESS_RATE,
+                confidence_level=0.95
+            )
+            metrics["estimated_safe_withdrawal_rate_95"] = safe_wr["safe_withdrawal_rate"]
+            metrics["safe_withdrawal_rate_95_ci_lower"] = safe_wr["ci_lower"]
+            metrics["safe_withdrawal_rate_95_ci_upper"] = safe_wr["ci_upper"]
 
         return metrics
 
     def analyze_withdrawal_rates(
         self,
-        rates: list = [0.03, 0.035, 0.04, 0.045, 0.05, 0.055, 0.06]
+        rates: Union[List[float], np.ndarray] = DEFAULT_WITHDRAWAL_RATES
     ) -> Dict[float, float]:
-        """Analyze success probability for different withdrawal rates."""
-        if self.results is None or self.results.all_paths is None:
+        """
+        Analyze success probability for different withdrawal rates.
+
+        Every rate is evaluated on the simulated return scenarios (common
+        random numbers) from each path's critical withdrawal rate, so a
+        dense grid costs no more than a single rate and the success curve
+        is monotone in the rate.
+
+        Args:
+            rates: Annual withdrawal rates as a fraction of the retirement value
+
+        Returns:
+            Dict mapping each rate to its probability of success
+        """
+        if self.results is None:
             raise ValueError("Run simulation first")
 
-        rc = self.retirement_config
-        years_to_retirement = rc.retirement_age - rc.current_age
-        accumulation_months = max(0, years_to_retirement * 12)
-        distribution_months = self.config.time_horizon_years * 12 - accumulation_months
+        rates = np.asarray(rates, dtype=float)
+        critical_rates = self._summarize(self.results.path_features["critical_withdrawal_rate"])
+        success_rates = np.atleast_1d(critical_rates.fraction_above(rates))
 
-        if accumulation_months > 0:
-            retirement_values = self.results.all_paths[:, accumulation_months]
-        else:
-            retirement_values = self.results.all_paths[:, 0]
-
-        post_retirement_returns = np.exp(
-            self.return_model.generate_returns(
-                n_periods=distribution_months,
-                n_simulations=self.config.num_simulations,
-                random_state=np.random.default_rng(self.config.random_seed)
-            )
+        return {float(rate): float(success) for rate, success in zip(rates.ravel(), success_rates)}
+
+    def solve_safe_withdrawal_rate(
+        self,
+        target_success_rate: float = SAFE_WITHDRAWAL_SUCCESS_RATE,
+        confidence_level: float = 0.95
+    ) -> Dict[str, float]:
+        """
+        Find the withdrawal rate that succeeds with a target probability.
+
+        The success probability at rate r is the fraction of paths whose
+        critical withdrawal rate exceeds r, a decreasing step function over
+        the simulated scenarios. Its root is therefore the
+        (1 - target_success_rate) quantile of the critical rates, found
+        exactly from one sort rather than by bisection. The interval is the
+        distribution-free order-statistic bound on that quantile.
+
+        Args:
+            target_success_rate: Required probability of not running out of money
+            confidence_level: Coverage of the reported interval
+
+        Returns:
+            Dict with the safe withdrawal rate, its confidence interval and
+            the success rate achieved on the simulated scenarios
+        """
+        if self.results is None:
+            raise ValueError("Run simulation first")
+        if not 0 < target_success_rate < 1:
+            raise ValueError(f"target_success_rate must be between 0 and 1, got {target_success_rate}")
+
+        return self._safe_withdrawal_rate(
+            self.results.path_features["critical_withdrawal_rate"],
+            target_success_rate,
+            confidence_level
         )
 
-        results = {}
+    def _safe_withdrawal_rate(
+        self,
+        critical_rates: np.ndarray,
+        target_success_rate: float,
+        confidence_level: float
+    ) -> Dict[str, float]:
+        """Solve for the safe withdrawal rate from per-path critical rates."""
+        critical_rates = self._summarize(critical_rates)
+        q = 1 - target_success_rate
+        rate = critical_rates.percentile(100 * q)
+        ci_lower, ci_upper = calculate_quantile_interval(critical_rates, q, confidence_level)
+
+        return {
+            "target_success_rate": target_success_rate,
+            "safe_withdrawal_rate": rate,
+            "ci_lower": ci_lower,
+            "ci_upper": ci_upper,
+            "confidence_level": confidence_level,
+            "success_rate": critical_rates.fraction_above(rate),
+        }
 
-        for rate in rates:
-            values = retirement_values.copy()
-            monthly_withdrawal = values * rate / 12
+    def get_survival_curve(self) -> Dict[int, float]:
+        """
+        Probability of still having money at the end of each simulated year.
 
-            for t in range(distribution_months):
-                years_into_retirement = t / 12
-                inflation_factor = (1 + rc.inflation_rate) ** years_into_retirement
-                current_withdrawal = monthly_withdrawal * inflation_factor
+        Built from the per-path ruin months recorded during the simulation,
+        so no path is rescanned.
 
-                values = values * post_retirement_returns[:, t]
-                values = np.maximum(values - current_withdrawal, 0)
+        Returns:
+            Dict mapping year (0 to time_horizon_years) to survival probability
+        """
+        if self.results is None:
+            raise ValueError("Run simulation first")
 
-            success_rate = float(np.mean(values > 0))
-            results[rate] = success_rate
+        # Paths that never run out record -1, below every month
+        ruin_months = self._summarize(self.results.path_features["ruin_month"])
+        years = np.arange(self.config.time_horizon_years + 1)
+        survival = 1 - (
+            ruin_months.fraction_below(12 * years, inclusive=True) - ruin_months.fraction_below(0)
+        )
 
-        return results
+        return {int(year): float(p) for year, p in zip(years, survival)}
 
     def get_phase_summary(self) -> Dict[str, Dict[str, float]]:
         """Get summary statistics for accumulation and distribution phases."""
-        if self.results is None or self.results.all_paths is None:
+        if self.results is None:
             raise ValueError("Run simulation first")
 
         rc = self.retirement_config
         years_to_retirement = rc.retirement_age - rc.current_age
         accumulation_months = max(0, years_to_retirement * 12)
 
-        paths = self.results.all_paths
-
         summary = {
             "start": {
-                "mean": float(np.mean(paths[:, 0])),
-                "median": float(np.median(paths[:, 0]))
+                "mean": float(rc.current_savings),
+                "median": float(rc.current_savings)
             }
         }
 
         if accumulation_months > 0:
-            retirement_values = paths[:, accumulation_months]
+            retirement_summary = self._summarize(self.results.path_features["retirement_value"])
+            median, p10, p90 = retirement_summary.percentile([50, 10, 90])
             summary["retirement"] = {
-                "mean": float(np.mean(retirement_values)),
-                "median": float(np.median(retirement_values)),
-                "p10": float(np.percentile(retirement_values, 10)),
-                "p90": float(np.percentile(retirement_values, 90))
+                "mean": retirement_summary.mean,
+                "median": float(median),
+                "p10": float(p10),
+                "p90": float(p90)
             }
 
-        final_values = paths[:, -1]
+        final_summary = self._summarize(self.results.final_values)
+        median, p10, p90 = final_summary.percentile([50, 10, 90])
         summary["end"] = {
-            "mean": float(np.mean(final_values)),
-            "median": float(np.median(final_values)),
-            "p10": float(np.percentile(final_values, 10)),
-            "p90": float(np.percentile(final_values, 90))
+            "mean": final_summary.mean,
+            "median": float(median),
+            "p10": float(p10),
+            "p90": float(p90)
         }
 
         return summary
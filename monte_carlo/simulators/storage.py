@@ -0,0 +1,261 @@
+"""Path retention policies for simulation results."""
+import re
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.sketch import QuantileSketch
+
+
+PATH_STORAGE_POLICIES = ["full", "percentile_bands", "sampled", "checkpoints", "none"]
+
+BAND_PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+
+def parse_path_storage(policy: str, n_periods: Optional[int] = None) -> Tuple[str, Optional[object]]:
+    """
+    Parse a path storage setting into a (kind, argument) pair.
+
+    Accepted forms are ``full``, ``percentile_bands``, ``sampled:K``,
+    ``checkpoints:[t1, t2, ...]`` and ``none``. Checkpoint periods must lie
+    in [0, n_periods] (only the lower bound is checked without n_periods).
+    """
+    kind, _, argument = str(policy).strip().partition(":")
+    kind = kind.strip().lower()
+
+    if kind not in PATH_STORAGE_POLICIES:
+        raise ValueError(f"Unknown path storage policy: {policy}. Available: {PATH_STORAGE_POLICIES}")
+
+    if kind == "sampled":
+        if not argument.strip().isdigit() or int(argument) <= 0:
+            raise ValueError(f"sampled path storage needs a positive sample size, got: {policy}")
+        return kind, int(argument)
+
+    if kind == "checkpoints":
+        periods = [int(p) for p in re.findall(r"-?\d+", argument)]
+        if not periods:
+            raise ValueError(f"checkpoints path storage needs at least one period, got: {policy}")
+        upper = np.inf if n_periods is None else n_periods
+        out_of_range = [p for p in periods if not 0 <= p <= upper]
+        if out_of_range:
+            bounds = "non-negative" if n_periods is None else f"between 0 and {n_periods}"
+            raise ValueError(f"Checkpoint periods must be {bounds}, got: {out_of_range}")
+        return kind, periods
+
+    return kind, None
+
+
+class PathStore:
+    """
+    Retains the part of the simulated paths requested by a storage policy.
+
+    Paths are fed in one or more chunks of shape (n_paths, n_periods+1):
+
+    - ``full``: every path
+    - ``percentile_bands``: per-period percentiles, mean and std; exact
+      for a single chunk, otherwise estimated from a mergeable
+      ``QuantileSketch`` so chunked and sharded runs keep bounded memory
+    - ``sampled:K``: the first K paths (paths are i.i.d., so this is a
+      uniform sample)
+    - ``checkpoints:[...]``: the values of every path at the given periods
+    - ``none``: nothing
+    """
+
+    def __init__(self, policy: str = "full", n_periods: Optional[int] = None):
+        self.policy = policy
+        self.kind, self._argument = parse_path_storage(policy, n_periods)
+
+        self._chunks: List[np.ndarray] = []
+        self._checkpoint_chunks: Dict[int, List[np.ndarray]] = {}
+        self.n_paths = 0
+
+        self._band_sketch: Optional[QuantileSketch] = None
+        self._exact_bands: Dict[float, np.ndarray] = {}
+        self._band_count = 0
+        self._band_mean: Optional[np.ndarray] = None
+        self._band_m2: Optional[np.ndarray] = None
+
+    def add(self, paths: np.ndarray) -> None:
+        """Consume a chunk of paths."""
+        if self.kind == "full":
+            self._chunks.append(paths)
+
+        elif self.kind == "percentile_bands":
+            if self._band_sketch is None:
+                self._band_sketch = QuantileSketch(n_columns=paths.shape[1])
+                # Exact while this is the only chunk
+                exact = np.percentile(paths, BAND_PERCENTILES, axis=0)
+                self._exact_bands = dict(zip(BAND_PERCENTILES, exact))
+            else:
+                self._exact_bands = {}
+            self._band_sketch.update(paths)
+
+            mean = np.mean(paths, axis=0)
+            self._merge_moments(len(paths), mean, np.sum((paths - mean) ** 2, axis=0))
+
+        elif self.kind == "sampled":
+            needed = self._argument - sum(len(chunk) for chunk in self._chunks)
+            if needed > 0:
+                self._chunks.append(paths[:needed].copy())
+
+        elif self.kind == "checkpoints":
+            if max(self._argument) >= paths.shape[1]:
+                raise ValueError(
+                    f"Checkpoint periods must be between 0 and {paths.shape[1] - 1}, got: {self._argument}"
+                )
+            for period in self._argument:
+                self._checkpoint_chunks.setdefault(period, []).append(paths[:, period].copy())
+
+        self.n_paths += len(paths)
+
+    def extend(self, other: "PathStore") -> None:
+        """Append the contents of another store built with the same policy."""
+        if other.kind != self.kind:
+            raise ValueError(f"Cannot merge {other.policy} storage into {self.policy} storage")
+
+        if self.kind == "percentile_bands":
+            if other._band_sketch is not None:
+                if self._band_sketch is None:
+                    self._band_sketch = other._band_sketch
+                    self._exact_bands = other._exact_bands
+                else:
+                    self._band_sketch.merge(other._band_sketch)
+                    self._exact_bands = {}
+                self._merge_moments(other._band_count, other._band_mean, other._band_m2)
+        elif self.kind == "sampled":
+            for chunk in other._chunks:
+                needed = self._argument - sum(len(c) for c in self._chunks)
+                if needed > 0:
+                    self._chunks.append(chunk[:needed])
+        else:
+            self._chunks.extend(other._chunks)
+            for period, chunks in other._checkpoint_chunks.items():
+                self._checkpoint_chunks.setdefault(period, []).extend(chunks)
+
+        self.n_paths += other.n_paths
+
+    def _merge_moments(self, count: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        """Combine per-period counts, means and squared deviations (Chan et al.)."""
+        if self._band_count == 0:
+            self._band_count, self._band_mean, self._band_m2 = count, mean, m2
+            return
+
+        total = self._band_count + count
+        delta = mean - self._band_mean
+        self._band_mean = self._band_mean + delta * count / total
+        self._band_m2 = self._band_m2 + m2 + delta ** 2 * self._band_count * count / total
+        self._band_count = total
+
+    @property
+    def bands(self) -> Dict[float, np.ndarray]:
+        """Per-period series for each of ``BAND_PERCENTILES``."""
+        return self._band_percentiles(BAND_PERCENTILES)
+
+    @property
+    def band_mean(self) -> Optional[np.ndarray]:
+        return self._band_mean
+
+    @property
+    def band_std(self) -> Optional[np.ndarray]:
+        if self._band_m2 is None:
+            return None
+        return np.sqrt(self._band_m2 / self._band_count)
+
+    def _band_percentiles(self, percentiles: List[float]) -> Dict[float, np.ndarray]:
+        """Exact bands where available, sketch estimates otherwise."""
+        if self._band_sketch is None:
+            return {}
+        return {
+            p: self._exact_bands[p] if p in self._exact_bands else self._band_sketch.percentile(p)
+            for p in percentiles
+        }
+
+    @property
+    def all_paths(self) -> Optional[np.ndarray]:
+        """Full path matrix, only available under ``full`` storage."""
+        if self.kind != "full" or not self._chunks:
+            return None
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0]
+
+    @property
+    def sample_paths(self) -> Optional[np.ndarray]:
+        """Retained sample of paths (all paths under ``full`` storage)."""
+        if self.kind == "full":
+            return self.all_paths
+        if self.kind != "sampled" or not self._chunks:
+            return None
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0]
+
+    @property
+    def checkpoints(self) -> Dict[int, np.ndarray]:
+        """Values of every path at each checkpoint period."""
+        return {
+            period: np.concatenate(chunks)
+            for period, chunks in self._checkpoint_chunks.items()
+        }
+
+    def get_column(self, period: int) -> Optional[np.ndarray]:
+        """Values of every path at a period, if retained."""
+        if self.kind == "full" and self.all_paths is not None:
+            return self.all_paths[:, period]
+        if self.kind == "checkpoints" and period in self._checkpoint_chunks:
+            return np.concatenate(self._checkpoint_chunks[period])
+        return None
+
+    def has_period(self, period: int) -> bool:
+        """Whether path values at a period were retained."""
+        if self.kind == "checkpoints":
+            return period in self._checkpoint_chunks
+        if self.kind == "percentile_bands":
+            return self._band_sketch is not None
+        return self.sample_paths is not None
+
+    def summarize_period(
+        self,
+        period: int,
+        percentiles: List[float] = [5, 95]
+    ) -> Dict[str, float]:
+        """Mean, median, std and percentiles of path values at a period."""
+        if self.kind == "percentile_bands":
+            if self._band_sketch is None:
+                raise ValueError("No paths have been stored")
+            bands = self._band_percentiles([50] + list(percentiles))
+            summary = {
+                "mean": float(self.band_mean[period]),
+                "median": float(bands[50][period]),
+            }
+            for p in percentiles:
+                summary[f"p{p}"] = float(bands[p][period])
+            summary["std"] = float(self.band_std[period])
+            return summary
+
+        values = self.get_column(period)
+        if values is None and self.kind == "sampled":
+            values = self.sample_paths[:, period]
+        if values is None:
+            raise ValueError(f"Period {period} is not available with '{self.policy}' path storage")
+
+        summary = {
+            "mean": float(np.mean(values)),
+            "median": float(np.median(values)),
+        }
+        for p in percentiles:
+            summary[f"p{p}"] = float(np.percentile(values, p))
+        summary["std"] = float(np.std(values))
+        return summary
+
+    def percentile_paths(self, percentiles: List[float]) -> Dict[float, np.ndarray]:
+        """Per-period percentile series from the retained data."""
+        if self.kind == "percentile_bands":
+            if self._band_sketch is None:
+                raise ValueError("No paths have been stored")
+            return self._band_percentiles(percentiles)
+
+        paths = self.sample_paths
+        if paths is None:
+            raise ValueError(f"Percentile paths are not available with '{self.policy}' path storage")
+
+        return {p: np.percentile(paths, p, axis=0) for p in percentiles}
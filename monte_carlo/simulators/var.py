@@ -3,19 +3,62 @@ import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, Tuple, Union, List
 from pathlib import Path
+from scipy import stats
 
-from .base import BaseSimulator, SimulationResults
+from .base import BaseSimulator, SimulationResults, SAMPLE_WEIGHT_FEATURE
 from ..config import SimulationConfig, VaRConfig
 from ..models.returns import GeometricBrownianMotion, HistoricalBootstrap
-from ..utils.stats import calculate_var, calculate_cvar
+from ..utils.stats import (
+    calculate_var,
+    calculate_cvar,
+    calculate_quantile_std_error,
+    calculate_cvar_std_error,
+    generate_correlated_returns
+)
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Fraction of scenarios around the VaR quantile averaged for component VaR
+COMPONENT_VAR_WINDOW = 0.01
+
+# Share of importance-sampled scenarios drawn without the loss shift, which
+# caps likelihood ratios at 1 / IMPORTANCE_MIXTURE (defensive mixture)
+IMPORTANCE_MIXTURE = 0.25
+
+
+def confidence_label(confidence_level: float) -> str:
+    """Metric-key label of a confidence level: 0.95 -> "95", 0.999 -> "99.9"."""
+    return f"{confidence_level * 100:g}"
 
 
 class VaRSimulator(BaseSimulator):
     """
     Monte Carlo simulator for Value at Risk (VaR) analysis.
 
-    Supports both parametric (GBM) and historical simulation methods.
+    Supports both parametric (GBM) and historical simulation methods for a
+    single book, and a multi-asset mode driven by a positions vector.
     Calculates VaR and CVaR (Expected Shortfall) at multiple confidence levels.
+
+    In multi-asset mode each scenario is a vector of holding-period asset
+    returns, drawn either from a covariance matrix (correlated lognormal)
+    or from overlapping holding-period windows of a historical factor-return
+    matrix with one column per position. Every position is repriced at once
+    by a single matrix-vector product of scenarios and positions. With
+    ``path_storage: full`` (the default for unchunked runs) the scenario
+    matrix is kept as the 2-D ``asset_scenarios`` path feature, so VaR can
+    be decomposed by position and candidate trades evaluated without
+    re-simulating. Other policies drop it along with the paths.
+
+    With ``importance_sampling`` enabled, scenarios are drawn from a
+    distribution shifted towards losses by ``importance_shift`` standard
+    deviations of the holding-period P&L (a mean-shifted normal for GBM and
+    covariance scenarios, an exponentially tilted resampling of historical
+    windows). A quarter of the scenarios stays unshifted so likelihood ratios
+    remain bounded, and each scenario carries its likelihood ratio as the
+    ``sample_weight`` path feature. VaR, CVaR and the other P&L metrics
+    are then likelihood-ratio weighted, so many more scenarios land in the
+    tail that the deep confidence levels depend on.
     """
 
     def __init__(self, config: SimulationConfig):
@@ -26,11 +69,18 @@ class VaRSimulator(BaseSimulator):
         self.var_config = config.var
 
         self.historical_returns = self._load_historical_returns()
-
-        if self.historical_returns is not None:
+        self.positions = self._load_positions()
+        self.portfolio_value = self.var_config.portfolio_value
+
+        if self.positions is not None:
+            self._init_multi_asset()
+            self.portfolio_value = float(np.sum(self.positions))
+            self.method = "multi_asset"
+        elif self.historical_returns is not None:
             self.return_model = HistoricalBootstrap(
                 historical_returns=self.historical_returns,
-                block_size=1
+                block_size=self.var_config.block_size,
+                method=self.var_config.bootstrap_method
             )
             self.method = "historical"
         else:
@@ -40,10 +90,26 @@ class VaRSimulator(BaseSimulator):
             self.return_model = GeometricBrownianMotion(
                 annual_return=self.var_config.expected_annual_return,
                 annual_volatility=self.var_config.annual_volatility,
-                periods_per_year=252
+                periods_per_year=252,
+                variance_reduction=config.variance_reduction,
+                sampler=config.sampler,
+                qmc_replications=config.qmc_replications
             )
             self.method = "parametric"
 
+        self.importance_shift = 0.0
+        if self.var_config.importance_sampling:
+            if self.method == "historical":
+                raise ValueError(
+                    "Importance sampling needs parametric or multi-asset scenarios, "
+                    "not a bootstrapped return series"
+                )
+            self.importance_shift = self.var_config.importance_shift
+            if self.importance_shift is None:
+                self.importance_shift = float(stats.norm.ppf(max(self.var_config.confidence_levels)))
+            if self.method == "multi_asset":
+                self._init_importance_tilt()
+
     def _load_historical_returns(self) -> Optional[np.ndarray]:
         """Load historical returns from file or config."""
         hr = self.var_config.historical_returns
@@ -70,41 +136,329 @@ class VaRSimulator(BaseSimulator):
 
         return None
 
+    def _load_positions(self) -> Optional[np.ndarray]:
+        """Load position values from file or config."""
+        positions = self.var_config.positions
+
+        if positions is None:
+            return None
+
+        if isinstance(positions, str):
+            df = pd.read_csv(positions)
+            column = next((c for c in ("position", "value") if c in df.columns), df.columns[0])
+            positions = df[column].values
+
+        positions = np.asarray(positions, dtype=float)
+        if positions.ndim != 1 or len(positions) == 0:
+            raise ValueError("positions must be a non-empty list of position values")
+        return positions
+
+    def _load_factor_returns(self) -> Optional[np.ndarray]:
+        """Load daily factor returns (one column per position) from file or config."""
+        factor_returns = self.var_config.factor_returns
+
+        if factor_returns is None:
+            return None
+
+        if isinstance(factor_returns, str):
+            factor_returns = pd.read_csv(factor_returns).values
+
+        return np.asarray(factor_returns, dtype=float)
+
+    def _init_multi_asset(self) -> None:
+        """Prepare the scenario generator for multi-asset VaR."""
+        vc = self.var_config
+        n_assets = len(self.positions)
+        n_days = vc.holding_period_days
+
+        factor_returns = self._load_factor_returns()
+
+        if factor_returns is not None:
+            if factor_returns.ndim != 2 or factor_returns.shape[1] != n_assets:
+                raise ValueError(
+                    f"factor_returns must have one column per position ({n_assets}), "
+                    f"got shape {factor_returns.shape}"
+                )
+            if len(factor_returns) < n_days:
+                raise ValueError(
+                    f"factor_returns needs at least holding_period_days ({n_days}) rows"
+                )
+
+            # Compounded returns over every overlapping holding-period window
+            log_growth = np.zeros((len(factor_returns) + 1, n_assets))
+            np.cumsum(np.log1p(factor_returns), axis=0, out=log_growth[1:])
+            self.window_returns = np.expm1(log_growth[n_days:] - log_growth[:-n_days])
+            self.scenario_source = "historical"
+            return
+
+        if vc.covariance_matrix is None:
+            raise ValueError("Multi-asset VaR requires a covariance_matrix or factor_returns")
+
+        covariance = np.asarray(vc.covariance_matrix, dtype=float)
+        if covariance.shape != (n_assets, n_assets):
+            raise ValueError(
+                f"covariance_matrix must be {n_assets}x{n_assets}, got shape {covariance.shape}"
+            )
+
+        expected_returns = np.zeros(n_assets)
+        if vc.expected_asset_returns is not None:
+            expected_returns = np.asarray(vc.expected_asset_returns, dtype=float)
+            if expected_returns.shape != (n_assets,):
+                raise ValueError(f"expected_asset_returns must have {n_assets} entries")
+
+        # Annual moments of log returns scaled to the holding period; the
+        # drift correction of GeometricBrownianMotion is applied per draw
+        horizon = n_days / TRADING_DAYS_PER_YEAR
+        variances = np.diag(covariance)
+        volatilities = np.sqrt(variances)
+
+        self.asset_drifts = expected_returns * horizon
+        self.asset_stds = volatilities * np.sqrt(horizon)
+        self.asset_correlation = covariance / np.outer(volatilities, volatilities)
+        self.asset_cholesky = np.linalg.cholesky(self.asset_correlation)
+        self.scenario_source = "covariance"
+
+    def _init_importance_tilt(self) -> None:
+        """Prepare the loss-tilted proposal for multi-asset scenarios."""
+        theta = self.importance_shift
+
+        if self.scenario_source == "historical":
+            # Exponential tilting of the windows by their standardized P&L
+            window_pnl = self.window_returns @ self.positions
+            spread = window_pnl.std()
+            exponent = -theta * (window_pnl - window_pnl.mean()) / (spread if spread > 0 else 1.0)
+            probabilities = np.exp(exponent - exponent.max())
+            probabilities /= probabilities.sum()
+            self.window_probabilities = (
+                IMPORTANCE_MIXTURE / len(window_pnl) + (1 - IMPORTANCE_MIXTURE) * probabilities
+            )
+            return
+
+        # The P&L is most sensitive to the correlated shocks along C a, with
+        # a the positions' dollar volatilities; shifting the standard normal
+        # draws by -theta along that direction moves the P&L down by theta
+        # standard deviations to first order
+        exposure = self.positions * self.asset_stds
+        loss_direction = self.asset_correlation @ exposure
+        norm = np.sqrt(exposure @ loss_direction)
+        if norm == 0:
+            raise ValueError("Importance sampling needs a book with non-zero risk")
+        self.tilt_exposure = exposure / norm
+        self.tilt_direction = loss_direction / norm
+
+    def _draw_asset_scenarios(
+        self,
+        n_sims: int,
+        random_state: np.random.Generator,
+        volatility_scale: float = 1.0,
+        importance_shift: float = 0.0
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Draw holding-period simple returns for every position.
+
+        Args:
+            n_sims: Number of scenarios
+            random_state: Random generator to draw from
+            volatility_scale: Multiplier on return dispersion (for stress tests)
+            importance_shift: Loss tilt in standard deviations (0 for none)
+
+        Returns:
+            Tuple of (scenarios, likelihood_ratios) with scenarios of shape
+            (n_sims, n_positions) and likelihood ratios None without a tilt
+        """
+        if self.scenario_source == "historical":
+            n_windows = len(self.window_returns)
+            if importance_shift:
+                rows = random_state.choice(n_windows, n_sims, p=self.window_probabilities)
+                weights = 1.0 / (n_windows * self.window_probabilities[rows])
+            else:
+                rows = random_state.integers(0, n_windows, n_sims)
+                weights = None
+
+            scenarios = self.window_returns[rows]
+            if volatility_scale != 1.0:
+                center = self.window_returns.mean(axis=0)
+                scenarios -= center
+                scenarios *= volatility_scale
+                scenarios += center
+            return scenarios, weights
+
+        stds = self.asset_stds * volatility_scale
+        means = self.asset_drifts - 0.5 * stds ** 2
+
+        log_returns = generate_correlated_returns(
+            means,
+            stds,
+            self.asset_correlation,
+            n_sims,
+            random_state,
+            cholesky_factor=self.asset_cholesky
+        )
+
+        weights = None
+        if importance_shift:
+            n_shifted = _shifted_count(n_sims)
+            log_returns[:n_shifted] -= importance_shift * stds * self.tilt_direction
+
+            # Projection of the standard normal draws on the tilt direction
+            loading = self.tilt_exposure / stds
+            projection = log_returns @ loading - means @ loading
+            weights = _mixture_likelihood_ratio(projection, importance_shift)
+
+        return np.expm1(log_returns, out=log_returns), weights
+
     @property
     def simulation_type(self) -> str:
         return "var"
 
-    def _run_simulation(self) -> Tuple[np.ndarray, np.ndarray]:
+    def _path_periods(self) -> Optional[int]:
+        return self.var_config.holding_period_days
+
+    def _run_simulation(
+        self,
+        n_sims: Optional[int] = None
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, np.ndarray]]:
         """Run VaR simulation over holding period."""
         n_days = self.var_config.holding_period_days
-        n_sims = self.config.num_simulations
-        portfolio_value = self.var_config.portfolio_value
+        n_sims = n_sims or self.config.num_simulations
+        path_features: Dict[str, np.ndarray] = {}
+
+        if self.method == "multi_asset":
+            scenarios, weights = self._draw_asset_scenarios(
+                n_sims, self.random_state, importance_shift=self.importance_shift
+            )
+            pnl = scenarios @ self.positions
+
+            if weights is not None:
+                path_features[SAMPLE_WEIGHT_FEATURE] = weights
+            # Scenarios are as large as full paths, so only the full policy keeps them
+            if self.path_storage == "full":
+                path_features["asset_scenarios"] = scenarios
+            return pnl, None, path_features
 
         if self.method == "historical" and self.historical_returns is not None:
-            returns = self.return_model.generate_returns(
+            growth = self.return_model.generate_returns(
                 n_periods=n_days,
                 n_simulations=n_sims,
                 random_state=self.random_state
             )
+            growth += 1
         else:
             log_returns = self.return_model.generate_returns(
                 n_periods=n_days,
                 n_simulations=n_sims,
                 random_state=self.random_state
             )
-            returns = np.exp(log_returns) - 1
-
-        cumulative_returns = np.prod(1 + returns, axis=1) - 1
-
-        final_values = portfolio_value * (1 + cumulative_returns)
-        pnl = final_values - portfolio_value
-
-        paths = np.zeros((n_sims, n_days + 1))
+            if self.importance_shift:
+                path_features[SAMPLE_WEIGHT_FEATURE] = self._tilt_log_returns(log_returns)
+            growth = np.exp(log_returns, out=log_returns)
+
+        pnl, paths = self._compound(growth, store_paths=self.path_storage != "none")
+        return pnl, paths, path_features
+
+    def _tilt_log_returns(self, log_returns: np.ndarray) -> np.ndarray:
+        """
+        Shift GBM log returns towards losses in place and return likelihood ratios.
+
+        Every daily shock of a shifted path moves by -theta / sqrt(n_days), so
+        its standardized holding-period shock T moves by -theta.
+        """
+        model = self.return_model
+        theta = self.importance_shift
+        n_days = log_returns.shape[1]
+        drift = (model.mu - 0.5 * model.sigma ** 2) * model.dt
+        diffusion = model.sigma * np.sqrt(model.dt)
+
+        log_returns[:_shifted_count(len(log_returns))] -= theta * diffusion / np.sqrt(n_days)
+        shock = (log_returns.sum(axis=1) - n_days * drift) / (diffusion * np.sqrt(n_days))
+        return _mixture_likelihood_ratio(shock, theta)
+
+    def _compound(
+        self,
+        growth: np.ndarray,
+        store_paths: bool = True
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Compound gross daily growth factors into P&L and optional value paths.
+
+        Paths are one cumulative product written straight into the path
+        buffer, and the P&L is read from its last column. In P&L-only mode
+        (``path_storage: none``) the growth is reduced to its product
+        without allocating paths.
+
+        Args:
+            growth: Gross daily growth factors, shape (n_simulations, n_days)
+            store_paths: Whether to build the value paths
+
+        Returns:
+            Tuple of (pnl, paths) with paths None in P&L-only mode
+        """
+        portfolio_value = self.portfolio_value
+        n_sims, n_days = growth.shape
+
+        if not store_paths:
+            return portfolio_value * np.prod(growth, axis=1) - portfolio_value, None
+
+        paths = np.empty((n_sims, n_days + 1))
         paths[:, 0] = portfolio_value
-        for t in range(n_days):
-            paths[:, t + 1] = paths[:, t] * (1 + returns[:, t])
+        np.cumprod(growth, axis=1, out=paths[:, 1:])
+        paths[:, 1:] *= portfolio_value
+
+        return paths[:, -1] - portfolio_value, paths
+
+    def _convergence_metrics(self) -> List[str]:
+        """Metrics accepted as ``target_metric``."""
+        # Runs from the base __init__, before the VaR config default is set
+        var_config = self.config.var or VaRConfig()
+        metrics = super()._convergence_metrics() + ["mean_pnl", "probability_of_loss"]
+        for conf in var_config.confidence_levels:
+            label = confidence_label(conf)
+            metrics += [f"var_{label}", f"var_{label}_pct", f"cvar_{label}", f"cvar_{label}_pct"]
+        return metrics
+
+    def _convergence_estimate(
+        self,
+        metric: str,
+        final_values: np.ndarray
+    ) -> Tuple[float, float]:
+        """Estimate a metric and its standard error for adaptive stopping."""
+        pnl = final_values
+        portfolio_value = self.portfolio_value
 
-        return pnl, paths
+        for conf in self.var_config.confidence_levels:
+            label = confidence_label(conf)
+            scale = 1.0 / portfolio_value if metric.endswith("_pct") else 1.0
+
+            if metric in (f"var_{label}", f"var_{label}_pct"):
+                summary = self._summarize(pnl)
+                return (
+                    abs(calculate_var(summary, conf, scale)),
+                    calculate_quantile_std_error(summary, 1 - conf) * scale
+                )
+            if metric in (f"cvar_{label}", f"cvar_{label}_pct"):
+                summary = self._summarize(pnl)
+                return (
+                    abs(calculate_cvar(summary, conf, scale)),
+                    calculate_cvar_std_error(summary, conf, scale)
+                )
+
+        if metric == "mean_pnl":
+            return super()._convergence_estimate("mean", pnl)
+
+        if metric == "probability_of_loss":
+            estimate = self._mc_estimate(pnl < 0)
+            return estimate["estimate"], estimate["std_error"]
+
+        return super()._convergence_estimate(metric, final_values)
+
+    def _weight_total(self, weights: np.ndarray) -> Optional[float]:
+        """Likelihood ratios have mean one, so estimates divide by the path count."""
+        return float(len(weights))
+
+    def _var_cvar(self, pnl: np.ndarray, confidence_level: float) -> Tuple[float, float]:
+        """VaR and CVaR of a P&L sample (as P&L levels)."""
+        summary = self._summarize(pnl)
+        return calculate_var(summary, confidence_level, 1.0), calculate_cvar(summary, confidence_level, 1.0)
 
     def _calculate_custom_metrics(
         self,
@@ -112,44 +466,58 @@ class VaRSimulator(BaseSimulator):
         all_paths: Optional[np.ndarray]
     ) -> Dict[str, Any]:
         """Calculate VaR-specific metrics."""
-        pnl = final_values
-        portfolio_value = self.var_config.portfolio_value
-
-        pnl_returns = pnl / portfolio_value
+        portfolio_value = self.portfolio_value
+        weights = self._sample_weights()
 
         metrics = {
             "portfolio_value": portfolio_value,
             "holding_period_days": self.var_config.holding_period_days,
             "simulation_method": self.method,
-            "mean_pnl": float(np.mean(pnl)),
-            "median_pnl": float(np.median(pnl)),
-            "std_pnl": float(np.std(pnl)),
-            "min_pnl": float(np.min(pnl)),
-            "max_pnl": float(np.max(pnl)),
         }
 
+        if self.method == "multi_asset":
+            metrics["n_positions"] = len(self.positions)
+            metrics["scenario_source"] = self.scenario_source
+
+        if weights is not None:
+            metrics["importance_shift"] = self.importance_shift
+            metrics["effective_sample_size"] = float(weights.sum() ** 2 / np.sum(weights ** 2))
+
+        # P&L quantiles are the return quantiles scaled by the portfolio value,
+        # so every level is read from the one sorted (and weighted) P&L sample
+        summary = self._summarize(final_values)
+        sorted_pnl = summary.sorted
+
+        metrics.update({
+            "mean_pnl": summary.mean,
+            "median_pnl": summary.median,
+            "std_pnl": summary.std,
+            "min_pnl": summary.min,
+            "max_pnl": summary.max,
+        })
+
         for conf in self.var_config.confidence_levels:
-            var_abs = calculate_var(pnl_returns, conf, portfolio_value)
-            cvar_abs = calculate_cvar(pnl_returns, conf, portfolio_value)
-            var_pct = calculate_var(pnl_returns, conf, 1.0)
+            var_abs = calculate_var(summary, conf, 1.0)
+            cvar_abs = calculate_cvar(summary, conf, 1.0)
+            label = confidence_label(conf)
 
-            metrics[f"var_{int(conf*100)}"] = abs(var_abs)
-            metrics[f"var_{int(conf*100)}_pct"] = abs(var_pct)
-            metrics[f"cvar_{int(conf*100)}"] = abs(cvar_abs)
-            metrics[f"cvar_{int(conf*100)}_pct"] = abs(cvar_abs / portfolio_value)
+            metrics[f"var_{label}"] = abs(var_abs)
+            metrics[f"var_{label}_pct"] = abs(var_abs / portfolio_value)
+            metrics[f"cvar_{label}"] = abs(cvar_abs)
+            metrics[f"cvar_{label}_pct"] = abs(cvar_abs / portfolio_value)
 
-        metrics["probability_of_loss"] = float(np.mean(pnl < 0))
-        metrics["probability_of_gain"] = float(np.mean(pnl > 0))
+        metrics["probability_of_loss"] = summary.fraction_below(0)
+        metrics["probability_of_gain"] = summary.fraction_above(0)
 
-        loss_pnl = pnl[pnl < 0]
-        if len(loss_pnl) > 0:
-            metrics["average_loss"] = float(np.mean(loss_pnl))
-            metrics["worst_loss"] = float(np.min(loss_pnl))
+        n_losses = np.searchsorted(sorted_pnl, 0, side="left")
+        if n_losses > 0:
+            metrics["average_loss"] = summary.range_mean(0, n_losses)
+            metrics["worst_loss"] = float(sorted_pnl[0])
 
-        gain_pnl = pnl[pnl > 0]
-        if len(gain_pnl) > 0:
-            metrics["average_gain"] = float(np.mean(gain_pnl))
-            metrics["best_gain"] = float(np.max(gain_pnl))
+        first_gain = np.searchsorted(sorted_pnl, 0, side="right")
+        if first_gain < summary.n:
+            metrics["average_gain"] = summary.range_mean(first_gain, summary.n)
+            metrics["best_gain"] = float(sorted_pnl[-1])
 
         return metrics
 
@@ -158,12 +526,8 @@ class VaRSimulator(BaseSimulator):
         if self.results is None:
             raise ValueError("Run simulation first")
 
-        pnl = self.results.final_values
-        portfolio_value = self.var_config.portfolio_value
-        pnl_returns = pnl / portfolio_value
-
-        var_abs = calculate_var(pnl_returns, confidence_level, portfolio_value)
-        cvar_abs = calculate_cvar(pnl_returns, confidence_level, portfolio_value)
+        portfolio_value = self.portfolio_value
+        var_abs, cvar_abs = self._var_cvar(self.results.final_values, confidence_level)
 
         return {
             "confidence_level": confidence_level,
@@ -173,33 +537,172 @@ class VaRSimulator(BaseSimulator):
             "cvar_percentage": abs(cvar_abs / portfolio_value)
         }
 
+    def decompose_var(self, confidence_level: float = 0.95) -> Dict[str, Union[float, np.ndarray]]:
+        """
+        Euler decomposition of VaR and CVaR across positions.
+
+        Component CVaR is each position's P&L averaged over the tail
+        scenarios (P&L at or below the VaR quantile), so the components sum
+        exactly to CVaR. Component VaR averages the scenarios whose P&L
+        ranks within ``COMPONENT_VAR_WINDOW`` of the VaR quantile and is
+        rescaled to sum to VaR. Marginal VaR/CVaR are the changes per unit
+        of position value (component divided by position). Both reuse the
+        stored scenario matrix and cost about one matrix-vector product.
+        Importance-sampled runs weight every average by the likelihood
+        ratios and measure the window in probability mass instead of ranks.
+
+        Args:
+            confidence_level: VaR confidence level
+
+        Returns:
+            Dict with the portfolio ``var`` and ``cvar`` (losses, positive)
+            and per-position arrays ``marginal_var``, ``component_var``,
+            ``component_var_pct``, ``marginal_cvar``, ``component_cvar`` and
+            ``component_cvar_pct``
+        """
+        scenarios = self._stored_scenarios()
+        pnl = self.results.final_values
+        weights = self._sample_weights()
+        n = len(pnl)
+
+        var_pnl, cvar_pnl = self._var_cvar(pnl, confidence_level)
+
+        # Tail scenarios for CVaR: the same set calculate_cvar averages over
+        tail = pnl <= var_pnl
+        marginal_cvar = -np.average(
+            scenarios[tail], axis=0, weights=None if weights is None else weights[tail]
+        )
+
+        # Scenarios around the VaR quantile for component VaR
+        if weights is None:
+            center = (1 - confidence_level) * (n - 1)
+            half_width = max(1, int(COMPONENT_VAR_WINDOW * n / 2))
+            lower = max(0, int(np.floor(center)) - half_width)
+            upper = min(n, int(np.ceil(center)) + half_width + 1)
+            window = np.argpartition(pnl, [lower, upper - 1])[lower:upper]
+        else:
+            order = np.argsort(pnl)
+            mass = np.cumsum(weights[order]) - weights[order] / 2
+            mass /= n
+            distance = np.abs(mass - (1 - confidence_level))
+            window = order[distance <= max(COMPONENT_VAR_WINDOW / 2, distance.min())]
+        marginal_var = -np.average(
+            scenarios[window], axis=0, weights=None if weights is None else weights[window]
+        )
+
+        component_var = self.positions * marginal_var
+        total = component_var.sum()
+        if total != 0:
+            scale = -var_pnl / total
+            component_var *= scale
+            marginal_var *= scale
+
+        component_cvar = self.positions * marginal_cvar
+
+        return {
+            "var": abs(var_pnl),
+            "cvar": abs(cvar_pnl),
+            "marginal_var": marginal_var,
+            "component_var": component_var,
+            "component_var_pct": component_var / -var_pnl,
+            "marginal_cvar": marginal_cvar,
+            "component_cvar": component_cvar,
+            "component_cvar_pct": component_cvar / -cvar_pnl,
+        }
+
+    def incremental_var(
+        self,
+        trades: Union[List[float], np.ndarray],
+        confidence_level: float = 0.95
+    ) -> Dict[str, Union[float, np.ndarray]]:
+        """
+        Change in VaR and CVaR from adding candidate trades to the book.
+
+        Each trade is repriced on the stored scenarios and added to the
+        current P&L, so several candidates cost one matrix product.
+
+        Args:
+            trades: Position changes, shape (n_positions,) for one trade or
+                (n_trades, n_positions) for several
+            confidence_level: VaR confidence level
+
+        Returns:
+            Dict with ``var_before``/``cvar_before`` and ``var_after``,
+            ``cvar_after``, ``incremental_var`` and ``incremental_cvar`` per
+            trade (floats for a single trade)
+        """
+        scenarios = self._stored_scenarios()
+        pnl = self.results.final_values
+
+        trades = np.asarray(trades, dtype=float)
+        single = trades.ndim == 1
+        trades = np.atleast_2d(trades)
+        if trades.shape[1] != len(self.positions):
+            raise ValueError(
+                f"Trades must have one entry per position ({len(self.positions)}), got shape {trades.shape}"
+            )
+
+        var_before, cvar_before = map(abs, self._var_cvar(pnl, confidence_level))
+
+        new_pnl = scenarios @ trades.T
+        new_pnl += pnl[:, None]
+
+        var_after = np.empty(len(trades))
+        cvar_after = np.empty(len(trades))
+        for j in range(len(trades)):
+            var_after[j], cvar_after[j] = map(abs, self._var_cvar(new_pnl[:, j], confidence_level))
+
+        results = {
+            "var_after": var_after,
+            "cvar_after": cvar_after,
+            "incremental_var": var_after - var_before,
+            "incremental_cvar": cvar_after - cvar_before,
+        }
+        if single:
+            results = {key: float(values[0]) for key, values in results.items()}
+
+        return {"var_before": var_before, "cvar_before": cvar_before, **results}
+
+    def _stored_scenarios(self) -> np.ndarray:
+        """Scenario matrix retained from the last multi-asset run."""
+        if self.results is None:
+            raise ValueError("Run simulation first")
+        if self.method != "multi_asset":
+            raise ValueError("VaR decomposition requires multi-asset mode (set var.positions)")
+        if "asset_scenarios" not in self.results.path_features:
+            raise ValueError("Scenarios were not kept for this simulation (set path_storage to full)")
+        return self.results.path_features["asset_scenarios"]
+
     def stress_test(
         self,
         stress_factor: float = 2.0
     ) -> Dict[str, Any]:
         """Run stress test with increased volatility."""
+        if self.method == "multi_asset":
+            return self._stress_test_positions(stress_factor)
+
         original_vol = self.var_config.annual_volatility
         stressed_vol = original_vol * stress_factor
 
         stressed_model = GeometricBrownianMotion(
             annual_return=self.var_config.expected_annual_return,
             annual_volatility=stressed_vol,
-            periods_per_year=252
+            periods_per_year=252,
+            variance_reduction=self.config.variance_reduction,
+            sampler=self.config.sampler,
+            qmc_replications=self.config.qmc_replications
         )
 
         n_days = self.var_config.holding_period_days
         n_sims = self.config.num_simulations
-        portfolio_value = self.var_config.portfolio_value
+        portfolio_value = self.portfolio_value
 
         log_returns = stressed_model.generate_returns(
             n_periods=n_days,
             n_simulations=n_sims,
             random_state=np.random.default_rng(self.config.random_seed)
         )
-        returns = np.exp(log_returns) - 1
-
-        cumulative_returns = np.prod(1 + returns, axis=1) - 1
-        pnl = portfolio_value * cumulative_returns
+        pnl, _ = self._compound(np.exp(log_returns, out=log_returns), store_paths=False)
         pnl_returns = pnl / portfolio_value
 
         results = {
@@ -210,7 +713,22 @@ class VaRSimulator(BaseSimulator):
 
         for conf in self.var_config.confidence_levels:
             var_abs = calculate_var(pnl_returns, conf, portfolio_value)
-            results[f"stressed_var_{int(conf*100)}"] = abs(var_abs)
+            results[f"stressed_var_{confidence_label(conf)}"] = abs(var_abs)
+
+        return results
+
+    def _stress_test_positions(self, stress_factor: float) -> Dict[str, Any]:
+        """Stress test a multi-asset book by scaling every asset's return dispersion."""
+        scenarios, _ = self._draw_asset_scenarios(
+            self.config.num_simulations,
+            np.random.default_rng(self.config.random_seed),
+            volatility_scale=stress_factor
+        )
+        pnl = scenarios @ self.positions
+
+        results: Dict[str, Any] = {"stress_factor": stress_factor}
+        for conf in self.var_config.confidence_levels:
+            results[f"stressed_var_{confidence_label(conf)}"] = abs(calculate_var(pnl, conf, 1.0))
 
         return results
 
@@ -223,3 +741,21 @@ class VaRSimulator(BaseSimulator):
         hist, edges = np.histogram(pnl, bins=bins)
 
         return hist, edges
+
+
+def _shifted_count(n_sims: int) -> int:
+    """Number of leading scenarios drawn with the loss shift."""
+    return int(round((1 - IMPORTANCE_MIXTURE) * n_sims))
+
+
+def _mixture_likelihood_ratio(shock: np.ndarray, theta: float) -> np.ndarray:
+    """
+    Likelihood ratios of standard normal shocks under the defensive mixture.
+
+    With a share ``IMPORTANCE_MIXTURE`` of draws from N(0, 1) and the rest
+    from N(-theta, 1), the ratio of the nominal to the mixture density is
+    1 / (alpha + (1 - alpha) * exp(-theta * T - theta^2 / 2)).
+    """
+    return 1.0 / (
+        IMPORTANCE_MIXTURE + (1 - IMPORTANCE_MIXTURE) * np.exp(-theta * shock - theta ** 2 / 2)
+    )
@@ -5,8 +5,14 @@ from .stats import (
     calculate_statistics,
     calculate_var,
     calculate_cvar,
+    calculate_mc_estimate,
+    calculate_quantile_std_error,
+    calculate_quantile_interval,
+    calculate_cvar_std_error,
     calculate_sharpe_ratio,
     calculate_max_drawdown,
+    calculate_drawdowns,
+    calculate_drawdown_metrics,
     calculate_probability_of_success,
     calculate_safe_withdrawal_rate,
     generate_correlated_returns,
@@ -15,19 +21,33 @@ from .stats import (
     annualize_volatility,
     deannualize_volatility
 )
+from .paths import compound_paths, withdrawal_capacity
+from .summary import SampleSummary, summarize
+from .sketch import QuantileSketch
 
 __all__ = [
     "calculate_percentiles",
     "calculate_statistics",
     "calculate_var",
     "calculate_cvar",
+    "calculate_mc_estimate",
+    "calculate_quantile_std_error",
+    "calculate_quantile_interval",
+    "calculate_cvar_std_error",
     "calculate_sharpe_ratio",
     "calculate_max_drawdown",
+    "calculate_drawdowns",
+    "calculate_drawdown_metrics",
     "calculate_probability_of_success",
     "calculate_safe_withdrawal_rate",
     "generate_correlated_returns",
     "annualize_return",
     "deannualize_return",
     "annualize_volatility",
-    "deannualize_volatility"
+    "deannualize_volatility",
+    "compound_paths",
+    "withdrawal_capacity",
+    "SampleSummary",
+    "summarize",
+    "QuantileSketch"
 ]
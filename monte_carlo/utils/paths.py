@@ -0,0 +1,159 @@
+"""Vectorized path construction for Monte Carlo simulations."""
+import numpy as np
+from typing import Optional, Union
+
+
+DEFAULT_BLOCK_SIZE = 120
+
+# Rows processed together, sized so that a block's scratch arrays stay in cache
+ROW_TILE = 512
+
+
+def compound_paths(
+    initial_values: Union[float, np.ndarray],
+    growth: np.ndarray,
+    contributions: Union[float, np.ndarray] = 0.0,
+    withdrawals: Union[float, np.ndarray] = 0.0,
+    withdrawal_scale: Optional[np.ndarray] = None,
+    floor_at_zero: bool = False,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    out: Optional[np.ndarray] = None,
+    ruin_index: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Build value paths for the recursion V[t+1] = (V[t] + c[t]) * R[t] - w[t].
+
+    Instead of stepping period by period, each block of ``block_size``
+    periods is evaluated in closed form from cumulative growth factors
+    P[k] = R[t0] * ... * R[t0+k-1]:
+
+        V[t0+k] = P[k] * (V[t0] + sum_{j<k} c[j] / P[j] - sum_{j<k} w[j] / P[j+1])
+
+    Rebasing the cumulative product at every block keeps P close to one,
+    so long horizons neither overflow nor lose precision. The result
+    matches the sequential loop to a relative error of about 1e-12 of the
+    path scale.
+
+    Args:
+        initial_values: Starting value, scalar or per path (n_simulations,)
+        growth: Gross growth factors R, shape (n_simulations, n_periods)
+        contributions: Amount added before growth, scalar or per period
+        withdrawals: Amount removed after growth, scalar or per period
+        withdrawal_scale: Optional per-path multiplier applied to withdrawals
+        floor_at_zero: Absorb paths at zero once they are depleted (matches
+            ``np.maximum(V * R - w, 0)`` stepping for non-negative withdrawals)
+        block_size: Number of periods evaluated per closed-form block
+        out: Optional output array of shape (n_simulations, n_periods+1)
+        ruin_index: Optional integer array of shape (n_simulations,), filled
+            with the first period at which each path is at zero (-1 if it
+            never is). Requires ``floor_at_zero``; paths only need checking
+            in the block where their last value is zero.
+
+    Returns:
+        Array of shape (n_simulations, n_periods+1) of path values
+    """
+    n_sims, n_periods = growth.shape
+
+    if ruin_index is not None and not floor_at_zero:
+        raise ValueError("ruin_index requires floor_at_zero")
+
+    if out is None:
+        out = np.empty((n_sims, n_periods + 1))
+    out[:, 0] = initial_values
+
+    if ruin_index is not None:
+        ruin_index[:] = np.where(out[:, 0] <= 0, 0, -1)
+
+    contributions = np.broadcast_to(np.asarray(contributions, dtype=float), (n_periods,))
+    withdrawals = np.broadcast_to(np.asarray(withdrawals, dtype=float), (n_periods,))
+    has_withdrawals = np.any(withdrawals != 0)
+
+    block_size = max(1, min(block_size, n_periods))
+    cum_growth = np.empty((ROW_TILE, block_size))
+    flows = np.empty((ROW_TILE, block_size))
+    if has_withdrawals:
+        debits = np.empty((ROW_TILE, block_size))
+
+    for r0 in range(0, n_sims, ROW_TILE):
+        r1 = min(r0 + ROW_TILE, n_sims)
+        rows = r1 - r0
+
+        for t0 in range(0, n_periods, block_size):
+            t1 = min(t0 + block_size, n_periods)
+            width = t1 - t0
+
+            p = cum_growth[:rows, :width]
+            f = flows[:rows, :width]
+            np.cumprod(growth[r0:r1, t0:t1], axis=1, out=p)
+
+            # f[k] = V[t0] + sum_{j<k} c[j] / P[j], with P[0] = 1
+            f[:, 0] = contributions[t0]
+            np.divide(contributions[t0 + 1:t1], p[:, :-1], out=f[:, 1:])
+            np.cumsum(f, axis=1, out=f)
+            f += out[r0:r1, t0:t0 + 1]
+
+            if has_withdrawals:
+                # f[k] -= sum_{j<k} w[j] / P[j+1]
+                d = debits[:rows, :width]
+                np.divide(withdrawals[t0:t1], p, out=d)
+                if withdrawal_scale is not None:
+                    d *= withdrawal_scale[r0:r1, None]
+                np.cumsum(d, axis=1, out=d)
+                f -= d
+
+            block = out[r0:r1, t0 + 1:t1 + 1]
+            np.multiply(p, f, out=block)
+
+            if floor_at_zero:
+                # With R > 0 and w >= 0 the unfloored value never recovers once
+                # it reaches zero, so clipping equals absorbing at zero
+                np.maximum(block, 0.0, out=block)
+
+                if ruin_index is not None:
+                    # Absorption means a path ruined in this block ends it at zero
+                    ruin = ruin_index[r0:r1]
+                    newly_ruined = np.flatnonzero((block[:, -1] <= 0) & (ruin < 0))
+                    if len(newly_ruined) > 0:
+                        ruin[newly_ruined] = t0 + 1 + np.argmax(block[newly_ruined] <= 0, axis=1)
+
+    return out
+
+
+def withdrawal_capacity(
+    growth: np.ndarray,
+    withdrawals: Union[float, np.ndarray] = 1.0
+) -> np.ndarray:
+    """
+    Withdrawal schedule discounted by each path's own growth.
+
+    For the floored recursion V[t+1] = max(V[t] * R[t] - s * w[t], 0) the
+    unfloored value is P[t] * (V[0] - s * sum_{j<t} w[j] / P[j+1]), and the
+    discounted sum only grows with t. A path therefore survives every
+    period exactly when V[0] > s * D, with
+
+        D = sum_j w[j] / P[j+1],    P[k] = R[0] * ... * R[k-1]
+
+    so one pass over the growth factors answers the survival question for
+    every withdrawal scale ``s`` at once.
+
+    Args:
+        growth: Gross growth factors R, shape (n_simulations, n_periods)
+        withdrawals: Unscaled withdrawal per period, scalar or (n_periods,)
+
+    Returns:
+        Array of shape (n_simulations,) with D for each path
+    """
+    n_sims, n_periods = growth.shape
+    withdrawals = np.broadcast_to(np.asarray(withdrawals, dtype=float), (n_periods,))
+
+    capacity = np.empty(n_sims)
+    scratch = np.empty((ROW_TILE, n_periods))
+
+    for r0 in range(0, n_sims, ROW_TILE):
+        r1 = min(r0 + ROW_TILE, n_sims)
+        p = scratch[:r1 - r0]
+        np.cumprod(growth[r0:r1], axis=1, out=p)
+        np.divide(withdrawals, p, out=p)
+        capacity[r0:r1] = p.sum(axis=1)
+
+    return capacity
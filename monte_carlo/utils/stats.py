@@ -1,53 +1,226 @@
 """Statistical helper functions for Monte Carlo simulations."""
 import numpy as np
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional, Union
 from scipy import stats
 
+from .summary import SampleSummary, summarize
+from .sketch import QuantileSketch
+from .paths import ROW_TILE
+
 
 def calculate_percentiles(
-    data: np.ndarray,
-    percentiles: List[float] = [5, 10, 25, 50, 75, 90, 95]
+    data: Union[np.ndarray, SampleSummary, QuantileSketch],
+    percentiles: List[float] = [5, 10, 25, 50, 75, 90, 95],
+    weights: Optional[np.ndarray] = None
 ) -> Dict[str, float]:
-    """Calculate percentiles of a distribution."""
-    results = {}
-    for p in percentiles:
-        results[f"p{p}"] = float(np.percentile(data, p))
-    return results
-
-
-def calculate_statistics(data: np.ndarray) -> Dict[str, float]:
-    """Calculate comprehensive statistics for simulation results."""
+    """Calculate percentiles of a distribution (exact, weighted, or estimated from a sketch)."""
+    if weights is not None:
+        data = summarize(data, weights)
+    if isinstance(data, (SampleSummary, QuantileSketch)):
+        values = data.percentile(percentiles)
+    else:
+        # One call partitions the data once for all requested percentiles
+        values = np.percentile(data, percentiles)
+    return {f"p{p}": float(value) for p, value in zip(percentiles, values)}
+
+
+def calculate_statistics(
+    data: Union[np.ndarray, SampleSummary],
+    weights: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """Calculate comprehensive statistics for simulation results (optionally weighted)."""
+    summary = summarize(data, weights)
+    var_99, var_95, median = summary.percentile([1, 5, 50])
     return {
-        "mean": float(np.mean(data)),
-        "median": float(np.median(data)),
-        "std": float(np.std(data)),
-        "min": float(np.min(data)),
-        "max": float(np.max(data)),
-        "skewness": float(stats.skew(data)),
-        "kurtosis": float(stats.kurtosis(data)),
-        "var_95": float(np.percentile(data, 5)),
-        "var_99": float(np.percentile(data, 1)),
+        "mean": summary.mean,
+        "median": float(median),
+        "std": summary.std,
+        "min": summary.min,
+        "max": summary.max,
+        "skewness": summary.moments["skewness"],
+        "kurtosis": summary.moments["kurtosis"],
+        "var_95": float(var_95),
+        "var_99": float(var_99),
     }
 
 
 def calculate_var(
-    returns: np.ndarray,
+    returns: Union[np.ndarray, SampleSummary, QuantileSketch],
     confidence_level: float = 0.95,
-    portfolio_value: float = 1.0
+    portfolio_value: float = 1.0,
+    weights: Optional[np.ndarray] = None
 ) -> float:
     """Calculate Value at Risk at specified confidence level."""
-    return float(np.percentile(returns, (1 - confidence_level) * 100) * portfolio_value)
+    if weights is not None:
+        returns = summarize(returns, weights)
+    q = (1 - confidence_level) * 100
+    if isinstance(returns, (SampleSummary, QuantileSketch)):
+        return float(returns.percentile(q) * portfolio_value)
+    return float(np.percentile(returns, q) * portfolio_value)
 
 
 def calculate_cvar(
-    returns: np.ndarray,
+    returns: Union[np.ndarray, SampleSummary, QuantileSketch],
     confidence_level: float = 0.95,
-    portfolio_value: float = 1.0
+    portfolio_value: float = 1.0,
+    weights: Optional[np.ndarray] = None
 ) -> float:
     """Calculate Conditional Value at Risk (Expected Shortfall)."""
+    if weights is not None:
+        returns = summarize(returns, weights)
+    if isinstance(returns, (SampleSummary, QuantileSketch)):
+        return float(returns.tail_mean_below_quantile(1 - confidence_level) * portfolio_value)
+
     var = calculate_var(returns, confidence_level, 1.0)
-    cvar = returns[returns <= var].mean()
-    return float(cvar * portfolio_value)
+    return float(returns[returns <= var].mean() * portfolio_value)
+
+
+def calculate_mc_estimate(
+    samples: np.ndarray,
+    controls: Optional[np.ndarray] = None,
+    control_mean: Optional[float] = None,
+    antithetic: bool = False,
+    replications: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Estimate E[samples] with optional control variate and antithetic pairs.
+
+    With ``antithetic`` set, samples 2k and 2k+1 are treated as a pair and
+    averaged first. The control variate estimator then subtracts
+    beta * (controls - control_mean) with the variance-minimizing
+    beta = Cov(Y, X) / Var(X), fitted on the same (paired) units. For
+    randomized quasi-Monte Carlo samples, ``replications`` gives the number
+    of interleaved independent randomizations (sample i belongs to
+    replication i % replications) and the standard error is taken from the
+    spread of the per-replication means.
+
+    Returns:
+        Dict with the estimate, its standard error, and the variance
+        reduction factor relative to plain i.i.d. sampling
+    """
+    samples = np.asarray(samples, dtype=float)
+    n = len(samples)
+    units = samples
+
+    if controls is not None:
+        controls = np.asarray(controls, dtype=float)
+
+    if antithetic and n >= 2:
+        units = samples[:n // 2 * 2].reshape(-1, 2).mean(axis=1)
+        if controls is not None:
+            controls = controls[:n // 2 * 2].reshape(-1, 2).mean(axis=1)
+
+    if controls is not None:
+        control_var = np.var(controls)
+        if control_var > 0:
+            beta = np.mean((units - units.mean()) * (controls - controls.mean())) / control_var
+            units = units - beta * (controls - control_mean)
+
+    if replications is not None and min(replications, len(units)) >= 2:
+        replications = min(replications, len(units))
+        means = np.array([units[r::replications].mean() for r in range(replications)])
+        std_error = float(np.std(means, ddof=1) / np.sqrt(replications))
+    else:
+        std_error = float(np.std(units) / np.sqrt(len(units)))
+    naive_std_error = float(np.std(samples) / np.sqrt(n))
+
+    return {
+        "estimate": float(np.mean(units)),
+        "std_error": std_error,
+        "variance_reduction_factor": (naive_std_error / std_error) ** 2 if std_error > 0 else 1.0
+    }
+
+
+def calculate_quantile_interval(
+    data: Union[np.ndarray, SampleSummary],
+    q: float,
+    confidence_level: float = 0.95
+) -> Tuple[float, float]:
+    """
+    Distribution-free confidence interval for the ``q``-quantile (0 < q < 1).
+
+    The order statistics at ranks n*q -/+ z * sqrt(n*q*(1-q)) bracket the
+    quantile with the requested confidence (normal approximation to the
+    binomial rank distribution). For a weighted summary the standard error
+    of the weighted CDF at the quantile takes the place of the binomial
+    one, and the interval is read from the weighted quantile function.
+
+    Args:
+        data: Sample or its summary
+        q: Quantile level
+        confidence_level: Coverage of the interval
+
+    Returns:
+        Tuple of (lower, upper) bounds
+    """
+    summary = summarize(data)
+    z = stats.norm.ppf(0.5 + confidence_level / 2)
+
+    if summary.weights is not None:
+        # CDF estimate at the quantile: sum of w * I / total_weight, or a
+        # ratio to the summed weights when self-normalized (delta method)
+        count = np.searchsorted(summary.sorted, summary.quantile(q), side="right")
+        terms = np.zeros(summary.n)
+        terms[:count] = summary.sorted_weights[:count]
+        if summary.self_normalized:
+            terms -= q * summary.sorted_weights
+        cdf_error = np.sqrt(summary.n) * np.std(terms) / summary.total_weight
+        lower, upper = summary.quantile([max(q - z * cdf_error, 0.0), min(q + z * cdf_error, 1.0)])
+        return float(lower), float(upper)
+
+    sorted_data = summary.sorted
+    n = len(sorted_data)
+    spread = z * np.sqrt(n * q * (1 - q))
+    lower = int(np.clip(np.floor(n * q - spread), 0, n - 1))
+    upper = int(np.clip(np.ceil(n * q + spread), 0, n - 1))
+    return float(sorted_data[lower]), float(sorted_data[upper])
+
+
+def calculate_quantile_std_error(data: Union[np.ndarray, SampleSummary], q: float) -> float:
+    """
+    Distribution-free standard error of the sample ``q``-quantile (0 < q < 1).
+
+    Half the width of the 95% order-statistic interval over 1.96
+    approximates the standard error without estimating the density.
+    """
+    lower, upper = calculate_quantile_interval(data, q, 0.95)
+    return (upper - lower) / (2 * 1.96)
+
+
+def calculate_cvar_std_error(
+    returns: Union[np.ndarray, SampleSummary],
+    confidence_level: float = 0.95,
+    portfolio_value: float = 1.0
+) -> float:
+    """
+    Asymptotic standard error of the Conditional Value at Risk estimate.
+
+    Uses Var(ES) ~ [Var(X | X <= VaR) + a * (ES - VaR)^2] / (n * a) with
+    tail probability a = 1 - confidence_level. For a weighted summary ES is
+    the ratio E[w X I] / E[w I] over the tail indicator I, and the delta
+    method gives SE = std(w (X - ES) I) / (sqrt(n) * mean(w I)).
+    """
+    tail_prob = 1 - confidence_level
+    summary = summarize(returns)
+    var = calculate_var(summary, confidence_level, 1.0)
+    count = np.searchsorted(summary.sorted, var, side="right")
+    tail = summary.sorted[:count]
+    if len(tail) < 2:
+        return float("nan")
+
+    if summary.weights is not None:
+        tail_weights = summary.sorted_weights[:count]
+        if tail_weights.sum() <= 0:
+            return float("nan")
+        cvar = summary.range_mean(0, count)
+        terms = np.zeros(summary.n)
+        terms[:count] = tail_weights * (tail - cvar)
+        std_error = np.std(terms) * np.sqrt(summary.n) / tail_weights.sum()
+        return float(std_error * abs(portfolio_value))
+
+    cvar = tail.mean()
+    variance = (np.var(tail) + tail_prob * (cvar - var) ** 2) / (summary.n * tail_prob)
+    return float(np.sqrt(variance) * abs(portfolio_value))
 
 
 def calculate_sharpe_ratio(
@@ -69,41 +242,157 @@ def calculate_max_drawdown(values: np.ndarray) -> Tuple[float, int, int]:
     Returns:
         Tuple of (max_drawdown, peak_index, trough_index)
     """
-    peak = values[0]
-    peak_idx = 0
-    max_dd = 0
-    max_dd_peak_idx = 0
-    max_dd_trough_idx = 0
+    drawdowns = calculate_drawdowns(np.asarray(values, dtype=float)[None, :])
+    return (
+        float(drawdowns["max_drawdown"][0]),
+        int(drawdowns["peak_index"][0]),
+        int(drawdowns["trough_index"][0])
+    )
+
+
+def calculate_drawdowns(
+    paths: np.ndarray,
+    underwater: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Drawdown analytics for every path at once, from running maxima.
 
-    for i, value in enumerate(values):
-        if value > peak:
-            peak = value
-            peak_idx = i
+    Args:
+        paths: Value paths of shape (n_paths, n_periods+1)
+        underwater: Also return the underwater curve (drawdown from the
+            running peak at every period)
 
-        drawdown = (peak - value) / peak if peak > 0 else 0
-        if drawdown > max_dd:
-            max_dd = drawdown
-            max_dd_peak_idx = peak_idx
-            max_dd_trough_idx = i
+    Returns:
+        Dict of per-path arrays:
+        - ``max_drawdown``: largest peak-to-trough decline as a fraction
+        - ``peak_index`` / ``trough_index``: periods of that decline
+        - ``recovery_index``: first period after the trough back at the
+          peak value, or -1 if the path never recovers
+        - ``recovery_periods``: periods from trough to recovery (-1 if never)
+        - ``longest_underwater``: longest run of periods below a prior peak
+        - ``underwater``: (n_paths, n_periods+1) drawdown curves, if requested
+    """
+    paths = np.asarray(paths, dtype=float)
+    n_paths, n_points = paths.shape
+    periods = np.arange(n_points)
+
+    result = {
+        "max_drawdown": np.empty(n_paths),
+        "peak_index": np.empty(n_paths, dtype=np.int32),
+        "trough_index": np.empty(n_paths, dtype=np.int32),
+        "recovery_index": np.empty(n_paths, dtype=np.int32),
+        "recovery_periods": np.empty(n_paths, dtype=np.int32),
+        "longest_underwater": np.empty(n_paths, dtype=np.int32),
+    }
+    if underwater:
+        result["underwater"] = np.empty_like(paths)
+
+    for r0 in range(0, n_paths, ROW_TILE):
+        r1 = min(r0 + ROW_TILE, n_paths)
+        block = paths[r0:r1]
+        rows = np.arange(r1 - r0)
+
+        running_max = np.maximum.accumulate(block, axis=1)
+        drawdown = np.zeros_like(block)
+        np.divide(running_max - block, running_max, out=drawdown, where=running_max > 0)
+
+        # Period of the most recent strict new high, at every period
+        new_high = np.empty(block.shape, dtype=bool)
+        new_high[:, 0] = True
+        np.greater(block[:, 1:], running_max[:, :-1], out=new_high[:, 1:])
+        last_high = np.maximum.accumulate(np.where(new_high, periods, 0), axis=1)
+
+        trough = np.argmax(drawdown, axis=1)
+        peak = last_high[rows, trough]
+
+        recovered = (periods > trough[:, None]) & (block >= running_max[rows, trough][:, None])
+        has_recovered = recovered.any(axis=1)
+        recovery = np.where(has_recovered, np.argmax(recovered, axis=1), -1)
+
+        below_peak = block < running_max
+        spell = np.where(below_peak, periods - last_high, 0)
+
+        result["max_drawdown"][r0:r1] = drawdown[rows, trough]
+        result["peak_index"][r0:r1] = peak
+        result["trough_index"][r0:r1] = trough
+        result["recovery_index"][r0:r1] = recovery
+        result["recovery_periods"][r0:r1] = np.where(has_recovered, recovery - trough, -1)
+        result["longest_underwater"][r0:r1] = spell.max(axis=1)
+        if underwater:
+            result["underwater"][r0:r1] = drawdown
+
+    return result
+
+
+def calculate_drawdown_metrics(
+    drawdowns: Dict[str, np.ndarray],
+    threshold: float = 0.30,
+    weights: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """
+    Summarize the distribution of per-path drawdowns.
+
+    Args:
+        drawdowns: Per-path ``max_drawdown``, ``longest_underwater`` and
+            ``recovery_periods`` arrays (as from calculate_drawdowns)
+        threshold: Drawdown size whose probability is reported
+        weights: Optional per-path sample weights
 
-    return float(max_dd), max_dd_peak_idx, max_dd_trough_idx
+    Returns:
+        Dict of drawdown percentiles, the probability of exceeding
+        ``threshold`` and median underwater/recovery times in periods
+    """
+    max_drawdowns = summarize(drawdowns["max_drawdown"], weights)
+    p5, median, p95 = max_drawdowns.percentile([5, 50, 95])
+
+    metrics = {
+        "max_drawdown_p5": float(p5),
+        "max_drawdown_median": float(median),
+        "max_drawdown_p95": float(p95),
+        f"probability_drawdown_over_{threshold * 100:.0f}pct": max_drawdowns.fraction_above(threshold),
+    }
+
+    if "longest_underwater" in drawdowns:
+        metrics["median_longest_underwater_months"] = summarize(drawdowns["longest_underwater"], weights).median
+
+    if "recovery_periods" in drawdowns:
+        recovery = drawdowns["recovery_periods"]
+        in_drawdown = drawdowns["max_drawdown"] > 0
+        if np.any(in_drawdown):
+            # Both are conditional on a drawdown, so weights are renormalized
+            recovery = recovery[in_drawdown]
+            recovery_weights = None if weights is None else weights[in_drawdown]
+            recovered = recovery >= 0
+            metrics["probability_of_recovery"] = summarize(recovery, recovery_weights).fraction_above(0, inclusive=True)
+            if np.any(recovered):
+                metrics["median_recovery_months"] = summarize(
+                    recovery[recovered],
+                    None if weights is None else recovery_weights[recovered]
+                ).median
+
+    return metrics
 
 
 def calculate_probability_of_success(
-    final_values: np.ndarray,
-    target: float
+    final_values: Union[np.ndarray, SampleSummary],
+    target: float,
+    weights: Optional[np.ndarray] = None
 ) -> float:
     """Calculate probability of reaching a target value."""
+    if weights is not None:
+        final_values = summarize(final_values, weights)
+    if isinstance(final_values, SampleSummary):
+        return final_values.fraction_above(target, inclusive=True)
     return float(np.mean(final_values >= target))
 
 
 def calculate_safe_withdrawal_rate(
-    final_values: np.ndarray,
+    final_values: Union[np.ndarray, SampleSummary],
     initial_value: float,
     target_success_rate: float = 0.95
 ) -> float:
     """Estimate safe withdrawal rate for given success probability."""
-    sorted_values = np.sort(final_values)
+    sorted_values = summarize(final_values).sorted
     idx = int((1 - target_success_rate) * len(sorted_values))
     conservative_final = sorted_values[idx]
 
@@ -118,19 +407,26 @@ def generate_correlated_returns(
     stds: np.ndarray,
     correlation_matrix: np.ndarray,
     n_samples: int,
-    random_state: np.random.Generator = None
+    random_state: np.random.Generator = None,
+    cholesky_factor: Optional[np.ndarray] = None
 ) -> np.ndarray:
-    """Generate correlated random returns using Cholesky decomposition."""
+    """
+    Generate correlated random returns using Cholesky decomposition.
+
+    Pass ``cholesky_factor`` (the lower Cholesky factor of the correlation
+    matrix) to skip re-factorizing when drawing repeatedly, e.g. per chunk.
+    """
     if random_state is None:
         random_state = np.random.default_rng()
 
     n_assets = len(means)
-    L = np.linalg.cholesky(correlation_matrix)
+    L = np.linalg.cholesky(correlation_matrix) if cholesky_factor is None else cholesky_factor
 
     uncorrelated = random_state.standard_normal((n_samples, n_assets))
-    correlated = uncorrelated @ L.T
+    returns = uncorrelated @ L.T
 
-    returns = correlated * stds + means
+    returns *= stds
+    returns += means
     return returns
 
 
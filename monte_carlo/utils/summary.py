@@ -0,0 +1,226 @@
+"""Shared summary kernel for repeated statistics on one sample."""
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+
+class SampleSummary:
+    """
+    Sorts a sample once and answers every later order-statistic query from it.
+
+    Quantiles, the median, extremes, tail means and threshold probabilities
+    all come from the cached sorted view, and the mean, standard deviation,
+    skewness and excess kurtosis are computed together from one set of
+    central moments. Results match ``np.percentile`` (linear interpolation),
+    ``np.std`` and ``scipy.stats.skew``/``kurtosis`` with their defaults.
+
+    With ``weights`` (importance-sampling likelihood ratios, stratum or
+    scenario probabilities) the sample is sorted once together with its
+    weights, and every query reads the cumulative weights instead of ranks:
+    a sample sits at the midpoint of its cumulative weight, so equal weights
+    reproduce the unweighted results. Weighted averages are normalized by
+    ``total_weight``, which defaults to the sum of the weights; pass the
+    sample size for likelihood ratios, whose mean is one, to get the
+    unbiased (not self-normalized) estimators.
+
+    Args:
+        data: Sample of any shape (flattened for order statistics)
+        weights: Optional non-negative weights with the same shape as data
+        total_weight: Normalizer of weighted averages and probabilities
+            (defaults to the sum of the weights)
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        total_weight: Optional[float] = None
+    ):
+        self.data = np.asarray(data)
+        self.n = self.data.size
+        self.weights = None
+        self._sorted: Optional[np.ndarray] = None
+        self._sorted_weights: Optional[np.ndarray] = None
+        self._cum_weights: Optional[np.ndarray] = None
+        self._moments: Optional[Dict[str, float]] = None
+
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape != self.data.shape:
+                raise ValueError(f"weights must match the sample's shape {self.data.shape}, got {weights.shape}")
+            self.weights = weights
+        elif total_weight is not None:
+            raise ValueError("total_weight requires weights")
+        self.self_normalized = weights is not None and total_weight is None
+        self._total_weight = total_weight
+
+    @property
+    def total_weight(self) -> float:
+        """Normalizer of weighted averages (the sample size without weights)."""
+        if self.weights is None:
+            return float(self.n)
+        if self._total_weight is None:
+            self._total_weight = float(self.weights.sum())
+        return self._total_weight
+
+    @property
+    def sorted(self) -> np.ndarray:
+        """Sorted, flattened copy of the sample (computed once)."""
+        if self._sorted is None:
+            self._sort()
+        return self._sorted
+
+    @property
+    def sorted_weights(self) -> Optional[np.ndarray]:
+        """Weights in the order of ``sorted`` (None for unweighted samples)."""
+        if self.weights is not None and self._sorted_weights is None:
+            self._sort()
+        return self._sorted_weights
+
+    @property
+    def cum_weights(self) -> np.ndarray:
+        """Cumulative weight before each sorted position, length n + 1."""
+        if self._cum_weights is None:
+            if self.weights is None:
+                self._cum_weights = np.arange(self.n + 1, dtype=float)
+            else:
+                self._cum_weights = np.concatenate([[0.0], np.cumsum(self.sorted_weights)])
+        return self._cum_weights
+
+    @property
+    def moments(self) -> Dict[str, float]:
+        """Mean, std, skewness and excess kurtosis of the sample."""
+        if self._moments is None:
+            if self.weights is None:
+                average = np.mean
+            else:
+                total = self.total_weight
+                average = lambda values: np.sum(self.weights * values) / total
+
+            mean = average(self.data)
+            deviations = self.data - mean
+            squared = deviations * deviations
+            m2 = average(squared)
+            m3 = average(squared * deviations)
+            m4 = average(squared * squared)
+
+            self._moments = {
+                "mean": float(mean),
+                "std": float(np.sqrt(m2)),
+                "skewness": float(m3 / m2 ** 1.5) if m2 > 0 else float("nan"),
+                "kurtosis": float(m4 / m2 ** 2 - 3) if m2 > 0 else float("nan"),
+            }
+        return self._moments
+
+    @property
+    def mean(self) -> float:
+        return self.moments["mean"]
+
+    @property
+    def std(self) -> float:
+        return self.moments["std"]
+
+    @property
+    def min(self) -> float:
+        return float(self.sorted[0])
+
+    @property
+    def max(self) -> float:
+        return float(self.sorted[-1])
+
+    @property
+    def median(self) -> float:
+        return self.percentile(50)
+
+    def percentile(self, q: Union[float, List[float], np.ndarray]) -> Union[float, np.ndarray]:
+        """Percentile(s) ``q`` in [0, 100] with linear interpolation."""
+        if self.weights is not None:
+            return self.quantile(np.asarray(q, dtype=float) / 100)
+
+        positions = np.asarray(q, dtype=float) / 100 * (self.n - 1)
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, self.n - 1)
+        weight = positions - lower
+
+        values = self.sorted[lower] + weight * (self.sorted[upper] - self.sorted[lower])
+        return float(values) if np.ndim(values) == 0 else values
+
+    def quantile(self, q: Union[float, List[float], np.ndarray]) -> Union[float, np.ndarray]:
+        """Quantile(s) ``q`` in [0, 1] with linear interpolation."""
+        if self.weights is None:
+            return self.percentile(np.asarray(q, dtype=float) * 100)
+
+        # Samples sit at the midpoints of their cumulative weight; when
+        # self-normalized the ends are pinned to 0 and 1 as in np.percentile
+        positions = (self.cum_weights[:-1] + self.cum_weights[1:]) / 2
+        if self.n == 1:
+            positions = np.zeros(1)
+        elif self.self_normalized:
+            positions = (positions - positions[0]) / (positions[-1] - positions[0])
+        else:
+            positions = positions / self.total_weight
+
+        values = np.interp(q, positions, self.sorted)
+        return float(values) if np.ndim(values) == 0 else values
+
+    def fraction_below(
+        self,
+        threshold: Union[float, np.ndarray],
+        inclusive: bool = False
+    ) -> Union[float, np.ndarray]:
+        """Fraction of the sample below (or at, if inclusive) a threshold or array of thresholds."""
+        side = "right" if inclusive else "left"
+        index = np.searchsorted(self.sorted, threshold, side=side)
+        fractions = self.cum_weights[index] / self.total_weight
+        return float(fractions) if np.ndim(fractions) == 0 else fractions
+
+    def fraction_above(
+        self,
+        threshold: Union[float, np.ndarray],
+        inclusive: bool = False
+    ) -> Union[float, np.ndarray]:
+        """Fraction of the sample above (or at, if inclusive) a threshold or array of thresholds."""
+        side = "left" if inclusive else "right"
+        index = np.searchsorted(self.sorted, threshold, side=side)
+        fractions = (self.cum_weights[-1] - self.cum_weights[index]) / self.total_weight
+        return float(fractions) if np.ndim(fractions) == 0 else fractions
+
+    def tail_mean(self, threshold: float) -> float:
+        """Mean of the values at or below a threshold."""
+        return self.range_mean(0, np.searchsorted(self.sorted, threshold, side="right"))
+
+    def tail_mean_below_quantile(self, q: float) -> float:
+        """Mean of the values at or below the ``q``-quantile (expected shortfall)."""
+        return self.tail_mean(self.percentile(q * 100))
+
+    def range_mean(self, start: int, stop: int) -> float:
+        """(Weighted) mean of the sorted values at positions start to stop - 1."""
+        if stop <= start:
+            return float("nan")
+        if self.weights is None:
+            return float(np.mean(self.sorted[start:stop]))
+
+        weight = self.cum_weights[stop] - self.cum_weights[start]
+        if weight <= 0:
+            return float("nan")
+        return float(np.dot(self.sorted[start:stop], self.sorted_weights[start:stop]) / weight)
+
+    def _sort(self) -> None:
+        """Sort the sample, carrying the weights along in one argsort."""
+        if self.weights is None:
+            self._sorted = np.sort(self.data, axis=None)
+        else:
+            order = np.argsort(self.data, axis=None)
+            self._sorted = self.data.ravel()[order]
+            self._sorted_weights = self.weights.ravel()[order]
+
+
+def summarize(
+    data: Union[np.ndarray, SampleSummary],
+    weights: Optional[np.ndarray] = None
+) -> SampleSummary:
+    """Wrap an array (and optional weights) in a SampleSummary, passing existing summaries through."""
+    if isinstance(data, SampleSummary):
+        if weights is not None and data.weights is None:
+            return SampleSummary(data.data, weights)
+        return data
+    return SampleSummary(data, weights)
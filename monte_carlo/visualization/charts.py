@@ -2,7 +2,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Union
 from pathlib import Path
 
 from ..simulators.base import SimulationResults
@@ -21,8 +21,18 @@ def setup_style():
     })
 
 
+def _percentile_series(
+    paths: Union[np.ndarray, Dict[float, np.ndarray]],
+    percentiles: List[float]
+) -> Dict[float, np.ndarray]:
+    """Per-period percentile series from paths or precomputed bands."""
+    if isinstance(paths, dict):
+        return {p: paths[p] for p in percentiles if p in paths}
+    return {p: np.percentile(paths, p, axis=0) for p in percentiles}
+
+
 def plot_fan_chart(
-    paths: np.ndarray,
+    paths: Union[np.ndarray, Dict[float, np.ndarray]],
     title: str = "Monte Carlo Simulation - Fan Chart",
     percentiles: List[int] = [5, 10, 25, 50, 75, 90, 95],
     time_labels: Optional[List[str]] = None,
@@ -35,7 +45,8 @@ def plot_fan_chart(
     Create a fan chart showing percentile bands over time.
 
     Args:
-        paths: Array of shape (n_simulations, n_periods)
+        paths: Array of shape (n_simulations, n_periods), or a dict of
+            precomputed per-period percentile series
         title: Chart title
         percentiles: Percentiles to plot
         time_labels: Optional custom x-axis labels
@@ -50,15 +61,14 @@ def plot_fan_chart(
     setup_style()
     fig, ax = plt.subplots(figsize=figsize)
 
-    n_periods = paths.shape[1]
+    percentile_values = _percentile_series(paths, percentiles)
+    percentiles = list(percentile_values)
+
+    n_periods = len(next(iter(percentile_values.values())))
     x = np.arange(n_periods)
 
     colors = plt.cm.Blues(np.linspace(0.2, 0.8, len(percentiles) // 2 + 1))
 
-    percentile_values = {}
-    for p in percentiles:
-        percentile_values[p] = np.percentile(paths, p, axis=0)
-
     sorted_percentiles = sorted(percentiles)
     n_bands = len(sorted_percentiles) // 2
 
@@ -184,7 +194,7 @@ def plot_var_analysis(
     for i, (conf, var_val) in enumerate(var_levels.items()):
         color = colors[i % len(colors)]
         ax1.axvline(-var_val, color=color, linestyle='--', linewidth=2,
-                    label=f'VaR {int(conf*100)}%: ${var_val:,.0f}')
+                    label=f'VaR {conf*100:g}%: ${var_val:,.0f}')
 
     ax1.axvline(0, color='black', linestyle='-', linewidth=1, alpha=0.5)
     ax1.set_xlabel('Profit/Loss ($)')
@@ -213,7 +223,7 @@ def plot_var_analysis(
     ax2.set_xlabel('Confidence Level')
     ax2.set_title('VaR by Confidence Level')
     ax2.set_xticks(x)
-    ax2.set_xticklabels([f'{int(c*100)}%' for c in conf_levels])
+    ax2.set_xticklabels([f'{c*100:g}%' for c in conf_levels])
 
     lines1, labels1 = ax2.get_legend_handles_labels()
     lines2, labels2 = ax2_twin.get_legend_handles_labels()
@@ -384,7 +394,7 @@ def plot_retirement_analysis(
 
 def plot_summary_dashboard(
     results: SimulationResults,
-    paths: Optional[np.ndarray] = None,
+    paths: Optional[Union[np.ndarray, Dict[float, np.ndarray]]] = None,
     figsize: Tuple[int, int] = (16, 12),
     save_path: Optional[Path] = None
 ) -> Figure:
@@ -393,7 +403,8 @@ def plot_summary_dashboard(
 
     Args:
         results: SimulationResults object
-        paths: Optional paths array for time series plots
+        paths: Optional paths array (or precomputed percentile series) for
+            time series plots
         figsize: Figure size
         save_path: Path to save the figure
 
@@ -416,12 +427,10 @@ def plot_summary_dashboard(
 
     if paths is not None:
         ax2 = fig.add_subplot(2, 2, 2)
-        percentiles = [10, 25, 50, 75, 90]
-        x = np.arange(paths.shape[1])
+        percentile_values = _percentile_series(paths, [10, 25, 50, 75, 90])
 
-        for p in percentiles:
-            values = np.percentile(paths, p, axis=0)
-            ax2.plot(x, values, label=f'{p}th %ile', alpha=0.8)
+        for p, values in percentile_values.items():
+            ax2.plot(np.arange(len(values)), values, label=f'{p}th %ile', alpha=0.8)
 
         ax2.set_xlabel('Time Period')
         ax2.set_ylabel('Value ($)')
@@ -496,6 +505,12 @@ def save_all_charts(
     saved_files.append(dist_path)
     plt.close()
 
+    if paths is None and results.path_store is not None:
+        try:
+            paths = results.path_store.percentile_paths([5, 10, 25, 50, 75, 90, 95])
+        except ValueError:
+            paths = None
+
     if paths is not None:
         fan_path = output_dir / f"{simulation_type}_fan_chart.png"
         plot_fan_chart(paths, save_path=fan_path)
@@ -0,0 +1,37 @@
+"""Tests for adaptive stopping in BaseSimulator."""
+import numpy as np
+
+from monte_carlo.config import SimulationConfig, VaRConfig
+from monte_carlo.simulators.var import VaRSimulator
+
+
+POSITIONS = [400000.0, 300000.0, 300000.0]
+COVARIANCE = [
+    [0.0400, 0.0100, 0.0000],
+    [0.0100, 0.0900, 0.0200],
+    [0.0000, 0.0200, 0.0625],
+]
+
+
+def test_adaptive_multi_asset_var_keeps_scenario_rows():
+    config = SimulationConfig(
+        simulation_type="var",
+        num_simulations=20000,
+        random_seed=42,
+        var=VaRConfig(positions=POSITIONS, covariance_matrix=COVARIANCE),
+        target_metric="var_99",
+        target_error=0.01,
+        error_type="relative_error",
+        batch_size=2000,
+    )
+    simulator = VaRSimulator(config)
+    results = simulator.run()
+
+    n_used = results.custom_metrics["simulations_used"]
+    assert results.custom_metrics["batches_used"] > 1
+    scenarios = results.path_features["asset_scenarios"]
+    assert scenarios.shape == (n_used, len(POSITIONS))
+    np.testing.assert_allclose(scenarios @ np.array(POSITIONS), results.final_values)
+
+    decomposition = simulator.decompose_var(0.99)
+    assert np.isclose(decomposition["component_var"].sum(), decomposition["var"])
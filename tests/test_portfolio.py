@@ -0,0 +1,31 @@
+"""Tests for PortfolioSimulator."""
+import pytest
+
+from monte_carlo.config import SimulationConfig
+from monte_carlo.simulators.portfolio import PortfolioSimulator
+
+
+def _run(path_storage):
+    config = SimulationConfig(
+        num_simulations=2000,
+        time_horizon_years=5,
+        random_seed=7,
+        path_storage=path_storage,
+    )
+    simulator = PortfolioSimulator(config)
+    simulator.run()
+    return simulator
+
+
+def test_annual_snapshots_keep_only_checkpoint_years():
+    snapshots = _run("checkpoints:[12, 18, 60]").get_annual_snapshots()
+    full_snapshots = _run("full").get_annual_snapshots()
+
+    assert sorted(snapshots) == [1, 5]
+    for year in snapshots:
+        assert snapshots[year] == pytest.approx(full_snapshots[year])
+
+
+def test_annual_snapshots_need_retained_year_ends():
+    with pytest.raises(ValueError, match="No year-end values"):
+        _run("checkpoints:[6, 18]").get_annual_snapshots()
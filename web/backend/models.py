@@ -271,12 +271,19 @@ class UserProfile(BaseModel):
     )
 
 
+class Sampler(str, Enum):
+    """Random number generation for the return simulation."""
+    PSEUDO = "pseudo"  # Independent pseudo-random draws
+    SOBOL = "sobol"  # Randomized quasi-Monte Carlo (scrambled Sobol + Brownian bridge)
+
+
 class SimulationParams(BaseModel):
     """Simulation parameters."""
     num_simulations: int = Field(default=1000, ge=100, le=100000)
     expected_return: Optional[float] = None  # Auto-calculated from risk tolerance if None
     volatility: Optional[float] = None  # Auto-calculated from risk tolerance if None
     inflation_rate: float = Field(default=0.025, ge=0, le=0.10)
+    sampler: Sampler = Sampler.PSEUDO
 
 
 class SimulationRequest(BaseModel):
@@ -200,7 +200,8 @@ async def run_simulation(request: SimulationRequest):
             periods_per_year=12,
             use_fat_tails=True,  # Student-t for realistic crash modeling
             degrees_of_freedom=5.0,  # Industry standard for fat tails
-            random_state=rng
+            random_state=rng,
+            sampler=params.sampler.value
         )
 
         # Convert log returns to simple returns
@@ -10,6 +10,9 @@ Based on 2024-2025 data from:
 import numpy as np
 from typing import Dict, Tuple
 from dataclasses import dataclass
+from scipy import stats
+
+from monte_carlo.models.sampling import SAMPLERS, DEFAULT_QMC_REPLICATIONS, sobol_normals
 
 
 @dataclass
@@ -146,7 +149,9 @@ def generate_correlated_returns(
     periods_per_year: int = 12,
     use_fat_tails: bool = True,
     degrees_of_freedom: float = 5.0,
-    random_state: np.random.Generator = None
+    random_state: np.random.Generator = None,
+    sampler: str = "pseudo",
+    qmc_replications: int = DEFAULT_QMC_REPLICATIONS
 ) -> np.ndarray:
     """
     Generate correlated portfolio returns using Cholesky decomposition.
@@ -160,6 +165,9 @@ def generate_correlated_returns(
         use_fat_tails: If True, use Student-t distribution for more realistic tails
         degrees_of_freedom: For Student-t (lower = fatter tails, 5 is common)
         random_state: Random number generator
+        sampler: "pseudo" for i.i.d. draws or "sobol" for randomized
+            quasi-Monte Carlo with Brownian-bridge path construction
+        qmc_replications: Number of independent Sobol scrambles (sobol only)
 
     Returns:
         Array of shape (n_simulations, n_periods) with portfolio returns
@@ -167,6 +175,9 @@ def generate_correlated_returns(
     if random_state is None:
         random_state = np.random.default_rng()
 
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler: {sampler}. Available: {SAMPLERS}")
+
     # Build arrays for active asset classes
     active_assets = [a for a in ASSET_ORDER if allocation.get(a, 0) > 0]
     n_assets = len(active_assets)
@@ -204,10 +215,17 @@ def generate_correlated_returns(
         L = np.linalg.cholesky(corr_sub)
 
     # Generate random samples
-    if use_fat_tails:
+    scale = np.sqrt((degrees_of_freedom - 2) / degrees_of_freedom) if degrees_of_freedom > 2 else 1.0
+    if sampler == "sobol":
+        uncorrelated = sobol_normals(
+            n_simulations, n_periods, n_assets, random_state, replications=qmc_replications
+        )
+        if use_fat_tails:
+            # Map the low-discrepancy normals onto Student-t marginals
+            uncorrelated = stats.t.ppf(stats.norm.cdf(uncorrelated), degrees_of_freedom) * scale
+    elif use_fat_tails:
         # Student-t for fat tails (captures market crashes better)
         # Scale to have unit variance
-        scale = np.sqrt((degrees_of_freedom - 2) / degrees_of_freedom) if degrees_of_freedom > 2 else 1.0
         uncorrelated = random_state.standard_t(degrees_of_freedom, (n_simulations, n_periods, n_assets)) * scale
     else:
         # Standard normal